@@ -28,6 +28,7 @@ try:
     from ..trading.bitcoin_trading_system_with_ollama import BitcoinTradingSystemWithOllama
     from ..core.sentiment_benchmark import SentimentBenchmark
     from ..utils.metrics_collector import metrics_collector
+    from ..data.post_store import DEFAULT_DB_PATH, PostStore
 except ImportError as e:
     click.echo(f"❌ Erro importando módulos: {e}", err=True)
     click.echo("Certifique-se de que está no diretório correto e que o sistema está instalado.", err=True)
@@ -410,6 +411,71 @@ def models(ctx, models, output):
         click.echo(f"❌ Erro no benchmark: {e}", err=True)
         sys.exit(1)
 
+@cli.group()
+def data():
+    """Consultas aos posts coletados"""
+    pass
+
+@data.command()
+@click.argument('query')
+@click.option('--hours', '-h', type=float, help='Apenas posts das últimas N horas')
+@click.option('--subreddit', '-s', multiple=True, help='Subreddits a incluir (repetível)')
+@click.option('--limit', '-n', default=20, help='Máximo de resultados')
+@click.option('--order', type=click.Choice(['recent', 'rank']), default='recent', help='Ordenação')
+@click.option('--db', type=click.Path(), help='Banco de posts (padrão: ~/.btc-trading/posts.db)')
+@click.option('--output', '-o', type=click.Choice(['json', 'table']), default='table')
+def search(query, hours, subreddit, limit, order, db, output):
+    """Busca textual nos posts armazenados (ex.: 'ETF', '"spot ETF" AND approval')"""
+    # PostStore criaria um banco vazio (e diretórios) para um caminho digitado errado
+    db_path = Path(db) if db else DEFAULT_DB_PATH
+    if not db_path.is_file():
+        click.echo(f"❌ Banco de posts não encontrado: {db_path}", err=True)
+        sys.exit(1)
+    
+    store = None
+    try:
+        store = PostStore(db_path)
+        start_utc = time.time() - hours * 3600 if hours else None
+        
+        start_time = time.time()
+        hits = store.search(query, start_utc=start_utc, subreddits=list(subreddit) or None,
+                            limit=limit, order=order)
+        elapsed_ms = (time.time() - start_time) * 1000
+        
+        if output == 'json':
+            click.echo(json.dumps([{
+                'id': hit.post.id,
+                'subreddit': hit.post.subreddit,
+                'created': datetime.fromtimestamp(hit.post.created_utc).isoformat(),
+                'score': hit.post.score,
+                'title': hit.post.title,
+                'permalink': hit.post.permalink,
+                'sentiment': hit.sentiment,
+                'sentiment_score': hit.sentiment_score,
+                'confidence': hit.confidence
+            } for hit in hits], indent=2, ensure_ascii=False))
+            return
+        
+        click.echo(f"🔎 {len(hits)} posts para '{query}' ({elapsed_ms:.1f} ms)")
+        click.echo("=" * 80)
+        for hit in hits:
+            created = datetime.fromtimestamp(hit.post.created_utc).strftime('%Y-%m-%d %H:%M')
+            if hit.sentiment:
+                sentiment = f"{hit.sentiment:8} {hit.sentiment_score:+.2f}"
+            else:
+                sentiment = f"{'-':8} {'':5}"
+            click.echo(f"{created} | r/{hit.post.subreddit:16} | {hit.post.score:6} | {sentiment} | {hit.post.title[:60]}")
+    
+    except ValueError as e:
+        click.echo(f"❌ {e}", err=True)
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"❌ Erro na busca: {e}", err=True)
+        sys.exit(1)
+    finally:
+        if store is not None:
+            store.close()
+
 @cli.group()
 def config():
     """Comandos para configuração"""
@@ -550,6 +616,27 @@ def metrics():
                 click.echo(f"{timestamp} | {metric['severity']:8} | {metric['message']}")
         else:
             click.echo("Nenhuma métrica disponível")
+        
+        # Telemetria de tokens por modelo Ollama
+        model_telemetry = metrics_collector.get_model_telemetry()
+        if model_telemetry:
+            click.echo("\n⚡ Telemetria Ollama por modelo:")
+            click.echo("=" * 40)
+            for model, summary in model_telemetry.items():
+                click.echo(f"{model:15} | {summary['calls']:5} chamadas | "
+                          f"prompt {summary['avg_prompt_tokens']:.0f} tok ({summary['prompt_share']:.0%}) | "
+                          f"geração {summary['avg_eval_tokens']:.0f} tok ({summary['eval_share']:.0%}) | "
+                          f"{summary['eval_tokens_per_second']:.1f} tok/s")
+        
+        # Limite de concorrência adaptativo por servidor/modelo
+        limits = {name: gauge for name, gauge in metrics_collector.get_gauges().items()
+                  if name.startswith('ollama_concurrency_limit:')}
+        if limits:
+            click.echo("\n🚦 Concorrência Ollama (limite atual):")
+            click.echo("=" * 40)
+            for name, gauge in limits.items():
+                timestamp = datetime.fromisoformat(gauge['timestamp']).strftime('%H:%M:%S')
+                click.echo(f"{name.split(':', 1)[1]:40} | limite {gauge['value']:3} | {timestamp}")
     
     except Exception as e:
         click.echo(f"❌ Erro obtendo métricas: {e}", err=True)
@@ -0,0 +1,601 @@
+#!/usr/bin/env python3
+"""
+Servidor Ollama Simulado para Testes de Performance
+Implementa /api/tags, /api/generate, /api/chat e /api/embeddings com latência,
+erros, contagem de tokens e limite de concorrência configuráveis
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+POSITIVE_WORDS = {
+    'moon', 'bullish', 'buy', 'buying', 'pump', 'rally', 'surge', 'gain', 'gains',
+    'profit', 'profits', 'hodl', 'best', 'amazing', 'incredible', 'high',
+    'adoption', 'growing', 'optimistic', 'stronger', 'future', 'revolutionary'
+}
+
+NEGATIVE_WORDS = {
+    'crash', 'crashing', 'dump', 'bearish', 'sell', 'selling', 'selloff', 'loss',
+    'lost', 'drop', 'worst', 'bubble', 'scam', 'dead', 'terrible', 'disaster',
+    'collapsing', 'kill', 'destroying', 'risky', 'ruining', 'manipulation', 'scary'
+}
+
+@dataclass
+class FakeOllamaConfig:
+    """Configuração do servidor Ollama simulado"""
+    models: List[str] = field(default_factory=lambda: ['llama3.2:1b', 'gemma2:9b', 'deepseek-r1:7b'])
+
+    # Distribuição da latência base (segundos): fixed, uniform, lognormal, exponential
+    latency_distribution: str = 'lognormal'
+    latency_mean: float = 0.3
+    latency_stddev: float = 0.1
+
+    # Custo por token (tokens/segundo)
+    prompt_eval_rate: float = 2000.0
+    eval_rate: float = 80.0
+
+    # Carga do modelo na primeira chamada (segundos)
+    load_time: float = 0.0
+
+    # Sequências mantidas no cache de prefixo (KV) por modelo; 0 desativa
+    kv_cache_slots: int = 4
+
+    # Contagem de tokens gerados (None = derivada da resposta)
+    eval_count: Optional[int] = None
+
+    # Injeção de falhas
+    error_rate: float = 0.0
+    error_status: int = 500
+    straggler_rate: float = 0.0
+    straggler_multiplier: float = 10.0
+
+    # Concorrência (equivalente a OLLAMA_NUM_PARALLEL / OLLAMA_MAX_QUEUE)
+    max_concurrency: int = 4
+    max_queue: int = 512
+
+    # Embeddings
+    embedding_dim: int = 384
+    embedding_latency: float = 0.01
+
+    seed: Optional[int] = None
+
+@dataclass
+class FakeOllamaStats:
+    """Estatísticas acumuladas do servidor simulado"""
+    requests: int = 0
+    errors: int = 0
+    rejected: int = 0
+    stragglers: int = 0
+    cached_prompt_tokens: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    queued: int = 0
+    by_endpoint: Dict[str, int] = field(default_factory=dict)
+
+def _tokenize(text: str) -> List[str]:
+    """Tokenização aproximada (palavras e pontuação)"""
+    return re.findall(r"\w+|[^\w\s]", text.lower())
+
+def _token_ids(tokens: List[str]) -> List[int]:
+    """Ids de token determinísticos para o campo context"""
+    return [int(hashlib.md5(t.encode()).hexdigest()[:6], 16) for t in tokens]
+
+def _classify(text: str) -> Tuple[str, float, float]:
+    """Classificação léxica determinística usada como 'resposta do modelo'"""
+    tokens = set(_tokenize(text))
+    positive = len(tokens & POSITIVE_WORDS)
+    negative = len(tokens & NEGATIVE_WORDS)
+
+    if positive > negative:
+        return "positive", min(0.95, 0.6 + 0.1 * positive), min(1.0, 0.4 + 0.15 * positive)
+    if negative > positive:
+        return "negative", min(0.95, 0.6 + 0.1 * negative), -min(1.0, 0.4 + 0.15 * negative)
+    return "neutral", 0.6, 0.0
+
+def _extract_text(prompt: str) -> str:
+    """Extrai o texto analisado de dentro do prompt, quando houver marcador TEXTO/Text ou aspas"""
+    markers = re.findall(r'(?:TEXTO|TEXT|Text):\s*(.+)', prompt)
+    if markers:
+        return markers[-1]
+
+    quoted = re.findall(r'"([^"]+)"', prompt)
+    if quoted:
+        return max(quoted, key=len)
+
+    return prompt
+
+class FakeOllamaServer:
+    """Servidor HTTP que imita a API do Ollama para testes sem GPU/modelo"""
+
+    def __init__(self, config: Optional[FakeOllamaConfig] = None, host: str = "127.0.0.1", port: int = 11435):
+        """
+        Inicializa o servidor simulado
+
+        Args:
+            config: Configuração de latência, erros e concorrência
+            host: Interface de escuta
+            port: Porta (0 = porta livre escolhida pelo sistema)
+        """
+        self.config = config or FakeOllamaConfig()
+        self.stats = FakeOllamaStats()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(self.config.max_concurrency)
+        self._loaded_models = set()
+        self._kv_cache: Dict[str, List[List[int]]] = {}
+        self._vocab: Dict[int, str] = {}
+
+        handler = self._make_handler()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """URL base do servidor (formato aceito por ollama_url/base_url)"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllamaServer":
+        """Inicia o servidor em thread de background"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Servidor Ollama simulado ouvindo em {self.url}")
+        return self
+
+    def stop(self):
+        """Encerra o servidor"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    def _sample_latency(self) -> float:
+        """Amostra a latência base segundo a distribuição configurada"""
+        cfg = self.config
+        with self._lock:
+            if cfg.latency_distribution == 'fixed':
+                value = cfg.latency_mean
+            elif cfg.latency_distribution == 'uniform':
+                value = self._rng.uniform(
+                    max(0.0, cfg.latency_mean - cfg.latency_stddev),
+                    cfg.latency_mean + cfg.latency_stddev
+                )
+            elif cfg.latency_distribution == 'exponential':
+                value = self._rng.expovariate(1.0 / cfg.latency_mean) if cfg.latency_mean > 0 else 0.0
+            else:
+                # lognormal parametrizada pela média e desvio padrão desejados
+                if cfg.latency_mean <= 0:
+                    value = 0.0
+                else:
+                    variance = cfg.latency_stddev ** 2
+                    sigma2 = math.log(1 + variance / cfg.latency_mean ** 2)
+                    mu = math.log(cfg.latency_mean) - sigma2 / 2
+                    value = self._rng.lognormvariate(mu, math.sqrt(sigma2))
+
+            if cfg.straggler_rate and self._rng.random() < cfg.straggler_rate:
+                self.stats.stragglers += 1
+                value *= cfg.straggler_multiplier
+
+        return max(0.0, value)
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            return bool(self.config.error_rate) and self._rng.random() < self.config.error_rate
+
+    def _mark_load(self, model: str) -> float:
+        """Retorna o tempo de carga do modelo (apenas na primeira chamada)"""
+        with self._lock:
+            if model in self._loaded_models:
+                return 0.0
+            self._loaded_models.add(model)
+            self._kv_cache[model] = []
+        return self.config.load_time
+
+    def unload(self, model: str):
+        """Descarrega o modelo (como expiração do keep_alive): a próxima chamada recarrega e perde o cache KV"""
+        with self._lock:
+            self._loaded_models.discard(model)
+            self._kv_cache.pop(model, None)
+
+    def _cached_prefix(self, model: str, ids: List[int]) -> int:
+        """Maior prefixo de ids já avaliado em alguma sequência do cache KV"""
+        best = 0
+        with self._lock:
+            for sequence in self._kv_cache.get(model, []):
+                length = 0
+                for a, b in zip(sequence, ids):
+                    if a != b:
+                        break
+                    length += 1
+                best = max(best, length)
+        # O último token sempre é reavaliado (como no Ollama)
+        return min(best, len(ids) - 1)
+
+    def _store_sequence(self, model: str, ids: List[int]):
+        """Guarda a sequência avaliada substituindo a mais antiga"""
+        if self.config.kv_cache_slots <= 0:
+            return
+        with self._lock:
+            slots = self._kv_cache.setdefault(model, [])
+            slots.append(ids)
+            if len(slots) > self.config.kv_cache_slots:
+                slots.pop(0)
+
+    def _token_ids(self, tokens: List[str]) -> List[int]:
+        """Ids de token com vocabulário reverso para reconstruir o campo context"""
+        ids = _token_ids(tokens)
+        with self._lock:
+            for token_id, token in zip(ids, tokens):
+                self._vocab[token_id] = token
+        return ids
+
+    def _render_response(self, prompt: str, json_format: bool,
+                         context_tokens: Optional[List[str]] = None) -> str:
+        """Gera a resposta no formato pedido pelo prompt (instruções podem vir do context)"""
+        sentiment, confidence, score = _classify(_extract_text(prompt))
+
+        if json_format:
+            impact = {'positive': 'bullish', 'negative': 'bearish'}.get(sentiment, 'neutral')
+            return json.dumps({
+                "sentiment": sentiment,
+                "confidence": confidence,
+                "score": score,
+                "reasoning": "Simulated analysis",
+                "financial_impact": impact,
+                "key_entities": ["Bitcoin"]
+            })
+
+        context_words = set(context_tokens or [])
+        if ('Confidence:' in prompt and 'Score:' in prompt) or {'confidence', 'score'} <= context_words:
+            return (
+                f"Sentiment: {sentiment}\n"
+                f"Confidence: {confidence:.2f}\n"
+                f"Score: {score:.2f}\n"
+                f"Reasoning: simulated lexical analysis"
+            )
+
+        return sentiment
+
+    def _plan_generation(self, model: str, prompt: str, options: Dict, json_format: bool,
+                         context: Optional[List[int]] = None) -> Dict:
+        """Calcula resposta, contagens de tokens e durações de uma geração"""
+        cfg = self.config
+        load_time = self._mark_load(model)
+
+        with self._lock:
+            context_tokens = [self._vocab.get(i, '') for i in (context or [])]
+
+        response_text = self._render_response(prompt, json_format, context_tokens)
+        response_tokens = _tokenize(response_text)
+
+        num_predict = options.get('num_predict')
+        eval_count = cfg.eval_count if cfg.eval_count is not None else len(response_tokens)
+        if num_predict is not None and num_predict > 0:
+            eval_count = min(eval_count, num_predict)
+            # Simula truncamento pelo limite de tokens
+            if len(response_tokens) > num_predict:
+                response_text = " ".join(response_text.split()[:num_predict])
+                response_tokens = _tokenize(response_text)
+        eval_count = max(1, eval_count)
+
+        # Tokens já presentes no cache KV (prefixo comum) não são reavaliados
+        prompt_ids = list(context or []) + self._token_ids(_tokenize(prompt))
+        cached = self._cached_prefix(model, prompt_ids) if prompt_ids else 0
+        prompt_eval_count = max(1, len(prompt_ids) - cached)
+        context_ids = prompt_ids + self._token_ids(response_tokens)
+        self._store_sequence(model, context_ids)
+        with self._lock:
+            self.stats.cached_prompt_tokens += cached
+
+        prompt_time = prompt_eval_count / cfg.prompt_eval_rate if cfg.prompt_eval_rate else 0.0
+        eval_time = eval_count / cfg.eval_rate if cfg.eval_rate else 0.0
+        base_time = self._sample_latency()
+
+        return {
+            'response': response_text,
+            'context': context_ids,
+            'load_time': load_time,
+            'prompt_time': prompt_time,
+            'eval_time': eval_time + base_time,
+            'prompt_eval_count': prompt_eval_count,
+            'eval_count': eval_count
+        }
+
+    # ------------------------------------------------------------------
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                logger.debug("fake-ollama: " + format % args)
+
+            def _send_json(self, status: int, payload: Dict):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_json(self) -> Dict:
+                length = int(self.headers.get("Content-Length", 0) or 0)
+                raw = self.rfile.read(length) if length else b"{}"
+                try:
+                    return json.loads(raw or b"{}")
+                except json.JSONDecodeError:
+                    return {}
+
+            def _count(self, endpoint: str):
+                with server._lock:
+                    server.stats.requests += 1
+                    server.stats.by_endpoint[endpoint] = server.stats.by_endpoint.get(endpoint, 0) + 1
+
+            def do_GET(self):
+                if self.path.rstrip('/') == '/api/tags':
+                    self._count('/api/tags')
+                    self._send_json(200, {
+                        "models": [
+                            {"name": name, "model": name, "size": 0,
+                             "modified_at": datetime.now(timezone.utc).isoformat()}
+                            for name in server.config.models
+                        ]
+                    })
+                elif self.path in ('/', ''):
+                    body = b"Ollama is running"
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                endpoint = self.path.rstrip('/')
+                payload = self._read_json()
+                self._count(endpoint)
+
+                if endpoint == '/api/embeddings' or endpoint == '/api/embed':
+                    self._handle_embeddings(endpoint, payload)
+                elif endpoint in ('/api/generate', '/api/chat'):
+                    self._handle_generation(endpoint, payload)
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def _handle_embeddings(self, endpoint: str, payload: Dict):
+                model = payload.get('model', '')
+                if model not in server.config.models:
+                    self._send_json(404, {"error": f"model '{model}' not found"})
+                    return
+                if server._should_fail():
+                    with server._lock:
+                        server.stats.errors += 1
+                    self._send_json(server.config.error_status, {"error": "injected failure"})
+                    return
+
+                time.sleep(server.config.embedding_latency)
+
+                if endpoint == '/api/embed':
+                    inputs = payload.get('input', [])
+                    if isinstance(inputs, str):
+                        inputs = [inputs]
+                    self._send_json(200, {
+                        "model": model,
+                        "embeddings": [server.embed(text) for text in inputs]
+                    })
+                else:
+                    self._send_json(200, {"embedding": server.embed(payload.get('prompt', ''))})
+
+            def _handle_generation(self, endpoint: str, payload: Dict):
+                model = payload.get('model', '')
+                if model not in server.config.models:
+                    self._send_json(404, {"error": f"model '{model}' not found"})
+                    return
+
+                # Fila limitada como OLLAMA_MAX_QUEUE
+                with server._lock:
+                    if server.stats.queued >= server.config.max_queue:
+                        server.stats.rejected += 1
+                        reject = True
+                    else:
+                        server.stats.queued += 1
+                        reject = False
+                if reject:
+                    self._send_json(503, {"error": "server busy, please try again. maximum pending requests exceeded"})
+                    return
+
+                server._slots.acquire()
+                with server._lock:
+                    server.stats.queued -= 1
+                    server.stats.in_flight += 1
+                    server.stats.peak_in_flight = max(server.stats.peak_in_flight, server.stats.in_flight)
+
+                try:
+                    if server._should_fail():
+                        with server._lock:
+                            server.stats.errors += 1
+                        time.sleep(server._sample_latency() * 0.1)
+                        self._send_json(server.config.error_status, {"error": "injected failure"})
+                        return
+
+                    if endpoint == '/api/chat':
+                        messages = payload.get('messages', [])
+                        prompt = "\n".join(str(m.get('content', '')) for m in messages)
+                    else:
+                        prompt = payload.get('prompt', '')
+
+                    plan = server._plan_generation(
+                        model, prompt, payload.get('options') or {},
+                        json_format=payload.get('format') == 'json',
+                        context=payload.get('context') if endpoint == '/api/generate' else None
+                    )
+
+                    if payload.get('stream', True):
+                        self._stream(endpoint, model, plan)
+                    else:
+                        time.sleep(plan['load_time'] + plan['prompt_time'] + plan['eval_time'])
+                        self._send_json(200, self._final_chunk(endpoint, model, plan, plan['response']))
+
+                except (BrokenPipeError, ConnectionResetError):
+                    # Cliente cancelou a requisição
+                    pass
+                finally:
+                    with server._lock:
+                        server.stats.in_flight -= 1
+                    server._slots.release()
+
+            def _final_chunk(self, endpoint: str, model: str, plan: Dict, content: str) -> Dict:
+                ns = 1_000_000_000
+                total = plan['load_time'] + plan['prompt_time'] + plan['eval_time']
+                chunk = {
+                    "model": model,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "done": True,
+                    "done_reason": "stop",
+                    "total_duration": int(total * ns),
+                    "load_duration": int(plan['load_time'] * ns),
+                    "prompt_eval_count": plan['prompt_eval_count'],
+                    "prompt_eval_duration": int(plan['prompt_time'] * ns),
+                    "eval_count": plan['eval_count'],
+                    "eval_duration": int(plan['eval_time'] * ns)
+                }
+                if endpoint == '/api/chat':
+                    chunk["message"] = {"role": "assistant", "content": content}
+                else:
+                    chunk["response"] = content
+                    chunk["context"] = plan['context']
+                return chunk
+
+            def _stream(self, endpoint: str, model: str, plan: Dict):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def write_chunk(data: Dict):
+                    line = (json.dumps(data) + "\n").encode()
+                    self.wfile.write(f"{len(line):X}\r\n".encode() + line + b"\r\n")
+                    self.wfile.flush()
+
+                time.sleep(plan['load_time'] + plan['prompt_time'])
+
+                pieces = re.findall(r"\S+\s*", plan['response']) or [""]
+                per_piece = plan['eval_time'] / len(pieces)
+                for piece in pieces:
+                    time.sleep(per_piece)
+                    chunk = {"model": model, "created_at": datetime.now(timezone.utc).isoformat(), "done": False}
+                    if endpoint == '/api/chat':
+                        chunk["message"] = {"role": "assistant", "content": piece}
+                    else:
+                        chunk["response"] = piece
+                    write_chunk(chunk)
+
+                write_chunk(self._final_chunk(endpoint, model, plan, ""))
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+    def embed(self, text: str) -> List[float]:
+        """Embedding determinístico (bag-of-words com hashing), textos parecidos ficam próximos"""
+        dim = self.config.embedding_dim
+        vector = [0.0] * dim
+        for token in _tokenize(text):
+            digest = hashlib.md5(token.encode()).digest()
+            index = int.from_bytes(digest[:4], 'little') % dim
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def get_stats(self) -> Dict:
+        """Retorna cópia das estatísticas do servidor"""
+        with self._lock:
+            return {
+                'requests': self.stats.requests,
+                'errors': self.stats.errors,
+                'rejected': self.stats.rejected,
+                'stragglers': self.stats.stragglers,
+                'cached_prompt_tokens': self.stats.cached_prompt_tokens,
+                'peak_in_flight': self.stats.peak_in_flight,
+                'by_endpoint': dict(self.stats.by_endpoint)
+            }
+
+def main():
+    """Executa o servidor simulado em primeiro plano"""
+    parser = argparse.ArgumentParser(description="Servidor Ollama simulado para testes de carga")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=11435)
+    parser.add_argument('--models', default='llama3.2:1b,gemma2:9b,deepseek-r1:7b')
+    parser.add_argument('--latency-distribution', default='lognormal',
+                        choices=['fixed', 'uniform', 'lognormal', 'exponential'])
+    parser.add_argument('--latency-mean', type=float, default=0.3)
+    parser.add_argument('--latency-stddev', type=float, default=0.1)
+    parser.add_argument('--eval-rate', type=float, default=80.0, help='Tokens gerados por segundo')
+    parser.add_argument('--prompt-eval-rate', type=float, default=2000.0, help='Tokens de prompt por segundo')
+    parser.add_argument('--eval-count', type=int, default=None, help='Força número de tokens gerados')
+    parser.add_argument('--load-time', type=float, default=0.0)
+    parser.add_argument('--kv-cache-slots', type=int, default=4, help='Sequências no cache de prefixo por modelo')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--straggler-rate', type=float, default=0.0)
+    parser.add_argument('--straggler-multiplier', type=float, default=10.0)
+    parser.add_argument('--max-concurrency', type=int, default=4)
+    parser.add_argument('--max-queue', type=int, default=512)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    config = FakeOllamaConfig(
+        models=[m.strip() for m in args.models.split(',') if m.strip()],
+        latency_distribution=args.latency_distribution,
+        latency_mean=args.latency_mean,
+        latency_stddev=args.latency_stddev,
+        prompt_eval_rate=args.prompt_eval_rate,
+        eval_rate=args.eval_rate,
+        eval_count=args.eval_count,
+        load_time=args.load_time,
+        kv_cache_slots=args.kv_cache_slots,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        straggler_rate=args.straggler_rate,
+        straggler_multiplier=args.straggler_multiplier,
+        max_concurrency=args.max_concurrency,
+        max_queue=args.max_queue,
+        seed=args.seed
+    )
+
+    server = FakeOllamaServer(config, host=args.host, port=args.port)
+    print(f"🧪 Ollama simulado em {server.url} (Ctrl+C para sair)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Encerrando servidor simulado")
+    finally:
+        server.httpd.server_close()
+        print(f"📊 Estatísticas: {server.get_stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Servidor Reddit Simulado para Testes de Coleta
+Implementa /r/{subreddit}/{hot,new,top}.json (com cursor after) e
+/r/{subreddit}/comments/{id}.json com ETag, Last-Modified, respostas 304,
+listagens que mudam em intervalos configuráveis e limite de taxa com 429/Retry-After
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TITLES = [
+    "Bitcoin breaks resistance, bullish momentum building",
+    "Is this the top? Thinking about selling",
+    "Daily discussion thread",
+    "Lightning network adoption keeps growing",
+    "Exchange outage during the dump, terrible timing",
+    "Halving supply shock explained",
+    "Regulators weigh new crypto rules",
+    "Just bought my first sats, HODL"
+]
+
+_LISTING_RE = re.compile(r"^/r/([^/]+)/(hot|new|top)\.json$")
+_COMMENTS_RE = re.compile(r"^/r/([^/]+)/comments/([^/]+)\.json$")
+
+@dataclass
+class FakeRedditConfig:
+    """Configuração do servidor Reddit simulado"""
+    # Segundos entre mudanças das listagens ativas
+    change_interval: float = 30.0
+    # Subreddits cujas listagens nunca mudam (pequenos/parados)
+    quiet_subreddits: List[str] = field(default_factory=lambda: ['BitcoinBeginners', 'btc', 'CryptoMarkets'])
+    # Posts por listagem (alcançáveis paginando com after) e intervalo entre eles
+    listing_depth: int = 1000
+    post_interval: float = 300.0
+
+    # Validadores suportados (desligue para simular backends sem cache HTTP)
+    etag: bool = True
+    last_modified: bool = True
+
+    latency: float = 0.02
+    # Requisições por segundo antes de responder 429 (0 = sem limite)
+    rate_limit: float = 0.0
+    retry_after: float = 1.0
+
+    seed: Optional[int] = None
+
+@dataclass
+class FakeRedditStats:
+    """Estatísticas acumuladas do servidor simulado"""
+    requests: int = 0
+    full_responses: int = 0
+    not_modified: int = 0
+    rate_limited: int = 0
+    bytes_sent: int = 0
+
+class FakeRedditServer:
+    """Servidor HTTP que imita a API JSON do Reddit"""
+
+    def __init__(self, config: Optional[FakeRedditConfig] = None, host: str = "127.0.0.1", port: int = 8089):
+        """
+        Inicializa o servidor simulado
+
+        Args:
+            config: Configuração de mudanças, validadores e limites
+            host: Interface de escuta
+            port: Porta (0 = porta livre escolhida pelo sistema)
+        """
+        self.config = config or FakeRedditConfig()
+        self.stats = FakeRedditStats()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._window_start = time.time()
+        self._window_count = 0
+
+        handler = self._make_handler()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """URL base do servidor (formato aceito por RedditHttpClient)"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeRedditServer":
+        """Inicia o servidor em thread de background"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Servidor Reddit simulado ouvindo em {self.url}")
+        return self
+
+    def stop(self):
+        """Encerra o servidor"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeRedditServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    def _version(self, subreddit: str) -> int:
+        """Versão atual da listagem (muda a cada change_interval nos subreddits ativos)"""
+        if subreddit in self.config.quiet_subreddits or self.config.change_interval <= 0:
+            return 0
+        return int((time.time() - self._started) / self.config.change_interval)
+
+    def _modified_at(self, subreddit: str, version: int) -> float:
+        if version == 0:
+            return self._started
+        return self._started + version * self.config.change_interval
+
+    def _listing(self, subreddit: str, limit: int, version: int, after: Optional[str] = None) -> Dict:
+        """Listagem determinística por (subreddit, versão), do mais novo ao mais antigo"""
+        base_time = self._modified_at(subreddit, version)
+        prefix = f"t3_{subreddit.lower()}_{version}_"
+        start = 0
+        if after:
+            start = int(after[len(prefix):]) + 1 if after.startswith(prefix) else self.config.listing_depth
+        stop = min(start + limit, self.config.listing_depth)
+        
+        children = []
+        for i in range(start, stop):
+            post_id = f"{subreddit.lower()}_{version}_{i}"
+            rng = random.Random(post_id)
+            children.append({
+                'kind': 't3',
+                'data': {
+                    'id': post_id,
+                    'title': TITLES[(i + version) % len(TITLES)],
+                    'selftext': "Simulated post body about bitcoin markets.",
+                    'author': f"user_{rng.randrange(500)}",
+                    'subreddit': subreddit,
+                    'score': rng.randrange(1, 2000),
+                    'num_comments': rng.randrange(0, 300),
+                    'created_utc': base_time - i * self.config.post_interval,
+                    'url': f"https://reddit.com/r/{subreddit}/comments/{post_id}/",
+                    'permalink': f"/r/{subreddit}/comments/{post_id}/",
+                    'upvote_ratio': round(rng.uniform(0.5, 1.0), 2),
+                    'link_flair_text': rng.choice(['Discussion', 'News', None])
+                }
+            })
+        next_after = f"{prefix}{stop - 1}" if children and stop < self.config.listing_depth else None
+        return {'kind': 'Listing', 'data': {'children': children, 'after': next_after}}
+
+    def _comments(self, subreddit: str, post_id: str, limit: int) -> List[Dict]:
+        rng = random.Random(post_id)
+        children = [{
+            'kind': 't1',
+            'data': {
+                'id': f"{post_id}_c{i}",
+                'body': TITLES[rng.randrange(len(TITLES))],
+                'author': f"user_{rng.randrange(500)}",
+                'score': rng.randrange(1, 100),
+                'created_utc': time.time() - rng.randrange(3600),
+                'parent_id': f"t3_{post_id}",
+                'subreddit': subreddit,
+                'replies': ""
+            }
+        } for i in range(min(limit, 20))]
+        return [
+            {'kind': 'Listing', 'data': {'children': []}},
+            {'kind': 'Listing', 'data': {'children': children}}
+        ]
+
+    def _over_rate_limit(self) -> bool:
+        if self.config.rate_limit <= 0:
+            return False
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            return self._window_count > self.config.rate_limit
+
+    # ------------------------------------------------------------------
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                logger.debug("fake-reddit: " + format % args)
+
+            def _send(self, status: int, body: bytes = b"", headers: Optional[Dict] = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+                with server._lock:
+                    server.stats.bytes_sent += len(body)
+
+            def _not_modified(self, etag: Optional[str], modified_at: float) -> bool:
+                if etag and self.headers.get('If-None-Match') == etag:
+                    return True
+                since = self.headers.get('If-Modified-Since')
+                if since and server.config.last_modified and not self.headers.get('If-None-Match'):
+                    try:
+                        return int(modified_at) <= parsedate_to_datetime(since).timestamp()
+                    except (TypeError, ValueError):
+                        return False
+                return False
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = parse_qs(parsed.query)
+                limit = int(params.get('limit', ['25'])[0])
+
+                with server._lock:
+                    server.stats.requests += 1
+
+                if server._over_rate_limit():
+                    with server._lock:
+                        server.stats.rate_limited += 1
+                    body = json.dumps({'message': 'Too Many Requests', 'error': 429}).encode()
+                    self._send(429, body, {'Content-Type': 'application/json',
+                                           'Retry-After': str(server.config.retry_after)})
+                    return
+
+                time.sleep(server.config.latency)
+
+                listing = _LISTING_RE.match(parsed.path)
+                comments = _COMMENTS_RE.match(parsed.path)
+                if listing:
+                    subreddit = listing.group(1)
+                    version = server._version(subreddit)
+                    payload = server._listing(subreddit, limit, version, params.get('after', [None])[0])
+                    modified_at = server._modified_at(subreddit, version)
+                elif comments:
+                    payload = server._comments(comments.group(1), comments.group(2), limit)
+                    modified_at = time.time()
+                else:
+                    self._send(404, b'{"error": 404}', {'Content-Type': 'application/json'})
+                    return
+
+                body = json.dumps(payload).encode()
+                headers = {'Content-Type': 'application/json'}
+                etag = None
+                if server.config.etag:
+                    etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+                    headers['ETag'] = etag
+                if server.config.last_modified:
+                    headers['Last-Modified'] = formatdate(modified_at, usegmt=True)
+
+                if self._not_modified(etag, modified_at):
+                    with server._lock:
+                        server.stats.not_modified += 1
+                    self._send(304, b"", {key: value for key, value in headers.items() if key != 'Content-Type'})
+                    return
+
+                with server._lock:
+                    server.stats.full_responses += 1
+                self._send(200, body, headers)
+
+        return Handler
+
+    def get_stats(self) -> Dict:
+        """Retorna cópia das estatísticas do servidor"""
+        with self._lock:
+            return {
+                'requests': self.stats.requests,
+                'full_responses': self.stats.full_responses,
+                'not_modified': self.stats.not_modified,
+                'rate_limited': self.stats.rate_limited,
+                'bytes_sent': self.stats.bytes_sent
+            }
+
+def main():
+    """Executa o servidor simulado em primeiro plano"""
+    parser = argparse.ArgumentParser(description="Servidor Reddit simulado para testes de coleta")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--change-interval', type=float, default=30.0, help='Segundos entre mudanças das listagens')
+    parser.add_argument('--quiet-subreddits', default='BitcoinBeginners,btc,CryptoMarkets',
+                        help='Subreddits cujas listagens não mudam')
+    parser.add_argument('--no-etag', action='store_true')
+    parser.add_argument('--no-last-modified', action='store_true')
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Requisições/s antes de 429 (0 = sem limite)')
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    args = parser.parse_args()
+
+    config = FakeRedditConfig(
+        change_interval=args.change_interval,
+        quiet_subreddits=[s.strip() for s in args.quiet_subreddits.split(',') if s.strip()],
+        etag=not args.no_etag,
+        last_modified=not args.no_last_modified,
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after
+    )
+
+    server = FakeRedditServer(config, host=args.host, port=args.port)
+    print(f"🧪 Reddit simulado em {server.url} (Ctrl+C para sair)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Encerrando servidor simulado")
+    finally:
+        server.httpd.server_close()
+        print(f"📊 Estatísticas: {server.get_stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Gerador de Carga para Analisadores Ollama
+Executa EnhancedSentimentAnalyzer e OllamaSentimentAnalyzer em diferentes níveis
+de concorrência e reporta vazão e latências p50/p95/p99
+"""
+
+import argparse
+import itertools
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEXTS = [
+    "Bitcoin is going to the moon! Best investment ever!",
+    "Bitcoin is crashing! Worst investment ever! I lost everything!",
+    "Bitcoin price is stable today, no major movements.",
+    "HODL! Diamond hands! Bitcoin will reach $100k soon!",
+    "This Bitcoin dump is terrible, selling everything now.",
+    "Bitcoin market waiting for next catalyst.",
+    "Institutional investors are buying Bitcoin! Bullish signal!",
+    "Bitcoin regulation will kill the market! Bearish!",
+]
+
+@dataclass
+class LoadTestResult:
+    """Resultado de um nível de concorrência"""
+    analyzer: str
+    concurrency: int
+    requests: int
+    errors: int
+    duration: float
+    throughput: float  # requisições por segundo
+    mean_latency: float
+    p50_latency: float
+    p95_latency: float
+    p99_latency: float
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Percentil por interpolação linear (mesma convenção de numpy.percentile)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (pct / 100.0) * (len(ordered) - 1)
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+def _is_error(result) -> bool:
+    """Detecta falhas a partir do resultado, já que os analisadores não propagam exceções"""
+    model_used = getattr(result, 'model_used', None)
+    if isinstance(model_used, str):
+        return model_used in ('error', 'fallback_error')
+    # EnhancedSentimentResult: falha no Ollama resulta em confiança zero
+    return getattr(result, 'ollama_confidence', 1.0) == 0.0
+
+def _call_analyzer(analyzer, text: str):
+    """Chama o método de análise disponível no analisador"""
+    if hasattr(analyzer, 'analyze_sentiment'):
+        return analyzer.analyze_sentiment(text)
+    return analyzer.analyze(text)
+
+def run_load_level(analyzer, name: str, texts: Sequence[str], concurrency: int,
+                   total_requests: int) -> LoadTestResult:
+    """
+    Executa um nível de carga
+
+    Args:
+        analyzer: Instância do analisador (compartilhada entre threads)
+        name: Nome para o relatório
+        texts: Textos usados em rodízio
+        concurrency: Número de requisições simultâneas
+        total_requests: Total de requisições no nível
+
+    Returns:
+        LoadTestResult com vazão e percentis
+    """
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    text_cycle = itertools.cycle(texts)
+
+    def worker(text: str):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            result = _call_analyzer(analyzer, text)
+            failed = _is_error(result)
+        except Exception as e:
+            logger.debug(f"Erro na requisição: {e}")
+            failed = True
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            if failed:
+                errors += 1
+
+    batch = [next(text_cycle) for _ in range(total_requests)]
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, batch))
+    duration = time.perf_counter() - start_time
+
+    return LoadTestResult(
+        analyzer=name,
+        concurrency=concurrency,
+        requests=total_requests,
+        errors=errors,
+        duration=duration,
+        throughput=total_requests / duration if duration > 0 else 0.0,
+        mean_latency=sum(latencies) / len(latencies) if latencies else 0.0,
+        p50_latency=percentile(latencies, 50),
+        p95_latency=percentile(latencies, 95),
+        p99_latency=percentile(latencies, 99)
+    )
+
+def run_load_test(analyzer_factory: Callable[[], object], name: str,
+                  concurrency_levels: Sequence[int] = (1, 2, 4, 8),
+                  requests_per_level: int = 40,
+                  texts: Optional[Sequence[str]] = None) -> List[LoadTestResult]:
+    """
+    Executa o teste de carga em vários níveis de concorrência
+
+    Args:
+        analyzer_factory: Função que cria o analisador (criado uma vez)
+        name: Nome do analisador no relatório
+        concurrency_levels: Níveis de concorrência testados
+        requests_per_level: Requisições por nível
+        texts: Textos de entrada (padrão: DEFAULT_TEXTS)
+
+    Returns:
+        Lista de LoadTestResult, um por nível
+    """
+    texts = texts or DEFAULT_TEXTS
+    analyzer = analyzer_factory()
+
+    results = []
+    for concurrency in concurrency_levels:
+        logger.info(f"[{name}] concorrência={concurrency}, requisições={requests_per_level}")
+        results.append(run_load_level(analyzer, name, texts, concurrency, requests_per_level))
+    return results
+
+def format_report(results: List[LoadTestResult]) -> str:
+    """Formata tabela de resultados"""
+    lines = []
+    lines.append("=" * 96)
+    lines.append("📊 TESTE DE CARGA - ANALISADORES OLLAMA")
+    lines.append("=" * 96)
+    lines.append(f"{'Analisador':12} | {'Conc':>4} | {'Req':>5} | {'Erros':>5} | {'req/s':>7} | "
+                 f"{'média':>7} | {'p50':>7} | {'p95':>7} | {'p99':>7}")
+    lines.append("-" * 96)
+    for r in results:
+        lines.append(f"{r.analyzer:12} | {r.concurrency:>4} | {r.requests:>5} | {r.errors:>5} | "
+                     f"{r.throughput:>7.2f} | {r.mean_latency:>6.2f}s | {r.p50_latency:>6.2f}s | "
+                     f"{r.p95_latency:>6.2f}s | {r.p99_latency:>6.2f}s")
+    return "\n".join(lines)
+
+def _analyzer_factories(url: str, model: str,
+                        hedge: bool = False, hedge_endpoints: Optional[List[str]] = None,
+                        adaptive_concurrency: bool = False) -> Dict[str, Callable[[], object]]:
+    """Fábricas dos analisadores suportados"""
+
+    def enhanced():
+        from ..sentiment.enhanced_sentiment_analyzer import EnhancedSentimentAnalyzer
+        hedger = None
+        if hedge or hedge_endpoints:
+            from ..sentiment.hedged_requests import HedgedRequester
+            hedger = HedgedRequester([url] + list(hedge_endpoints or []))
+        return EnhancedSentimentAnalyzer(ollama_model=model, ollama_url=url, hedger=hedger,
+                                         adaptive_concurrency=adaptive_concurrency)
+
+    def ollama():
+        from ..sentiment.ollama_sentiment_analyzer import OllamaSentimentAnalyzer
+        return OllamaSentimentAnalyzer(model_name=model, base_url=url, adaptive_concurrency=adaptive_concurrency)
+
+    return {'enhanced': enhanced, 'ollama': ollama}
+
+def main():
+    """Executa o teste de carga pela linha de comando"""
+    parser = argparse.ArgumentParser(description="Teste de carga dos analisadores Ollama")
+    parser.add_argument('--url', default='http://localhost:11434', help='URL do Ollama')
+    parser.add_argument('--model', default='llama3.2:1b')
+    parser.add_argument('--analyzer', choices=['enhanced', 'ollama', 'both'], default='both')
+    parser.add_argument('--concurrency', default='1,2,4,8', help='Níveis separados por vírgula')
+    parser.add_argument('--requests', type=int, default=40, help='Requisições por nível')
+    parser.add_argument('--fake', action='store_true', help='Sobe um servidor Ollama simulado local')
+    parser.add_argument('--fake-latency', type=float, default=0.3)
+    parser.add_argument('--fake-concurrency', type=int, default=4)
+    parser.add_argument('--fake-error-rate', type=float, default=0.0)
+    parser.add_argument('--fake-straggler-rate', type=float, default=0.0)
+    parser.add_argument('--hedge', action='store_true', help='Envia cópias de chamadas lentas (analisador enhanced)')
+    parser.add_argument('--adaptive-concurrency', action='store_true',
+                        help='Limita chamadas simultâneas com o controle AIMD')
+    parser.add_argument('--hedge-endpoint', action='append', default=[],
+                        help='Servidor extra para as cópias (padrão: o mesmo --url)')
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(',') if c.strip()]
+    server = None
+    url = args.url
+
+    if args.fake:
+        from .fake_ollama_server import FakeOllamaServer, FakeOllamaConfig
+        server = FakeOllamaServer(FakeOllamaConfig(
+            latency_mean=args.fake_latency,
+            latency_stddev=args.fake_latency / 3,
+            max_concurrency=args.fake_concurrency,
+            error_rate=args.fake_error_rate,
+            straggler_rate=args.fake_straggler_rate,
+            seed=42
+        ), port=0).start()
+        url = server.url
+
+    try:
+        factories = _analyzer_factories(url, args.model, args.hedge, args.hedge_endpoint, args.adaptive_concurrency)
+        selected = ['enhanced', 'ollama'] if args.analyzer == 'both' else [args.analyzer]
+
+        all_results = []
+        for name in selected:
+            try:
+                all_results.extend(run_load_test(factories[name], name, levels, args.requests))
+            except Exception as e:
+                print(f"❌ Erro testando {name}: {e}")
+
+        print("\n" + format_report(all_results))
+
+        if server:
+            print(f"\n🧪 Servidor simulado: {server.get_stats()}")
+
+        return [asdict(r) for r in all_results]
+    finally:
+        if server:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Memória do RedditPost
+Compara bytes por post entre o dataclass original (com __dict__ e strings
+repetidas) e a versão com slots e strings internadas, medida depois de
+acessar full_text (como acontece na análise de sentimento)
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from ..data.reddit_collector import RedditPost
+from ..data.synthetic_corpus import SyntheticRedditCorpus
+
+@dataclass
+class LegacyRedditPost:
+    """RedditPost antes da otimização, mantido apenas como referência"""
+    id: str
+    title: str
+    selftext: str
+    author: str
+    subreddit: str
+    score: int
+    num_comments: int
+    created_utc: float
+    url: str
+    permalink: str
+    upvote_ratio: Optional[float] = None
+    flair_text: Optional[str] = None
+
+    @property
+    def full_text(self) -> str:
+        return f"{self.title} {self.selftext}".strip()
+
+def _fresh(value: Optional[str]) -> Optional[str]:
+    """Cópia nova da string, como produzida por json.loads em cada registro"""
+    return None if value is None else ''.join(list(value))
+
+def _build(cls: Callable, count: int, authors: int, seed: int) -> List:
+    """Corpus sintético padrão, com strings novas em cada post como no JSON"""
+    def factory(**fields):
+        for name in ('author', 'subreddit', 'flair_text'):
+            fields[name] = _fresh(fields[name])
+        return cls(**fields)
+
+    corpus = SyntheticRedditCorpus(posts=count, seed=seed, authors=authors, end_utc=1_700_000_000.0)
+    return list(corpus.iter_posts(factory))
+
+def measure(cls: Callable, count: int, authors: int = 20000, seed: int = 42) -> Dict:
+    """Bytes por post (tracemalloc, após os acessos) e tempo de 3 acessos a full_text por post"""
+    gc.collect()
+    tracemalloc.start()
+    posts = _build(cls, count, authors, seed)
+
+    start = time.perf_counter()
+    for _ in range(3):
+        for post in posts:
+            post.full_text
+    full_text_time = time.perf_counter() - start
+
+    # Medido depois dos acessos: inclui qualquer texto que o post passe a reter
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        'posts': count,
+        'bytes_per_post': current / count,
+        'total_mb': current / 1024 / 1024,
+        'full_text_time': full_text_time
+    }
+    del posts
+    gc.collect()
+    return result
+
+def main():
+    """Executa o benchmark e imprime a comparação"""
+    parser = argparse.ArgumentParser(description="Memória por post: dataclass original vs slots")
+    parser.add_argument('--posts', type=int, default=1_000_000)
+    parser.add_argument('--authors', type=int, default=20000, help='Autores distintos')
+    args = parser.parse_args()
+
+    print(f"=== Memória do RedditPost ({args.posts:,} posts) ===")
+    legacy = measure(LegacyRedditPost, args.posts, args.authors)
+    slotted = measure(RedditPost, args.posts, args.authors)
+
+    for name, result in [('dataclass original', legacy), ('slots + interning', slotted)]:
+        print(f"{name:20s} {result['bytes_per_post']:8.1f} bytes/post  "
+              f"{result['total_mb']:8.1f} MB  full_text x3: {result['full_text_time']:.2f}s")
+
+    saved = 1 - slotted['bytes_per_post'] / legacy['bytes_per_post']
+    print(f"Economia: {saved:.1%} por post")
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ import json
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import numpy as np
@@ -22,6 +22,14 @@ except ImportError:
     print("Analisador aprimorado não disponível")
     ENHANCED_AVAILABLE = False
 
+from ..sentiment.labeled_texts import reference_labeled_texts
+
+try:
+    from ..sentiment.ollama_telemetry import OllamaTelemetry, summarize_telemetry
+    TELEMETRY_AVAILABLE = True
+except ImportError:
+    TELEMETRY_AVAILABLE = False
+
 try:
     from .test_ollama_simple import test_ollama_direct
     SIMPLE_OLLAMA_AVAILABLE = True
@@ -48,6 +56,13 @@ class BenchmarkResult:
     ollama_correct: bool = False
     traditional_correct: bool = False
     
+    # Telemetria Ollama (tokens e segundos)
+    prompt_eval_count: int = 0
+    eval_count: int = 0
+    prompt_eval_duration: float = 0.0
+    eval_duration: float = 0.0
+    load_duration: float = 0.0
+    
     # Metadados
     timestamp: str = ""
 
@@ -66,57 +81,34 @@ class SentimentBenchmark:
             except Exception as e:
                 print(f"❌ Erro ao inicializar analisador: {e}")
     
-    def create_test_dataset(self) -> List[Tuple[str, str]]:
+    @staticmethod
+    def create_test_dataset() -> List[Tuple[str, str]]:
         """
         Cria dataset de teste com sentimentos conhecidos
         
         Returns:
             Lista de (texto, sentimento_esperado)
         """
-        test_data = [
-            # Sentimentos POSITIVOS
-            ("Bitcoin is going to the moon! Best investment ever!", "positive"),
-            ("HODL! Diamond hands! Bitcoin will reach $100k soon!", "positive"),
-            ("Bitcoin just broke all-time high! Incredible gains!", "positive"),
-            ("This Bitcoin rally is amazing! Buying more!", "positive"),
-            ("Bitcoin adoption is growing fast! Bullish!", "positive"),
-            ("Just made huge profits on Bitcoin! To the moon!", "positive"),
-            ("Bitcoin is the future of money! Revolutionary!", "positive"),
-            ("Institutional investors are buying Bitcoin! Bullish signal!", "positive"),
-            ("Bitcoin network is stronger than ever! Optimistic!", "positive"),
-            ("Bitcoin price surge is just the beginning!", "positive"),
-            
-            # Sentimentos NEGATIVOS
-            ("Bitcoin is crashing! Worst investment ever! I lost everything!", "negative"),
-            ("This Bitcoin dump is terrible, selling everything now.", "negative"),
-            ("Bitcoin is a scam! Don't invest in this bubble!", "negative"),
-            ("Bitcoin crash wiped out my savings! Disaster!", "negative"),
-            ("Bitcoin is dead! No future for this coin!", "negative"),
-            ("Massive Bitcoin selloff! Market is collapsing!", "negative"),
-            ("Bitcoin regulation will kill the market! Bearish!", "negative"),
-            ("Bitcoin energy consumption is destroying the planet!", "negative"),
-            ("Bitcoin volatility is too risky! Stay away!", "negative"),
-            ("Bitcoin whale manipulation is ruining the market!", "negative"),
-            
-            # Sentimentos NEUTROS
-            ("Bitcoin price is stable today, no major movements.", "neutral"),
-            ("Bitcoin trading volume is normal for this time.", "neutral"),
-            ("Bitcoin price analysis shows mixed signals.", "neutral"),
-            ("Bitcoin market cap remains unchanged today.", "neutral"),
-            ("Bitcoin technical indicators are inconclusive.", "neutral"),
-            ("Bitcoin price consolidating in current range.", "neutral"),
-            ("Bitcoin market showing sideways movement.", "neutral"),
-            ("Bitcoin price action is range-bound today.", "neutral"),
-            ("Bitcoin volatility decreased compared to yesterday.", "neutral"),
-            ("Bitcoin market waiting for next catalyst.", "neutral"),
-        ]
-        
-        return test_data
+        return reference_labeled_texts()
+    
+    @staticmethod
+    def create_synthetic_dataset(size: int = 200, seed: int = 42) -> List[Tuple[str, str]]:
+        """
+        Dataset rotulado a partir do corpus sintético padrão
+        
+        Returns:
+            Lista de (texto, sentimento_esperado)
+        """
+        from ..data.synthetic_corpus import SyntheticRedditCorpus
+        return SyntheticRedditCorpus(posts=size * 2, seed=seed, end_utc=1_700_000_000.0).labeled_texts(size)
     
-    def run_benchmark(self) -> List[BenchmarkResult]:
+    def run_benchmark(self, test_data: Optional[List[Tuple[str, str]]] = None) -> List[BenchmarkResult]:
         """
         Executa benchmark completo
         
+        Args:
+            test_data: Pares (texto, sentimento esperado); padrão: create_synthetic_dataset()
+        
         Returns:
             Lista de BenchmarkResult
         """
@@ -124,7 +116,8 @@ class SentimentBenchmark:
             print("❌ Analisador não disponível")
             return []
         
-        test_data = self.create_test_dataset()
+        if test_data is None:
+            test_data = self.create_synthetic_dataset()
         results = []
         
         print(f"🚀 Iniciando benchmark com {len(test_data)} textos...")
@@ -142,6 +135,7 @@ class SentimentBenchmark:
                 # Verificar acurácia
                 ollama_correct = enhanced_result.ollama_sentiment == expected
                 final_correct = enhanced_result.final_sentiment == expected
+                telemetry = getattr(enhanced_result, 'ollama_telemetry', None)
                 
                 result = BenchmarkResult(
                     text=text,
@@ -154,6 +148,11 @@ class SentimentBenchmark:
                     traditional_time=total_time,
                     ollama_correct=ollama_correct,
                     traditional_correct=final_correct,
+                    prompt_eval_count=telemetry.prompt_eval_count if telemetry else 0,
+                    eval_count=telemetry.eval_count if telemetry else 0,
+                    prompt_eval_duration=telemetry.prompt_eval_duration if telemetry else 0.0,
+                    eval_duration=telemetry.eval_duration if telemetry else 0.0,
+                    load_duration=telemetry.load_duration if telemetry else 0.0,
                     timestamp=datetime.now().isoformat()
                 )
                 
@@ -175,6 +174,175 @@ class SentimentBenchmark:
         self.results = results
         return results
     
+    def run_routing_benchmark(self, router) -> Dict:
+        """
+        Executa o dataset de teste através de um RoutingSentimentAnalyzer
+        
+        Args:
+            router: RoutingSentimentAnalyzer a avaliar
+            
+        Returns:
+            Estatísticas por rota (latência, acurácia, taxa de escalonamento)
+        """
+        test_data = self.create_test_dataset()
+        
+        print(f"🔀 Benchmark de roteamento com {len(test_data)} textos...")
+        for text, expected in test_data:
+            try:
+                router.analyze_sentiment(text, expected_sentiment=expected)
+            except Exception as e:
+                print(f"  ❌ Erro: {e}")
+        
+        stats = router.get_route_stats()
+        for name, data in stats.items():
+            if name == 'overall':
+                print(f"  Escalonamento: {data['escalation_rate']:.1%} | Latência média: {data['avg_latency']:.2f}s")
+            else:
+                accuracy = f"{data['accuracy']:.1%}" if data['accuracy'] is not None else "n/a"
+                print(f"  {name} ({data['model']}): {data['final_decisions']} decisões | "
+                      f"acurácia {accuracy} | latência média {data['avg_latency']:.2f}s")
+        
+        return stats
+    
+    def run_embedding_benchmark(self, embedding_client=None, harvested=None, folds: int = 5) -> Dict:
+        """
+        Compara o classificador de embeddings com o caminho generativo
+        
+        A acurácia do classificador é medida por validação cruzada sobre o
+        dataset de teste (mais resultados colhidos), para não avaliar nos
+        mesmos exemplos do treino.
+        
+        Args:
+            embedding_client: OllamaEmbeddingClient (padrão nomic-embed-text local)
+            harvested: Resultados do LLM/ensemble usados como rótulos extras
+            folds: Número de partições da validação cruzada
+            
+        Returns:
+            Dicionário com acurácia e custo por texto de cada caminho
+        """
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.model_selection import cross_val_predict
+        from ..sentiment.embedding_sentiment_analyzer import build_training_set
+        from ..sentiment.ollama_embeddings import OllamaEmbeddingClient
+        
+        client = embedding_client or OllamaEmbeddingClient()
+        texts, labels = build_training_set(harvested)
+        
+        print(f"🧬 Benchmark de embeddings ({client.model}) com {len(texts)} textos...")
+        
+        start_time = time.time()
+        features = np.asarray(client.embed_batch(texts), dtype=np.float32)
+        embed_time = (time.time() - start_time) / len(texts)
+        
+        classifier = LogisticRegression(max_iter=1000, class_weight='balanced')
+        folds = max(2, min(folds, min(labels.count(label) for label in set(labels))))
+        
+        start_time = time.time()
+        predictions = cross_val_predict(classifier, features, labels, cv=folds)
+        classify_time = (time.time() - start_time) / len(texts)
+        
+        embedding_accuracy = float(np.mean([p == l for p, l in zip(predictions, labels)]))
+        
+        comparison = {
+            'embedding': {
+                'accuracy': embedding_accuracy,
+                'avg_time': embed_time + classify_time,
+                'samples': len(texts)
+            }
+        }
+        
+        if self.results:
+            comparison['generative'] = {
+                'accuracy': float(np.mean([r.ollama_correct for r in self.results])),
+                'avg_time': float(np.mean([r.ollama_time for r in self.results])),
+                'samples': len(self.results)
+            }
+        
+        print(f"  Embeddings: acurácia {embedding_accuracy:.1%} | {comparison['embedding']['avg_time'] * 1000:.1f}ms/texto")
+        if 'generative' in comparison:
+            generative = comparison['generative']
+            speedup = generative['avg_time'] / comparison['embedding']['avg_time'] if comparison['embedding']['avg_time'] else 0.0
+            print(f"  Generativo: acurácia {generative['accuracy']:.1%} | {generative['avg_time']:.2f}s/texto "
+                  f"({speedup:.0f}x mais lento)")
+        
+        return comparison
+    
+    def run_priming_benchmark(self, ollama_model: str = "llama3.2:1b",
+                              ollama_url: str = "http://localhost:11434") -> Dict:
+        """
+        Compara prompt completo por chamada com contexto de instruções preparado
+        
+        A comparação usa a telemetria de tokens: com o contexto preparado o
+        prompt_eval de cada chamada deve cobrir só o texto analisado.
+        
+        Returns:
+            Dicionário com tokens e tempo de prompt médios de cada modo
+        """
+        test_data = self.create_test_dataset()
+        comparison = {}
+        
+        print(f"🧠 Benchmark de contexto preparado ({ollama_model}) com {len(test_data)} textos...")
+        for mode, primed in (('full_prompt', False), ('primed_context', True)):
+            analyzer = EnhancedSentimentAnalyzer(ollama_model=ollama_model, ollama_url=ollama_url,
+                                                 primed_context=primed)
+            telemetry = []
+            for text, _ in test_data:
+                result = analyzer.analyze_sentiment(text)
+                if result.ollama_telemetry is not None:
+                    telemetry.append(result.ollama_telemetry)
+            
+            comparison[mode] = {
+                'calls': len(telemetry),
+                'avg_prompt_tokens': float(np.mean([t.prompt_eval_count for t in telemetry])) if telemetry else 0.0,
+                'avg_prompt_time': float(np.mean([t.prompt_eval_duration for t in telemetry])) if telemetry else 0.0,
+                'avg_wall_time': float(np.mean([t.wall_time for t in telemetry])) if telemetry else 0.0,
+                'primes': analyzer.prime_count
+            }
+            data = comparison[mode]
+            print(f"  {mode}: {data['avg_prompt_tokens']:.1f} tokens de prompt/chamada | "
+                  f"prompt {data['avg_prompt_time'] * 1000:.1f}ms | total {data['avg_wall_time']:.2f}s")
+        
+        return comparison
+    
+    def run_fast_mode_benchmark(self, ollama_model: str = "llama3.2:1b",
+                                ollama_url: str = "http://localhost:11434") -> Dict:
+        """
+        Compara acurácia e latência do modo completo com o modo rápido (uma palavra)
+        
+        Returns:
+            Dicionário por modo com acurácia, latência média/p95 e tokens gerados
+        """
+        test_data = self.create_test_dataset()
+        analyzer = EnhancedSentimentAnalyzer(ollama_model=ollama_model, ollama_url=ollama_url)
+        comparison = {}
+        
+        print(f"⚡ Benchmark modo completo vs rápido ({ollama_model}) com {len(test_data)} textos...")
+        for mode in ("full", "fast"):
+            correct, latencies, eval_tokens = [], [], []
+            for text, expected in test_data:
+                sentiment, _, _, latency, telemetry = analyzer._analyze_with_ollama(text, mode)
+                correct.append(sentiment == expected)
+                latencies.append(latency)
+                if telemetry is not None:
+                    eval_tokens.append(telemetry.eval_count)
+            
+            comparison[mode] = {
+                'accuracy': float(np.mean(correct)),
+                'avg_latency': float(np.mean(latencies)),
+                'p95_latency': float(np.percentile(latencies, 95)),
+                'avg_eval_tokens': float(np.mean(eval_tokens)) if eval_tokens else 0.0
+            }
+            data = comparison[mode]
+            print(f"  {mode:5}: acurácia {data['accuracy']:.1%} | média {data['avg_latency']:.2f}s | "
+                  f"p95 {data['p95_latency']:.2f}s | {data['avg_eval_tokens']:.0f} tokens gerados")
+        
+        if comparison['fast']['avg_latency'] > 0:
+            speedup = comparison['full']['avg_latency'] / comparison['fast']['avg_latency']
+            print(f"  Modo rápido {speedup:.1f}x mais rápido "
+                  f"({comparison['fast']['accuracy'] - comparison['full']['accuracy']:+.1%} de acurácia)")
+        
+        return comparison
+    
     def calculate_metrics(self, results: List[BenchmarkResult]) -> Dict:
         """Calcula métricas de performance"""
         if not results:
@@ -205,7 +373,23 @@ class SentimentBenchmark:
                     'count': len(sentiment_results)
                 }
         
+        # Telemetria de tokens (apenas resultados com contagens reportadas)
+        telemetry = {}
+        if TELEMETRY_AVAILABLE:
+            telemetry = summarize_telemetry(
+                OllamaTelemetry(
+                    prompt_eval_count=r.prompt_eval_count,
+                    eval_count=r.eval_count,
+                    prompt_eval_duration=r.prompt_eval_duration,
+                    eval_duration=r.eval_duration,
+                    load_duration=r.load_duration,
+                    wall_time=r.ollama_time
+                )
+                for r in results if r.eval_count or r.prompt_eval_count
+            )
+        
         return {
+            'telemetry': telemetry,
             'overall': {
                 'ollama_accuracy': ollama_accuracy,
                 'traditional_accuracy': traditional_accuracy,
@@ -248,6 +432,21 @@ class SentimentBenchmark:
             report.append(f"  Final:   {data['traditional_accuracy']:.1%}")
             report.append("")
         
+        # Telemetria de tokens
+        telemetry = metrics.get('telemetry') or {}
+        if telemetry.get('calls'):
+            report.append("⚡ TELEMETRIA OLLAMA")
+            report.append("-" * 40)
+            report.append(f"Tokens de prompt (média):  {telemetry['avg_prompt_tokens']:.0f}")
+            report.append(f"Tokens gerados (média):    {telemetry['avg_eval_tokens']:.0f}")
+            report.append(f"Avaliação do prompt:       {telemetry['prompt_tokens_per_second']:.1f} tok/s")
+            report.append(f"Geração:                   {telemetry['eval_tokens_per_second']:.1f} tok/s")
+            report.append(f"Tempo em prompt:           {telemetry['prompt_share']:.1%}")
+            report.append(f"Tempo em geração:          {telemetry['eval_share']:.1%}")
+            report.append(f"Tempo em carga do modelo:  {telemetry['load_share']:.1%}")
+            report.append(f"Tempo fora do modelo:      {telemetry['overhead_share']:.1%}")
+            report.append("")
+        
         # Análise comparativa
         report.append("🔍 ANÁLISE COMPARATIVA")
         report.append("-" * 40)
@@ -279,6 +478,14 @@ class SentimentBenchmark:
         if metrics['overall']['avg_ollama_time'] > 10:
             report.append("⏱️  Tempo de resposta do Ollama pode ser otimizado")
         
+        if telemetry.get('calls'):
+            if telemetry['prompt_share'] > telemetry['eval_share']:
+                report.append("📝 Avaliação do prompt domina o tempo: reduza ou reutilize o prompt de instruções")
+            elif telemetry['eval_share'] > 0.5:
+                report.append("🔤 Geração domina o tempo: reduza num_predict ou o formato da resposta")
+            if telemetry['load_share'] > 0.2:
+                report.append("📦 Carga do modelo é relevante: aumente keep_alive")
+        
         if metrics['overall']['avg_ollama_confidence'] < 0.7:
             report.append("🎯 Confiança do modelo pode ser melhorada com prompts mais específicos")
         
@@ -353,15 +560,19 @@ class SentimentBenchmark:
         print("📊 Visualizações salvas em benchmark_results.png")
         plt.show()
 
-def run_full_benchmark():
-    """Executa benchmark completo"""
+def run_full_benchmark(synthetic_size: int = 200):
+    """Executa benchmark completo sobre o corpus sintético (synthetic_size=0 usa os textos fixos)"""
     print("🚀 Iniciando Benchmark Completo de Análise de Sentimento")
     print("="*60)
     
     benchmark = SentimentBenchmark()
     
     # Executar benchmark
-    results = benchmark.run_benchmark()
+    if synthetic_size > 0:
+        test_data = benchmark.create_synthetic_dataset(synthetic_size)
+    else:
+        test_data = benchmark.create_test_dataset()
+    results = benchmark.run_benchmark(test_data)
     
     if not results:
         print("❌ Nenhum resultado obtido")
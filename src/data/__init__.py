@@ -1,3 +1,13 @@
 """Module exports"""
 
 from .reddit_collector import BitcoinSentimentCollector
+from .rate_limiter import TokenBucketRateLimiter, RateLimitedError, reddit_rate_limiter
+from .collection_state import CollectionState
+from .post_store import PostStore, SearchHit
+from .post_archive import PostArchiveWriter, iter_posts_jsonl, write_posts_jsonl
+from .trending import TrendingTopicsEngine
+from .api_recorder import RecordingApiClient, ReplayApiClient
+from .response_cache import ResponseCache
+from .reddit_http_client import RedditHttpClient
+from .bloom_filter import BloomFilter, RotatingBloomFilter
+from .synthetic_corpus import SyntheticRedditCorpus, generate_posts
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Gravação e Reprodução de Respostas da API do Reddit
+RecordingApiClient grava cada chamada (horário, endpoint, query e resposta
+bruta) em JSONL; ReplayApiClient serve a gravação pela mesma interface
+call_api, em tempo real ou acelerado, para testes de desempenho repetíveis
+"""
+
+import argparse
+import json
+import threading
+import time
+import logging
+from collections import defaultdict, deque
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from .post_archive import open_archive
+except ImportError:
+    from post_archive import open_archive
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _query_key(endpoint: str, query: Optional[Dict]) -> str:
+    return f"{endpoint}|{json.dumps(query or {}, sort_keys=True)}"
+
+def _loose_key(endpoint: str, query: Optional[Dict]) -> str:
+    """Chave sem o limite, para servir gravações feitas com outro limit"""
+    query = dict(query or {})
+    query.pop('limit', None)
+    return _query_key(endpoint, query)
+
+class RecordingApiClient:
+    """Repassa chamadas a um ApiClient real e grava as respostas"""
+
+    def __init__(self, client, filename: str):
+        """
+        Args:
+            client: Cliente com call_api(endpoint, query=...) (ex.: ApiClient do Manus)
+            filename: Arquivo JSONL (.gz/.bz2/.xz ativam compressão); acrescenta se existir
+        """
+        self.client = client
+        self.filename = filename
+        self._file = open_archive(filename, 'at')
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def call_api(self, endpoint: str, query: Optional[Dict] = None):
+        started = time.time()
+        record: Dict[str, Any] = {'t': started, 'endpoint': endpoint, 'query': query or {}}
+        try:
+            response = self.client.call_api(endpoint, query=query)
+            record['response'] = response
+            return response
+        except Exception as e:
+            # Erros (ex.: 429) também são reproduzidos
+            record['error'] = str(e)
+            record['status_code'] = getattr(e, 'status_code', None) or getattr(getattr(e, 'response', None), 'status_code', None)
+            raise
+        finally:
+            record['duration'] = time.time() - started
+            line = json.dumps(record, ensure_ascii=False)
+            with self._lock:
+                self._file.write(line + '\n')
+                self._file.flush()
+                self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+class ReplayedApiError(Exception):
+    """Erro gravado, reproduzido com o mesmo status"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class ReplayApiClient:
+    """Serve uma gravação pela interface call_api do ApiClient"""
+
+    def __init__(self, filename: str, speed: float = 1.0, loop: bool = True,
+                 shift_timestamps: bool = True, simulate_latency: bool = True):
+        """
+        Args:
+            filename: Gravação feita por RecordingApiClient
+            speed: 1.0 = tempo real, 10.0 = dez vezes mais rápido, 0 = sem espera
+            loop: Recomeça as respostas de uma chamada quando se esgotam
+            shift_timestamps: Desloca created_utc para que a idade dos posts no
+                momento da reprodução seja a mesma do momento da gravação
+            simulate_latency: Espera a duração gravada de cada chamada (escalada por speed)
+        """
+        self.filename = filename
+        self.speed = speed
+        self.loop = loop
+        self.shift_timestamps = shift_timestamps
+        self.simulate_latency = simulate_latency
+
+        self._exact: Dict[str, deque] = defaultdict(deque)
+        self._loose: Dict[str, deque] = defaultdict(deque)
+        self._served: Dict[str, list] = defaultdict(list)
+        self._lock = threading.Lock()
+
+        self.first_t: Optional[float] = None
+        entries = 0
+        with open_archive(filename, 'rt') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self.first_t = entry['t'] if self.first_t is None else min(self.first_t, entry['t'])
+                self._exact[_query_key(entry['endpoint'], entry['query'])].append(entry)
+                self._loose[_loose_key(entry['endpoint'], entry['query'])].append(entry)
+                entries += 1
+
+        self.entries = entries
+        self.served = 0
+        self.misses = 0
+        self._started = time.time()
+        logger.info(f"Reprodução de {entries} respostas de {filename} (velocidade {speed}x)")
+
+    def _next_entry(self, endpoint: str, query: Optional[Dict]) -> Optional[Dict]:
+        """Próxima resposta gravada para a chamada; chamar com o lock"""
+        for index, key in ((self._exact, _query_key(endpoint, query)), (self._loose, _loose_key(endpoint, query))):
+            queue = index.get(key)
+            if queue is None:
+                continue
+            if not queue and self.loop and self._served[key]:
+                queue.extend(self._served[key])
+                self._served[key] = []
+            if queue:
+                entry = queue.popleft()
+                self._served[key].append(entry)
+                return entry
+        return None
+
+    def _wait_for(self, entry: Dict):
+        """Respeita o ritmo gravado: a resposta só fica pronta no instante equivalente"""
+        if self.speed <= 0:
+            return
+        ready_at = self._started + (entry['t'] - self.first_t + entry.get('duration', 0.0)) / self.speed
+        delay = ready_at - time.time()
+        if not self.simulate_latency:
+            delay -= entry.get('duration', 0.0) / self.speed
+        if delay > 0:
+            time.sleep(delay)
+
+    def _shift(self, value: Any, offset: float) -> Any:
+        if isinstance(value, dict):
+            return {
+                key: (item + offset if key == 'created_utc' and isinstance(item, (int, float)) else self._shift(item, offset))
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self._shift(item, offset) for item in value]
+        return value
+
+    def call_api(self, endpoint: str, query: Optional[Dict] = None):
+        with self._lock:
+            entry = self._next_entry(endpoint, query)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.served += 1
+
+        if entry is None:
+            logger.warning(f"Sem resposta gravada para {endpoint} {query}")
+            return {}
+
+        self._wait_for(entry)
+
+        if 'error' in entry:
+            raise ReplayedApiError(entry['error'], entry.get('status_code'))
+
+        response = entry.get('response')
+        if self.shift_timestamps:
+            response = self._shift(response, time.time() - entry['t'])
+        return response
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': self.entries,
+                'served': self.served,
+                'misses': self.misses,
+                'elapsed': time.time() - self._started
+            }
+
+def _run_cycles(collector, cycles: int, interval: float) -> Tuple[int, float]:
+    """Executa ciclos de coleta de sentimento; retorna (posts, segundos)"""
+    total_posts = 0
+    start = time.time()
+    for cycle in range(cycles):
+        posts, _ = collector.collect_recent_sentiment_data()
+        total_posts += len(posts)
+        logger.info(f"Ciclo {cycle + 1}/{cycles}: {len(posts)} posts")
+        if interval > 0 and cycle + 1 < cycles:
+            time.sleep(interval)
+    return total_posts, time.time() - start
+
+def main():
+    """Grava ciclos de coleta com a API real ou reproduz uma gravação medindo o throughput"""
+    try:
+        from .reddit_collector import BitcoinSentimentCollector, RedditCollector
+    except ImportError:
+        from reddit_collector import BitcoinSentimentCollector, RedditCollector
+
+    parser = argparse.ArgumentParser(description="Gravação/reprodução das respostas da API do Reddit")
+    parser.add_argument('mode', choices=['record', 'replay'])
+    parser.add_argument('file', help='Arquivo JSONL da gravação (.gz para comprimir)')
+    parser.add_argument('--cycles', type=int, default=1, help='Ciclos de coleta')
+    parser.add_argument('--interval', type=float, default=0.0, help='Segundos entre ciclos (gravação)')
+    parser.add_argument('--speed', type=float, default=1.0, help='Velocidade da reprodução (0 = sem espera)')
+    args = parser.parse_args()
+
+    collector = BitcoinSentimentCollector()
+    if args.mode == 'record':
+        if collector.reddit_collector.client is None:
+            parser.error("API do Reddit indisponível: nada para gravar")
+        recorder = RecordingApiClient(collector.reddit_collector.client, args.file)
+        collector.reddit_collector.client = recorder
+        posts, elapsed = _run_cycles(collector, args.cycles, args.interval)
+        recorder.close()
+        print(f"{recorder.recorded} respostas gravadas em {args.file} ({posts} posts, {elapsed:.1f}s)")
+    else:
+        replay = ReplayApiClient(args.file, speed=args.speed)
+        collector = BitcoinSentimentCollector(client=replay)
+        # O TTL do cache de listagens acompanha a aceleração da reprodução
+        cache = collector.reddit_collector.response_cache
+        cache.ttl = cache.ttl / args.speed if args.speed > 0 else 0.0
+        posts, elapsed = _run_cycles(collector, args.cycles, 0.0)
+        stats = replay.get_stats()
+        print(f"{posts} posts em {elapsed:.2f}s ({posts / elapsed if elapsed else 0:.1f} posts/s), "
+              f"{stats['served']} respostas servidas, {stats['misses']} sem gravação")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Filtros de Bloom para Deduplicação de Posts entre Ciclos
+BloomFilter com taxa de falso positivo configurável e RotatingBloomFilter,
+que mantém gerações por janela de tempo (memória limitada) e persiste em disco
+"""
+
+import hashlib
+import json
+import math
+import struct
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from .collection_state import write_file_atomic
+except ImportError:
+    from collection_state import write_file_atomic
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOOM_FILE = Path.home() / '.btc-trading' / 'seen_posts.bloom'
+
+_MAGIC = b'BTCBLOOM1'
+
+class BloomFilter:
+    """Filtro de Bloom clássico com double hashing (blake2b)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Args:
+            capacity: Quantidade de itens para a qual error_rate é garantida
+            error_rate: Taxa de falso positivo na capacidade
+        """
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity deve ser positiva e error_rate entre 0 e 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> bool:
+        """Adiciona a chave; retorna True se ela (provavelmente) não estava presente"""
+        added = False
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    def to_header(self) -> Dict:
+        return {'capacity': self.capacity, 'error_rate': self.error_rate, 'count': self.count,
+                'num_bits': self.num_bits, 'num_hashes': self.num_hashes}
+
+    @classmethod
+    def from_bytes(cls, header: Dict, data: bytes) -> "BloomFilter":
+        bloom = cls(header['capacity'], header['error_rate'])
+        if bloom.num_bits != header['num_bits'] or bloom.num_hashes != header['num_hashes']:
+            raise ValueError("Parâmetros do filtro incompatíveis")
+        bloom.count = header['count']
+        bloom._bits = bytearray(data)
+        return bloom
+
+class RotatingBloomFilter:
+    """
+    Gerações de filtros de Bloom cobrindo uma janela de tempo
+
+    Uma nova geração começa a cada window_hours / generations horas (ou
+    antes, se a atual encher); a consulta olha todas. Uma geração só é
+    descartada quando a seguinte começou há mais de window_hours, então todo
+    ID é lembrado por pelo menos window_hours: ficam generations + 1 gerações
+    em ritmo normal (mais, se houver rotações por enchimento). A taxa de falso
+    positivo de cada geração é error_rate / (generations + 1), mantendo o
+    total perto de error_rate.
+    """
+
+    def __init__(self, window_hours: float = 72.0, generations: int = 3,
+                 capacity_per_generation: int = 200000, error_rate: float = 0.001,
+                 storage_file: Optional[Path] = None):
+        """
+        Args:
+            window_hours: Por quanto tempo um ID é lembrado (no mínimo)
+            generations: Gerações por janela (define o intervalo de rotação)
+            capacity_per_generation: IDs por geração antes de rotação antecipada
+            error_rate: Taxa de falso positivo total desejada
+            storage_file: Arquivo de persistência (padrão: ~/.btc-trading/seen_posts.bloom)
+        """
+        self.window_hours = window_hours
+        self.generations = generations
+        self.capacity_per_generation = capacity_per_generation
+        self.error_rate = error_rate
+        self.storage_file = Path(storage_file) if storage_file else DEFAULT_BLOOM_FILE
+
+        self._filters: List[BloomFilter] = []
+        self._started: List[float] = []
+        self._lock = threading.Lock()
+        # Serializa gravações: um snapshot antigo nunca substitui um mais novo
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self.rotations = 0
+
+        self._load()
+        if not self._filters:
+            self._new_generation(time.time())
+
+    @property
+    def generation_seconds(self) -> float:
+        return self.window_hours * 3600 / self.generations
+
+    def _new_generation(self, now: float):
+        """Abre uma geração; chamar com o lock (ou no init)"""
+        self._filters.append(BloomFilter(self.capacity_per_generation, self.error_rate / (self.generations + 1)))
+        self._started.append(now)
+        self._dirty = True
+
+    def _expire(self, now: float):
+        """Descarta gerações cujo último ID foi registrado antes da janela; chamar com o lock"""
+        cutoff = now - self.window_hours * 3600
+        # A geração i recebeu IDs até o início da geração i + 1
+        while len(self._filters) > 1 and self._started[1] <= cutoff:
+            self._filters.pop(0)
+            self._started.pop(0)
+            self._dirty = True
+
+    def _maybe_rotate(self, now: float):
+        """Abre uma geração por tempo ou enchimento e expira as antigas; chamar com o lock"""
+        current = self._filters[-1]
+        if now - self._started[-1] >= self.generation_seconds or current.is_full:
+            self._new_generation(now)
+            self.rotations += 1
+        self._expire(now)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return any(key in bloom for bloom in self._filters)
+
+    def add(self, key: str) -> bool:
+        """
+        Registra a chave na geração atual
+
+        Returns:
+            True se a chave não estava em nenhuma geração (item novo)
+        """
+        with self._lock:
+            self._maybe_rotate(time.time())
+            if any(key in bloom for bloom in self._filters):
+                return False
+            self._filters[-1].add(key)
+            self._dirty = True
+            return True
+
+    def filter_unseen(self, keys: Iterable[str]) -> List[str]:
+        """Chaves ainda não registradas (sem registrá-las)"""
+        with self._lock:
+            return [key for key in keys if not any(key in bloom for bloom in self._filters)]
+
+    # ------------------------------------------------------------------
+    def _load(self):
+        if not self.storage_file.exists():
+            return
+        try:
+            with open(self.storage_file, 'rb') as f:
+                if f.read(len(_MAGIC)) != _MAGIC:
+                    raise ValueError("formato desconhecido")
+                (header_size,) = struct.unpack('<I', f.read(4))
+                header = json.loads(f.read(header_size))
+                filters, started = [], []
+                for generation in header['generations']:
+                    data = f.read((generation['num_bits'] + 7) // 8)
+                    filters.append(BloomFilter.from_bytes(generation, data))
+                    started.append(generation['started'])
+
+            # Gerações fora da janela atual são descartadas na carga
+            self._filters, self._started = filters, started
+            if self._filters:
+                self._expire(time.time())
+            logger.info(f"Filtro de IDs vistos carregado: {sum(b.count for b in self._filters)} IDs em {len(self._filters)} gerações")
+        except Exception as e:
+            logger.warning(f"Filtro de IDs vistos ilegível em {self.storage_file}, iniciando vazio: {e}")
+            self._filters, self._started = [], []
+
+    def save(self):
+        """Grava as gerações em disco (atômico) se houve mudanças"""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                header = {'generations': [
+                    dict(bloom.to_header(), started=start) for bloom, start in zip(self._filters, self._started)
+                ]}
+                payload = [bytes(bloom._bits) for bloom in self._filters]
+                self._dirty = False
+
+            try:
+                header_bytes = json.dumps(header).encode()
+                write_file_atomic(self.storage_file,
+                                  [_MAGIC, struct.pack('<I', len(header_bytes)), header_bytes, *payload])
+            except Exception as e:
+                # Mantém a mudança pendente para a próxima gravação
+                with self._lock:
+                    self._dirty = True
+                logger.error(f"Erro ao salvar filtro de IDs vistos: {e}")
+
+    def get_stats(self) -> Dict:
+        """Gerações, IDs registrados e memória ocupada"""
+        with self._lock:
+            return {
+                'generations': len(self._filters),
+                'ids': sum(bloom.count for bloom in self._filters),
+                'bytes': sum(bloom.size_bytes for bloom in self._filters),
+                'rotations': self.rotations,
+                'error_rate': self.error_rate
+            }
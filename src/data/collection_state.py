@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Estado da Coleta Incremental do Reddit
+Guarda, por subreddit, o post mais recente já visto (high-water mark) e um
+conjunto limitado de IDs recentes com o último score, para que cada ciclo
+entregue ao sentimento só posts novos ou alterados
+"""
+
+import os
+import json
+import tempfile
+import threading
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_FILE = Path.home() / '.btc-trading' / 'reddit_state.json'
+
+def write_file_atomic(path: Path, chunks: Iterable[bytes]) -> None:
+    """Grava num temporário exclusivo do mesmo diretório e o move sobre o destino"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile('wb', dir=path.parent, prefix=f".{path.name}.",
+                                      suffix='.tmp', delete=False)
+    try:
+        with tmp:
+            for chunk in chunks:
+                tmp.write(chunk)
+        os.replace(tmp.name, path)
+    except Exception:
+        if os.path.exists(tmp.name):
+            os.unlink(tmp.name)
+        raise
+
+def write_json_atomic(path: Path, data) -> None:
+    """Grava JSON de forma atômica (ver write_file_atomic)"""
+    write_file_atomic(path, [json.dumps(data).encode()])
+
+class _SubredditState:
+    """High-water mark e IDs recentes (id -> [created_utc, score]) de um subreddit"""
+
+    def __init__(self, high_water: float = 0.0, seen: Optional[Dict[str, List[float]]] = None):
+        self.high_water = high_water
+        self.seen: "OrderedDict[str, List[float]]" = OrderedDict(seen or {})
+
+    def oldest_seen(self) -> float:
+        """Início do intervalo em que o conjunto de IDs é completo"""
+        if not self.seen:
+            return self.high_water
+        return min(created for created, _ in self.seen.values())
+
+class CollectionState:
+    """Marcas de coleta por subreddit persistidas em JSON"""
+
+    def __init__(self, storage_file: Optional[Path] = None,
+                 max_seen_per_subreddit: int = 1000, score_delta_threshold: int = 10):
+        """
+        Inicializa o estado
+
+        Args:
+            storage_file: Arquivo JSON (padrão: ~/.btc-trading/reddit_state.json)
+            max_seen_per_subreddit: IDs recentes mantidos por subreddit
+            score_delta_threshold: Variação de score que faz um post já visto ser reenviado
+        """
+        self.storage_file = Path(storage_file) if storage_file else DEFAULT_STATE_FILE
+        self.max_seen_per_subreddit = max_seen_per_subreddit
+        self.score_delta_threshold = score_delta_threshold
+
+        self._subreddits: Dict[str, _SubredditState] = {}
+        self._lock = threading.Lock()
+        # Serializa gravações: um snapshot antigo nunca substitui um mais novo
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not self.storage_file.exists():
+            return
+        try:
+            data = json.loads(self.storage_file.read_text())
+            for name, entry in data.get('subreddits', {}).items():
+                self._subreddits[name] = _SubredditState(entry.get('high_water', 0.0), entry.get('seen', {}))
+        except Exception as e:
+            logger.warning(f"Estado de coleta ilegível em {self.storage_file}, iniciando vazio: {e}")
+            self._subreddits = {}
+
+    def save(self):
+        """Grava o estado se houve mudanças desde a última gravação"""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                data = {
+                    'subreddits': {
+                        name: {'high_water': state.high_water, 'seen': dict(state.seen)}
+                        for name, state in self._subreddits.items()
+                    }
+                }
+                self._dirty = False
+
+            try:
+                write_json_atomic(self.storage_file, data)
+            except Exception as e:
+                logger.error(f"Erro ao salvar estado de coleta: {e}")
+
+    def filter_new(self, subreddit: str, posts: List) -> List:
+        """
+        Seleciona os posts novos ou alterados e atualiza as marcas
+
+        Um post é novo se o ID não foi visto e ele é mais recente que o
+        início do intervalo coberto pelos IDs guardados (posts mais antigos
+        já passaram pela coleta). É alterado se o score variou ao menos
+        score_delta_threshold desde o último envio.
+        """
+        selected = []
+
+        with self._lock:
+            state = self._subreddits.setdefault(subreddit, _SubredditState())
+            first_cycle = not state.seen and state.high_water == 0.0
+            floor = state.oldest_seen()
+
+            for post in posts:
+                previous = state.seen.get(post.id)
+
+                if previous is None:
+                    if not first_cycle and post.created_utc < floor:
+                        continue
+                    selected.append(post)
+                elif abs(post.score - previous[1]) >= self.score_delta_threshold:
+                    selected.append(post)
+                else:
+                    state.seen.move_to_end(post.id)
+                    continue
+
+                state.seen[post.id] = [post.created_utc, post.score]
+                state.seen.move_to_end(post.id)
+                state.high_water = max(state.high_water, post.created_utc)
+
+            while len(state.seen) > self.max_seen_per_subreddit:
+                state.seen.popitem(last=False)
+
+            if selected:
+                self._dirty = True
+
+        return selected
+
+    def reset(self, subreddit: Optional[str] = None):
+        """Esquece as marcas de um subreddit (ou de todos)"""
+        with self._lock:
+            if subreddit is None:
+                self._subreddits.clear()
+            else:
+                self._subreddits.pop(subreddit, None)
+            self._dirty = True
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """High-water mark e quantidade de IDs guardados por subreddit"""
+        with self._lock:
+            return {
+                name: {'high_water': state.high_water, 'seen': len(state.seen)}
+                for name, state in self._subreddits.items()
+            }
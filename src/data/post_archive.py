@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Arquivo JSONL de Posts do Reddit
+Um post por linha, gravado em streaming e lido por gerador (memória constante),
+com compressão opcional (.gz, .bz2, .xz) e filtros de período/subreddit na leitura
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+import logging
+from dataclasses import fields
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional
+
+try:
+    from .reddit_collector import RedditPost
+except ImportError:
+    from reddit_collector import RedditPost
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_POST_FIELDS = tuple(field.name for field in fields(RedditPost) if field.init)
+
+_OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open
+}
+
+def open_archive(filename, mode: str = 'rt') -> IO[str]:
+    """Abre o arquivo em modo texto, comprimido conforme a extensão"""
+    opener = _OPENERS.get(Path(filename).suffix.lower())
+    if opener is None:
+        return open(filename, mode, encoding='utf-8')
+    return opener(filename, mode, encoding='utf-8')
+
+class PostArchiveWriter:
+    """Gravação incremental de posts em JSONL (use como context manager)"""
+
+    def __init__(self, filename, append: bool = True):
+        """
+        Args:
+            filename: Caminho do arquivo; .gz/.bz2/.xz ativam compressão
+            append: Acrescenta ao arquivo existente (cada append vira um novo
+                membro comprimido, o que os leitores aceitam)
+        """
+        self.filename = str(filename)
+        self._file = open_archive(filename, 'at' if append else 'wt')
+        self.written = 0
+
+    def write(self, post: RedditPost):
+        record = {name: getattr(post, name) for name in _POST_FIELDS}
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write('\n')
+        self.written += 1
+
+    def write_many(self, posts: Iterable[RedditPost]) -> int:
+        count = 0
+        for post in posts:
+            self.write(post)
+            count += 1
+        return count
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def write_posts_jsonl(posts: Iterable[RedditPost], filename, append: bool = True) -> int:
+    """Grava posts (lista ou gerador) em JSONL; retorna quantos foram gravados"""
+    with PostArchiveWriter(filename, append=append) as writer:
+        written = writer.write_many(posts)
+    logger.info(f"{written} posts gravados em {filename}")
+    return written
+
+def iter_posts_jsonl(filename, start_utc: Optional[float] = None, end_utc: Optional[float] = None,
+                     subreddits: Optional[List[str]] = None) -> Iterator[RedditPost]:
+    """
+    Lê posts de um arquivo JSONL sob demanda
+
+    Args:
+        filename: Arquivo gravado por PostArchiveWriter (comprimido ou não)
+        start_utc: Inclui apenas posts com created_utc >= start_utc
+        end_utc: Inclui apenas posts com created_utc < end_utc
+        subreddits: Inclui apenas estes subreddits
+
+    Yields:
+        RedditPost, um por vez, na ordem do arquivo
+    """
+    allowed = set(subreddits) if subreddits else None
+    skipped = 0
+
+    with open_archive(filename, 'rt') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Última linha truncada por gravação interrompida
+                skipped += 1
+                logger.warning(f"Linha {line_number} inválida em {filename}, ignorada")
+                continue
+
+            created = record.get('created_utc', 0)
+            if start_utc is not None and created < start_utc:
+                continue
+            if end_utc is not None and created >= end_utc:
+                continue
+            if allowed is not None and record.get('subreddit') not in allowed:
+                continue
+
+            yield RedditPost(**{name: record.get(name) for name in _POST_FIELDS})
+
+    if skipped:
+        logger.warning(f"{skipped} linhas ignoradas em {filename}")
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Armazenamento Persistente de Posts do Reddit
+SQLite em modo WAL com upsert por ID em lotes e índice (subreddit, created_utc)
+para consultas por janela de tempo; substitui os dumps JSON por execução.
+Índice FTS5 de título e corpo, mantido por triggers a cada upsert, e
+sentimento por post para buscas textuais com o resultado da análise
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    from .reddit_collector import RedditPost
+except ImportError:
+    from reddit_collector import RedditPost
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path.home() / '.btc-trading' / 'posts.db'
+
+_POST_COLUMNS = (
+    'id', 'title', 'selftext', 'author', 'subreddit', 'score', 'num_comments',
+    'created_utc', 'url', 'permalink', 'upvote_ratio', 'flair_text'
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    selftext TEXT NOT NULL,
+    author TEXT,
+    subreddit TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    num_comments INTEGER NOT NULL,
+    created_utc REAL NOT NULL,
+    url TEXT,
+    permalink TEXT,
+    upvote_ratio REAL,
+    flair_text TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_posts_subreddit_created ON posts (subreddit, created_utc);
+CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_utc);
+CREATE TABLE IF NOT EXISTS post_sentiment (
+    post_id TEXT PRIMARY KEY,
+    sentiment TEXT NOT NULL,
+    score REAL NOT NULL,
+    confidence REAL NOT NULL,
+    model_used TEXT,
+    analyzed_at REAL NOT NULL
+);
+"""
+
+# Índice externo sobre posts (o texto não é duplicado); triggers o mantêm em
+# dia e só reindexam quando título ou corpo mudam de fato
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+    title, selftext, content='posts', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+    INSERT INTO posts_fts (rowid, title, selftext) VALUES (new.rowid, new.title, new.selftext);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+    INSERT INTO posts_fts (posts_fts, rowid, title, selftext) VALUES ('delete', old.rowid, old.title, old.selftext);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF title, selftext ON posts
+WHEN old.title IS NOT new.title OR old.selftext IS NOT new.selftext BEGIN
+    INSERT INTO posts_fts (posts_fts, rowid, title, selftext) VALUES ('delete', old.rowid, old.title, old.selftext);
+    INSERT INTO posts_fts (rowid, title, selftext) VALUES (new.rowid, new.title, new.selftext);
+END;
+"""
+
+_SENTIMENT_UPSERT = """
+INSERT INTO post_sentiment (post_id, sentiment, score, confidence, model_used, analyzed_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(post_id) DO UPDATE SET
+    sentiment = excluded.sentiment,
+    score = excluded.score,
+    confidence = excluded.confidence,
+    model_used = excluded.model_used,
+    analyzed_at = excluded.analyzed_at
+"""
+
+@dataclass
+class SearchHit:
+    """Post encontrado na busca textual, com o sentimento armazenado (se houver)"""
+    post: RedditPost
+    rank: float
+    sentiment: Optional[str] = None
+    sentiment_score: Optional[float] = None
+    confidence: Optional[float] = None
+
+# Campos que mudam entre coletas; o restante do post é imutável
+_UPSERT = f"""
+INSERT INTO posts ({', '.join(_POST_COLUMNS)}, fetched_at)
+VALUES ({', '.join('?' for _ in _POST_COLUMNS)}, ?)
+ON CONFLICT(id) DO UPDATE SET
+    title = excluded.title,
+    selftext = excluded.selftext,
+    score = excluded.score,
+    num_comments = excluded.num_comments,
+    upvote_ratio = excluded.upvote_ratio,
+    flair_text = excluded.flair_text,
+    fetched_at = excluded.fetched_at
+"""
+
+class PostStore:
+    """Armazém de posts em SQLite (WAL) com consultas por subreddit e período"""
+
+    def __init__(self, db_path: Optional[Path] = None, batch_size: int = 500):
+        """
+        Inicializa o armazém
+
+        Args:
+            db_path: Arquivo do banco (padrão: ~/.btc-trading/posts.db; ':memory:' para testes)
+            batch_size: Posts por transação nos upserts
+        """
+        self.db_path = str(db_path) if db_path else str(DEFAULT_DB_PATH)
+        self.batch_size = batch_size
+
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.full_text_search = self._init_fts()
+        self._conn.commit()
+
+    def _init_fts(self) -> bool:
+        """Cria o índice FTS5 (reconstruído uma vez em bancos anteriores a ele)"""
+        existed = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'"
+        ).fetchone() is not None
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 indisponível no SQLite ({e}); busca textual usará LIKE")
+            return False
+        if not existed and self._conn.execute("SELECT 1 FROM posts LIMIT 1").fetchone():
+            logger.info("Construindo índice de busca textual para posts existentes")
+            self._conn.execute("INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')")
+        return True
+
+    @staticmethod
+    def _row(post: RedditPost, fetched_at: float) -> tuple:
+        return tuple(getattr(post, column) for column in _POST_COLUMNS) + (fetched_at,)
+
+    @staticmethod
+    def _to_post(row: tuple) -> RedditPost:
+        return RedditPost(**dict(zip(_POST_COLUMNS, row)))
+
+    def upsert_posts(self, posts: Iterable[RedditPost]) -> int:
+        """
+        Insere ou atualiza posts pelo ID, em transações de batch_size
+
+        Returns:
+            Quantidade de posts gravados
+        """
+        fetched_at = time.time()
+        batch = []
+        written = 0
+
+        with self._lock:
+            for post in posts:
+                batch.append(self._row(post, fetched_at))
+                if len(batch) >= self.batch_size:
+                    with self._conn:
+                        self._conn.executemany(_UPSERT, batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                with self._conn:
+                    self._conn.executemany(_UPSERT, batch)
+                written += len(batch)
+
+        return written
+
+    def get_posts(self, subreddits: Optional[List[str]] = None,
+                  start_utc: Optional[float] = None, end_utc: Optional[float] = None,
+                  min_score: Optional[int] = None, limit: Optional[int] = None) -> List[RedditPost]:
+        """
+        Consulta posts por subreddit e período (created_utc em [start_utc, end_utc))
+
+        Returns:
+            Posts do mais recente para o mais antigo
+        """
+        clauses, params = [], []
+        if subreddits:
+            clauses.append(f"subreddit IN ({', '.join('?' for _ in subreddits)})")
+            params.extend(subreddits)
+        if start_utc is not None:
+            clauses.append("created_utc >= ?")
+            params.append(start_utc)
+        if end_utc is not None:
+            clauses.append("created_utc < ?")
+            params.append(end_utc)
+        if min_score is not None:
+            clauses.append("score >= ?")
+            params.append(min_score)
+
+        query = f"SELECT {', '.join(_POST_COLUMNS)} FROM posts"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created_utc DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._to_post(row) for row in rows]
+
+    def get_post(self, post_id: str) -> Optional[RedditPost]:
+        """Busca um post pelo ID"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_POST_COLUMNS)} FROM posts WHERE id = ?", (post_id,)
+            ).fetchone()
+        return self._to_post(row) if row else None
+
+    def count(self, subreddit: Optional[str] = None) -> int:
+        """Quantidade de posts armazenados (total ou de um subreddit)"""
+        with self._lock:
+            if subreddit is None:
+                return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM posts WHERE subreddit = ?", (subreddit,)
+            ).fetchone()[0]
+
+    def save_sentiment(self, results: Iterable[Tuple[str, object]]) -> int:
+        """
+        Grava o sentimento de cada post (substitui análises anteriores)
+
+        Args:
+            results: Pares (ID do post, SentimentResult)
+
+        Returns:
+            Quantidade de resultados gravados
+        """
+        analyzed_at = time.time()
+        rows = [
+            (post_id, result.sentiment, float(result.score), float(result.confidence),
+             getattr(result, 'model_used', None), analyzed_at)
+            for post_id, result in results
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(_SENTIMENT_UPSERT, rows)
+        return len(rows)
+
+    def search(self, query: str, start_utc: Optional[float] = None, end_utc: Optional[float] = None,
+               subreddits: Optional[List[str]] = None, limit: int = 100,
+               order: str = 'recent') -> List[SearchHit]:
+        """
+        Busca textual em título e corpo
+
+        Args:
+            query: Expressão FTS5 (ex.: 'ETF', '"spot ETF"', 'ETF AND (approval OR denied)')
+            start_utc: Inclui apenas posts com created_utc >= start_utc
+            end_utc: Inclui apenas posts com created_utc < end_utc
+            subreddits: Inclui apenas estes subreddits
+            limit: Máximo de resultados
+            order: 'recent' (mais novos primeiro) ou 'rank' (relevância BM25)
+
+        Returns:
+            SearchHit com o post e o sentimento armazenado
+        """
+        if order not in ('recent', 'rank'):
+            raise ValueError("order deve ser 'recent' ou 'rank'")
+
+        clauses, params = [], []
+        if self.full_text_search:
+            source = "posts_fts JOIN posts p ON p.rowid = posts_fts.rowid"
+            clauses.append("posts_fts MATCH ?")
+            params.append(query)
+            rank = "bm25(posts_fts)"
+        else:
+            source = "posts p"
+            clauses.append("(p.title LIKE ? OR p.selftext LIKE ?)")
+            params.extend([f"%{query}%"] * 2)
+            rank = "0.0"
+
+        with self._lock:
+            if start_utc is not None:
+                clauses.append("p.created_utc >= ?")
+                params.append(start_utc)
+                if self.full_text_search:
+                    # Limite de rowid derivado da janela: o FTS5 descarta as
+                    # correspondências antigas sem visitar a tabela de posts
+                    min_rowid = self._conn.execute(
+                        "SELECT MIN(rowid) FROM posts INDEXED BY idx_posts_created WHERE created_utc >= ?",
+                        (start_utc,)
+                    ).fetchone()[0]
+                    if min_rowid is None:
+                        return []
+                    clauses.append("posts_fts.rowid >= ?")
+                    params.append(min_rowid)
+            if end_utc is not None:
+                clauses.append("p.created_utc < ?")
+                params.append(end_utc)
+            if subreddits:
+                clauses.append(f"p.subreddit IN ({', '.join('?' for _ in subreddits)})")
+                params.extend(subreddits)
+
+            sql = (
+                f"SELECT {', '.join('p.' + column for column in _POST_COLUMNS)}, {rank}, "
+                f"s.sentiment, s.score, s.confidence "
+                f"FROM {source} LEFT JOIN post_sentiment s ON s.post_id = p.id "
+                f"WHERE {' AND '.join(clauses)} "
+                f"ORDER BY {'p.created_utc DESC' if order == 'recent' else rank} LIMIT ?"
+            )
+            params.append(limit)
+            try:
+                rows = self._conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Consulta de busca inválida '{query}': {e}") from e
+
+        columns = len(_POST_COLUMNS)
+        return [
+            SearchHit(self._to_post(row[:columns]), row[columns], row[columns + 1],
+                      row[columns + 2], row[columns + 3])
+            for row in rows
+        ]
+
+    def import_json(self, filename: str) -> int:
+        """
+        Importa um arquivo gerado por RedditCollector.save_posts_to_file
+
+        Arquivos JSONL (comprimidos ou não) são importados em streaming.
+
+        Returns:
+            Quantidade de posts importados
+        """
+        if '.jsonl' in Path(filename).suffixes:
+            try:
+                from .post_archive import iter_posts_jsonl
+            except ImportError:
+                from post_archive import iter_posts_jsonl
+            imported = self.upsert_posts(iter_posts_jsonl(filename))
+            logger.info(f"Importados {imported} posts de {filename} para {self.db_path}")
+            return imported
+
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        posts = (
+            RedditPost(
+                id=item['id'],
+                title=item['title'],
+                selftext=item['selftext'],
+                author=item['author'],
+                subreddit=item['subreddit'],
+                score=item['score'],
+                num_comments=item['num_comments'],
+                created_utc=item['created_utc'],
+                url=item['url'],
+                permalink=item['permalink'],
+                upvote_ratio=item.get('upvote_ratio'),
+                flair_text=item.get('flair_text')
+            )
+            for item in data
+        )
+        imported = self.upsert_posts(posts)
+        logger.info(f"Importados {imported} posts de {filename} para {self.db_path}")
+        return imported
+
+    def close(self):
+        """Fecha a conexão"""
+        with self._lock:
+            self._conn.close()
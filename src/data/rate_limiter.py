@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Limitador de Taxa (Token Bucket) para a API do Reddit
+Compartilhado por todos os coletores: as requisições saem tão rápido quanto a
+cota permite e a taxa é reduzida ao receber 429/Retry-After
+"""
+
+import re
+import threading
+import time
+import logging
+from typing import Dict, Optional
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class RateLimitedError(Exception):
+    """A API respondeu 429 (Too Many Requests)"""
+
+    def __init__(self, message: str = "Rate limit excedido", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class TokenBucketRateLimiter:
+    """Token bucket com taxa adaptativa (redução em 429, recuperação gradual)"""
+
+    def __init__(self, rate: float = 1.0, capacity: float = 5.0,
+                 min_rate: float = 0.1, backoff_ratio: float = 0.5, recovery_step: float = 0.05):
+        """
+        Inicializa o limitador
+
+        Args:
+            rate: Requisições por segundo permitidas pela cota
+            capacity: Rajada máxima (tokens acumulados)
+            min_rate: Taxa mínima após reduções
+            backoff_ratio: Fator aplicado à taxa a cada 429
+            recovery_step: Fração da taxa máxima recuperada a cada sucesso
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.backoff_ratio = backoff_ratio
+        self.recovery_step = recovery_step
+
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now: float):
+        """Acumula tokens pelo tempo decorrido; chamar com o lock"""
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Aguarda até haver tokens (e nenhum Retry-After pendente)
+
+        Returns:
+            True se adquiriu, False se o timeout expirou
+        """
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now >= self._blocked_until and self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.acquired += 1
+                    self.total_wait += now - start
+                    return True
+
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    wait = (tokens - self._tokens) / self.rate
+
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def record_success(self):
+        """Recupera a taxa gradualmente após respostas bem-sucedidas"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery_step)
+
+    def record_rate_limited(self, retry_after: Optional[float] = None):
+        """Reduz a taxa e pausa todas as requisições até o Retry-After"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate * self.backoff_ratio)
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            self._blocked_until = max(self._blocked_until, now + pause)
+            self._tokens = 0.0
+
+        logger.warning(f"Rate limit atingido: pausa de {pause:.1f}s, taxa reduzida para {self.rate:.2f} req/s")
+
+    def get_stats(self) -> Dict:
+        """Taxa atual, requisições e tempo total de espera"""
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'max_rate': self.max_rate,
+                'acquired': self.acquired,
+                'throttled': self.throttled,
+                'total_wait': self.total_wait
+            }
+
+def rate_limit_from_exception(error: Exception) -> Optional[RateLimitedError]:
+    """
+    Identifica um 429 em exceções da ApiClient/requests
+
+    Procura status_code na exceção ou na resposta anexada, e o cabeçalho
+    Retry-After quando houver.
+    """
+    if isinstance(error, RateLimitedError):
+        return error
+
+    response = getattr(error, 'response', None)
+    status = getattr(error, 'status_code', None) or getattr(response, 'status_code', None)
+    if status is None and re.search(r'\b429\b|too many requests', str(error), re.IGNORECASE):
+        status = 429
+    if status != 429:
+        return None
+
+    retry_after = None
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('Retry-After') or headers.get('retry-after')
+    if value is not None:
+        try:
+            retry_after = float(value)
+        except (TypeError, ValueError):
+            retry_after = None
+
+    return RateLimitedError(str(error), retry_after)
+
+# Limitador padrão compartilhado por todas as instâncias de coletores
+reddit_rate_limiter = TokenBucketRateLimiter()
@@ -7,12 +7,30 @@ Módulo para coletar posts e comentários de subreddits relacionados a Bitcoin
 import sys
 import json
 import time
+from collections import Counter
+from operator import attrgetter
+import numpy as np
 import pandas as pd
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
+try:
+    from .rate_limiter import RateLimitedError, TokenBucketRateLimiter, rate_limit_from_exception, reddit_rate_limiter
+    from .collection_state import CollectionState
+    from .trending import TrendingTopicsEngine
+    from .response_cache import CachedListing, ResponseCache, content_hash
+    from .bloom_filter import RotatingBloomFilter
+except ImportError:
+    from rate_limiter import RateLimitedError, TokenBucketRateLimiter, rate_limit_from_exception, reddit_rate_limiter
+    from collection_state import CollectionState
+    from trending import TrendingTopicsEngine
+    from response_cache import CachedListing, ResponseCache, content_hash
+    from bloom_filter import RotatingBloomFilter
+
 # Adiciona o caminho da API do Manus
 sys.path.append('/opt/.manus/.sandbox-runtime')
 
@@ -27,9 +45,18 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Interna strings categóricas (subreddit, autor, flair) repetidas entre posts"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+@dataclass(slots=True)
 class RedditPost:
-    """Estrutura de dados para posts do Reddit"""
+    """Estrutura de dados para posts do Reddit
+    
+    Usa __slots__; subreddit, author e flair_text são internados (uma cópia por
+    valor distinto). full_text é montado a cada acesso: guardá-lo dobraria o
+    texto retido por post.
+    """
     id: str
     title: str
     selftext: str
@@ -43,6 +70,11 @@ class RedditPost:
     upvote_ratio: Optional[float] = None
     flair_text: Optional[str] = None
     
+    def __post_init__(self):
+        self.subreddit = _intern(self.subreddit)
+        self.author = _intern(self.author)
+        self.flair_text = _intern(self.flair_text)
+    
     @property
     def created_datetime(self) -> datetime:
         """Converte timestamp UTC para datetime"""
@@ -53,9 +85,9 @@ class RedditPost:
         """Retorna texto completo (título + conteúdo)"""
         return f"{self.title} {self.selftext}".strip()
 
-@dataclass
+@dataclass(slots=True)
 class RedditComment:
-    """Estrutura de dados para comentários do Reddit"""
+    """Estrutura de dados para comentários do Reddit (slots, campos repetidos internados)"""
     id: str
     body: str
     author: str
@@ -65,17 +97,82 @@ class RedditComment:
     post_id: str
     subreddit: str
     
+    def __post_init__(self):
+        self.author = _intern(self.author)
+        self.post_id = _intern(self.post_id)
+        self.subreddit = _intern(self.subreddit)
+    
     @property
     def created_datetime(self) -> datetime:
         """Converte timestamp UTC para datetime"""
         return datetime.fromtimestamp(self.created_utc)
 
+# Colunas de posts_to_dataframe, na ordem de saída (created_datetime vem logo após created_utc)
+_DATAFRAME_FIELDS = (
+    'id', 'title', 'selftext', 'full_text', 'author', 'subreddit', 'score', 'num_comments',
+    'created_utc', 'url', 'permalink', 'upvote_ratio', 'flair_text'
+)
+
+def _to_local_datetime(created_utc: np.ndarray) -> np.ndarray:
+    """
+    Equivalente vetorizado de datetime.fromtimestamp (horário local, sem fuso)
+    
+    O deslocamento do fuso local é calculado uma vez por hora UTC distinta;
+    nas horas em que ele muda (transições fora da hora cheia, como em
+    America/St_Johns) cada post usa o deslocamento do próprio segundo.
+    """
+    # Arredonda a fração para microssegundos como datetime.fromtimestamp
+    seconds = np.floor(created_utc)
+    whole = seconds.astype('int64')
+    micros = whole * 1_000_000 + np.round((created_utc - seconds) * 1e6).astype('int64')
+    hours, inverse = np.unique(whole // 3600, return_inverse=True)
+    starts = np.array([time.localtime(int(hour) * 3600).tm_gmtoff for hour in hours], dtype='int64')
+    ends = np.array([time.localtime(int(hour) * 3600 + 3599).tm_gmtoff for hour in hours], dtype='int64')
+    offsets = starts[inverse]
+    for index in np.flatnonzero((starts != ends)[inverse]):
+        offsets[index] = time.localtime(int(whole[index])).tm_gmtoff
+    return pd.to_datetime(micros + offsets * 1_000_000, unit='us').to_numpy()
+
 class RedditCollector:
     """Coletor de dados do Reddit usando Manus API"""
     
-    def __init__(self):
-        self.client = None
-        if MANUS_API_AVAILABLE:
+    def __init__(self, rate_limiter: Optional[TokenBucketRateLimiter] = None,
+                 max_workers: int = 4, max_retries: int = 3,
+                 incremental: bool = False, state: Optional[CollectionState] = None,
+                 store=None, client=None, response_cache: Optional[ResponseCache] = None,
+                 cache_ttl: float = 60.0, seen_filter: Optional[RotatingBloomFilter] = None,
+                 page_budgets: Optional[Dict[str, int]] = None, default_page_budget: int = 10):
+        """
+        Inicializa o coletor
+        
+        Args:
+            rate_limiter: Token bucket da API (padrão: compartilhado por todos os coletores)
+            max_workers: Subreddits buscados em paralelo
+            max_retries: Novas tentativas após 429
+            incremental: Retorna só posts novos ou alterados desde a última coleta
+            state: Marcas de coleta persistidas (padrão: ~/.btc-trading/reddit_state.json)
+            store: PostStore onde todo post listado é gravado (upsert por ID)
+            client: Cliente com call_api no lugar do ApiClient do Manus
+                (ex.: ReplayApiClient para reproduzir uma gravação)
+            response_cache: Cache das listagens (padrão: um ResponseCache próprio)
+            cache_ttl: TTL do cache padrão em segundos; 0 sempre revalida
+            seen_filter: Filtro de Bloom de IDs já processados; posts presentes
+                nele não são devolvidos (quem processa os posts registra os IDs)
+            page_budgets: Máximo de páginas por subreddit na coleta paginada
+            default_page_budget: Orçamento dos subreddits fora de page_budgets
+        """
+        self.rate_limiter = rate_limiter or reddit_rate_limiter
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.incremental = incremental
+        self.state = state or (CollectionState() if incremental else None)
+        self.store = store
+        self.response_cache = response_cache if response_cache is not None else ResponseCache(ttl=cache_ttl)
+        self.seen_filter = seen_filter
+        self.page_budgets = dict(page_budgets or {})
+        self.default_page_budget = default_page_budget
+        self.client = client
+        if self.client is None and MANUS_API_AVAILABLE:
             try:
                 self.client = ApiClient()
                 logger.info("Reddit Collector inicializado com Manus API")
@@ -105,50 +202,141 @@ class RedditCollector:
             'halving', 'mining', 'wallet', 'exchange', 'trading'
         ]
     
+    @staticmethod
+    def _check_rate_limited(response):
+        """Respostas de erro com status 429 viram RateLimitedError"""
+        if isinstance(response, dict) and 'data' not in response:
+            status = response.get('status') or response.get('status_code')
+            if status == 429:
+                raise RateLimitedError(str(response.get('error', 'Too Many Requests')), response.get('retry_after'))
+    
+    def _with_rate_limit(self, endpoint: str, query: Dict, call):
+        """
+        Executa call() respeitando o token bucket compartilhado
+        
+        Em 429 a taxa é reduzida, todos os coletores pausam pelo Retry-After
+        e a chamada é repetida até max_retries vezes.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                result = call()
+                self._check_rate_limited(result[1] if isinstance(result, tuple) else result)
+                self.rate_limiter.record_success()
+                return result
+            except Exception as e:
+                limited = rate_limit_from_exception(e)
+                if limited is None:
+                    raise
+                self.rate_limiter.record_rate_limited(limited.retry_after)
+                if attempt == self.max_retries:
+                    raise limited
+                logger.info(f"429 em {endpoint} ({query}); nova tentativa {attempt + 1}/{self.max_retries}")
+    
+    def _call_api(self, endpoint: str, query: Dict):
+        """Chama a API sob o token bucket compartilhado"""
+        return self._with_rate_limit(endpoint, query, lambda: self.client.call_api(endpoint, query=query))
+    
+    def _call_api_conditional(self, endpoint: str, query: Dict, cached: Optional[CachedListing]):
+        """
+        Chamada condicional (If-None-Match / If-Modified-Since) para clientes que a suportam
+        
+        Returns:
+            Tuple[status, resposta, metadados com etag, last_modified e content_hash]
+        """
+        return self._with_rate_limit(endpoint, query, lambda: self.client.call_api_conditional(
+            endpoint, query=query,
+            etag=cached.etag if cached else None,
+            last_modified=cached.last_modified if cached else None
+        ))
+    
+    def _parse_listing(self, response: Dict, subreddit: str) -> List[RedditPost]:
+        """Converte a listagem bruta da API em posts"""
+        posts = []
+        children = response['data'].get('children', [])
+        
+        for child in children:
+            if child.get('kind') == 't3':  # Post
+                post_data = child.get('data', {})
+                
+                post = RedditPost(
+                    id=post_data.get('id', ''),
+                    title=post_data.get('title', ''),
+                    selftext=post_data.get('selftext', ''),
+                    author=post_data.get('author', ''),
+                    subreddit=post_data.get('subreddit', subreddit),
+                    score=post_data.get('score', 0),
+                    num_comments=post_data.get('num_comments', 0),
+                    created_utc=post_data.get('created_utc', 0),
+                    url=post_data.get('url', ''),
+                    permalink=post_data.get('permalink', ''),
+                    upvote_ratio=post_data.get('upvote_ratio'),
+                    flair_text=post_data.get('link_flair_text')
+                )
+                
+                posts.append(post)
+        
+        return posts
+    
     def get_hot_posts(self, subreddit: str, limit: int = 50) -> List[RedditPost]:
-        """Coleta posts quentes de um subreddit"""
+        """
+        Coleta posts quentes de um subreddit
+        
+        Com cache de respostas, a listagem é servida sem chamada dentro do TTL;
+        depois disso é revalidada (ETag/Last-Modified quando o cliente suporta)
+        e, se o conteúdo não mudou, os posts já convertidos são reaproveitados.
+        """
         if not self.client:
             logger.warning("API não disponível, retornando dados simulados")
             return self._generate_mock_posts(subreddit, limit)
         
         try:
-            logger.info(f"Coletando {limit} posts quentes de r/{subreddit}")
-            
-            response = self.client.call_api('Reddit/AccessAPI', query={
+            query = {
                 'subreddit': subreddit,
                 'limit': limit
-            })
+            }
+            cache = self.response_cache
+            key = cache.key('Reddit/AccessAPI', query) if cache is not None else None
+            cached = cache.get(key) if cache is not None else None
+            
+            if cached is not None and cache.is_fresh(cached):
+                cache.record('fresh')
+                return list(cached.posts)
+            
+            logger.info(f"Coletando {limit} posts quentes de r/{subreddit}")
+            
+            meta = {}
+            if cache is not None and hasattr(self.client, 'call_api_conditional'):
+                status, response, meta = self._call_api_conditional('Reddit/AccessAPI', query, cached)
+                if status == 304 and cached is not None:
+                    cached.fetched_at = time.time()
+                    cache.record('not_modified')
+                    logger.info(f"r/{subreddit} não modificado (304)")
+                    return list(cached.posts)
+            else:
+                response = self._call_api('Reddit/AccessAPI', query)
             
             if not response or 'data' not in response:
                 logger.warning(f"API falhou para r/{subreddit}, usando dados simulados")
                 return self._generate_mock_posts(subreddit, limit)
             
-            posts = []
-            children = response['data'].get('children', [])
+            if cache is not None:
+                digest = meta.get('content_hash') or content_hash(response)
+                if cached is not None and digest == cached.content_hash:
+                    cached.fetched_at = time.time()
+                    cached.etag = meta.get('etag') or cached.etag
+                    cached.last_modified = meta.get('last_modified') or cached.last_modified
+                    cache.record('unchanged')
+                    return list(cached.posts)
             
-            for child in children:
-                if child.get('kind') == 't3':  # Post
-                    post_data = child.get('data', {})
-                    
-                    post = RedditPost(
-                        id=post_data.get('id', ''),
-                        title=post_data.get('title', ''),
-                        selftext=post_data.get('selftext', ''),
-                        author=post_data.get('author', ''),
-                        subreddit=post_data.get('subreddit', subreddit),
-                        score=post_data.get('score', 0),
-                        num_comments=post_data.get('num_comments', 0),
-                        created_utc=post_data.get('created_utc', 0),
-                        url=post_data.get('url', ''),
-                        permalink=post_data.get('permalink', ''),
-                        upvote_ratio=post_data.get('upvote_ratio'),
-                        flair_text=post_data.get('link_flair_text')
-                    )
-                    
-                    posts.append(post)
+            posts = self._parse_listing(response, subreddit)
+            
+            if cache is not None:
+                cache.put(key, CachedListing(digest, posts, time.time(), meta.get('etag'), meta.get('last_modified')))
+                cache.record('miss')
             
             logger.info(f"Coletados {len(posts)} posts de r/{subreddit}")
-            return posts
+            return list(posts)
             
         except Exception as e:
             logger.error(f"Erro ao coletar posts de r/{subreddit}: {e}")
@@ -163,12 +351,13 @@ class RedditCollector:
         if subreddits is None:
             subreddits = self.bitcoin_subreddits
         
+        # Busca concorrente; o ritmo é dado pelo token bucket compartilhado
+        fetched = self.fetch_hot_posts_concurrently([(subreddit, limit_per_subreddit) for subreddit in subreddits])
+        
         all_posts = []
         
-        for subreddit in subreddits:
+        for subreddit, posts in zip(subreddits, fetched):
             try:
-                posts = self.get_hot_posts(subreddit, limit_per_subreddit)
-                
                 if filter_keywords:
                     # Filtra posts que contêm palavras-chave relacionadas a Bitcoin
                     filtered_posts = []
@@ -182,9 +371,6 @@ class RedditCollector:
                 else:
                     all_posts.extend(posts)
                 
-                # Delay para evitar rate limiting
-                time.sleep(1)
-                
             except Exception as e:
                 logger.error(f"Erro ao coletar de r/{subreddit}: {e}")
                 continue
@@ -200,6 +386,311 @@ class RedditCollector:
         
         return final_posts
     
+    def fetch_hot_posts_concurrently(self, requests: List[Tuple[str, int]]) -> List[List[RedditPost]]:
+        """
+        Busca vários subreddits em paralelo
+        
+        Args:
+            requests: Pares (subreddit, limite)
+            
+        Returns:
+            Listas de posts na mesma ordem dos pedidos (no modo incremental,
+            apenas posts novos ou com score alterado; com seen_filter, sem os
+            posts já processados)
+        """
+        if not requests:
+            return []
+        
+        workers = max(1, min(self.max_workers, len(requests)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reddit") as executor:
+            fetched = list(executor.map(lambda item: self.get_hot_posts(*item), requests))
+        
+        return self._process_fetched([subreddit for subreddit, _ in requests], fetched)
+    
+    def _process_fetched(self, subreddits: List[str], fetched: List[List[RedditPost]],
+                         save_state: bool = True) -> List[List[RedditPost]]:
+        """
+        Grava no armazém e aplica os filtros incremental e de IDs vistos
+        
+        Com save_state=False o estado incremental só é gravado por quem chama
+        (uma vez ao fim de uma coleta processada aos poucos).
+        """
+        if self.store is not None:
+            self.store.upsert_posts(post for posts in fetched for post in posts)
+        
+        if self.incremental and self.state is not None:
+            listed = sum(len(posts) for posts in fetched)
+            fetched = [self.state.filter_new(subreddit, posts) for subreddit, posts in zip(subreddits, fetched)]
+            if save_state:
+                self.state.save()
+            logger.info(f"Coleta incremental: {sum(len(posts) for posts in fetched)} novos/alterados de {listed} listados")
+        
+        if self.seen_filter is not None:
+            unseen = set(self.seen_filter.filter_unseen(post.id for posts in fetched for post in posts))
+            fetched = [[post for post in posts if post.id in unseen] for posts in fetched]
+        
+        return fetched
+    
+    def page_budget(self, subreddit: str) -> int:
+        """Máximo de páginas buscadas para o subreddit na coleta paginada"""
+        return self.page_budgets.get(subreddit, self.default_page_budget)
+    
+    def get_listing_page(self, subreddit: str, sort: str = 'new', limit: int = 100,
+                         after: Optional[str] = None,
+                         time_filter: Optional[str] = None) -> Tuple[List[RedditPost], Optional[str]]:
+        """
+        Busca uma página da listagem new/top
+        
+        Args:
+            subreddit: Subreddit
+            sort: 'new' (mais recentes primeiro) ou 'top'
+            limit: Posts por página (máximo da API: 100)
+            after: Cursor devolvido pela página anterior
+            time_filter: Janela do 'top' (hour, day, week, month, year, all)
+            
+        Returns:
+            Tuple[posts da página, cursor da próxima página ou None]
+        """
+        if not self.client:
+            if after is not None:
+                return [], None
+            logger.warning("API não disponível, retornando dados simulados")
+            return self._generate_mock_posts(subreddit, limit), None
+        
+        query = {'subreddit': subreddit, 'sort': sort, 'limit': limit}
+        if after:
+            query['after'] = after
+        if time_filter:
+            query['t'] = time_filter
+        
+        try:
+            response = self._call_api('Reddit/AccessAPI', query)
+        except Exception as e:
+            logger.error(f"Erro ao paginar r/{subreddit} ({sort}, after={after}): {e}")
+            return [], None
+        
+        if not response or 'data' not in response:
+            logger.warning(f"Página vazia ou inválida para r/{subreddit} ({sort}, after={after})")
+            return [], None
+        
+        return self._parse_listing(response, subreddit), response['data'].get('after')
+    
+    @staticmethod
+    def _top_time_filter(hours_back: float) -> str:
+        """Menor janela do 'top' que cobre hours_back"""
+        for name, hours in (('hour', 1), ('day', 24), ('week', 24 * 7), ('month', 24 * 31), ('year', 24 * 366)):
+            if hours_back <= hours:
+                return name
+        return 'all'
+    
+    def get_posts_since(self, subreddit: str, since_utc: float, sort: str = 'new',
+                        page_size: int = 100, max_pages: Optional[int] = None) -> List[RedditPost]:
+        """
+        Percorre a listagem paginada até sair da janela de tempo
+        
+        Em 'new' a travessia para na primeira página que alcança posts mais
+        antigos que since_utc; em 'top' (sem ordem temporal) para na primeira
+        página sem nenhum post da janela. O número de requisições acompanha
+        a janela, limitado pelo orçamento de páginas do subreddit.
+        
+        Returns:
+            Posts com created_utc >= since_utc, na ordem da listagem
+        """
+        if max_pages is None:
+            max_pages = self.page_budget(subreddit)
+        time_filter = self._top_time_filter((time.time() - since_utc) / 3600) if sort == 'top' else None
+        
+        posts: List[RedditPost] = []
+        seen_ids = set()
+        after = None
+        pages = 0
+        reached_cutoff = False
+        
+        while pages < max_pages:
+            page, next_after = self.get_listing_page(subreddit, sort, page_size, after, time_filter)
+            pages += 1
+            
+            in_window = [post for post in page if post.created_utc >= since_utc and post.id not in seen_ids]
+            seen_ids.update(post.id for post in in_window)
+            posts.extend(in_window)
+            
+            if sort == 'top':
+                reached_cutoff = not in_window
+            else:
+                reached_cutoff = any(post.created_utc < since_utc for post in page)
+            
+            # Cursor repetido: o cliente não suporta paginação
+            if reached_cutoff or not next_after or next_after == after:
+                break
+            after = next_after
+        
+        if not reached_cutoff and pages >= max_pages:
+            logger.info(f"Orçamento de {max_pages} páginas esgotado em r/{subreddit} antes do limite da janela")
+        logger.info(f"r/{subreddit}: {len(posts)} posts na janela em {pages} páginas ({sort})")
+        return posts
+    
+    def fetch_posts_since_concurrently(self, requests: List[Tuple[str, float, int]],
+                                       sort: str = 'new') -> List[List[RedditPost]]:
+        """
+        Coleta paginada de vários subreddits em paralelo
+        
+        Args:
+            requests: Triplas (subreddit, since_utc, orçamento de páginas)
+            sort: 'new' ou 'top'
+            
+        Returns:
+            Listas de posts na mesma ordem dos pedidos, com os mesmos filtros
+            de fetch_hot_posts_concurrently
+        """
+        if not requests:
+            return []
+        
+        workers = max(1, min(self.max_workers, len(requests)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reddit") as executor:
+            fetched = list(executor.map(
+                lambda item: self.get_posts_since(item[0], item[1], sort=sort, max_pages=item[2]), requests
+            ))
+        
+        return self._process_fetched([subreddit for subreddit, _, _ in requests], fetched)
+    
+    def get_comment_listing(self, post: RedditPost, limit: int = 200, depth: int = 3):
+        """
+        Busca a árvore de comentários de um post (resposta bruta da API)
+        
+        Returns:
+            Lista de filhos de nível superior ou None se a chamada falhar
+        """
+        if not self.client:
+            return self._generate_mock_comment_listing(post, limit, depth)
+        
+        try:
+            response = self._call_api('Reddit/AccessAPI', {
+                'subreddit': post.subreddit,
+                'post_id': post.id,
+                'limit': limit,
+                'depth': depth
+            })
+        except Exception as e:
+            logger.error(f"Erro ao coletar comentários de {post.id}: {e}")
+            return None
+        
+        # Formato do Reddit: [listing do post, listing dos comentários]
+        if isinstance(response, list) and len(response) > 1:
+            response = response[1]
+        if not response or 'data' not in response:
+            logger.warning(f"Resposta sem comentários para {post.id}")
+            return None
+        return response['data'].get('children', [])
+    
+    def _walk_comments(self, post: RedditPost, children: List[Dict],
+                       max_depth: int, max_comments: int) -> Iterator[RedditComment]:
+        """Percorre a árvore em pré-ordem, emitindo cada comentário ao visitá-lo"""
+        emitted = 0
+        stack = [(iter(children), 0)]
+        
+        while stack and emitted < max_comments:
+            nodes, depth = stack[-1]
+            child = next(nodes, None)
+            if child is None:
+                stack.pop()
+                continue
+            # 'more' (continuação não carregada) e outros tipos são ignorados
+            if child.get('kind') != 't1':
+                continue
+            
+            data = child.get('data', {})
+            yield RedditComment(
+                id=data.get('id', ''),
+                body=data.get('body', ''),
+                author=data.get('author', ''),
+                score=data.get('score', 0),
+                created_utc=data.get('created_utc', 0),
+                parent_id=data.get('parent_id', ''),
+                post_id=post.id,
+                subreddit=data.get('subreddit', post.subreddit)
+            )
+            emitted += 1
+            
+            replies = data.get('replies')
+            if depth + 1 < max_depth and isinstance(replies, dict):
+                stack.append((iter(replies.get('data', {}).get('children', [])), depth + 1))
+    
+    def iter_comments(self, posts: List[RedditPost], max_depth: int = 3,
+                      max_comments_per_post: int = 200) -> Iterator[RedditComment]:
+        """
+        Coleta comentários de vários posts em paralelo, como um fluxo
+        
+        No máximo max_workers árvores são buscadas ao mesmo tempo (sob o token
+        bucket compartilhado); os comentários de cada post são emitidos assim
+        que a resposta chega, sem montar a árvore de objetos.
+        
+        Args:
+            posts: Posts cujos comentários serão coletados
+            max_depth: Profundidade máxima (1 = só comentários de nível superior)
+            max_comments_per_post: Limite de comentários emitidos por post
+            
+        Yields:
+            RedditComment na ordem de chegada das respostas
+        """
+        posts = iter(posts)
+        workers = max(1, self.max_workers)
+        fetch = lambda post: self.get_comment_listing(post, max_comments_per_post, max_depth)
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reddit-comments") as executor:
+            pending = {}
+            for post in posts:
+                pending[executor.submit(fetch, post)] = post
+                if len(pending) >= workers:
+                    break
+            
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        post = pending.pop(future)
+                        following = next(posts, None)
+                        if following is not None:
+                            pending[executor.submit(fetch, following)] = following
+                        
+                        children = future.result()
+                        if children:
+                            yield from self._walk_comments(post, children, max_depth, max_comments_per_post)
+            finally:
+                # Consumidor parou antes do fim: descarta buscas ainda não iniciadas
+                for future in pending:
+                    future.cancel()
+    
+    def _generate_mock_comment_listing(self, post: RedditPost, limit: int, depth: int) -> List[Dict]:
+        """Gera uma árvore de comentários simulada no formato da API"""
+        bodies = [
+            "HODL, this dip is a buying opportunity",
+            "Not convinced, volume looks weak",
+            "Great analysis, thanks for sharing!",
+            "Regulation news will crash the market"
+        ]
+        
+        def node(index: int, parent: str, level: int) -> Dict:
+            comment_id = f"{post.id}_c{index}_{level}"
+            replies = ""
+            if level + 1 < depth:
+                replies = {'kind': 'Listing', 'data': {'children': [node(index, f"t1_{comment_id}", level + 1)]}}
+            return {
+                'kind': 't1',
+                'data': {
+                    'id': comment_id,
+                    'body': bodies[(index + level) % len(bodies)],
+                    'author': f"commenter_{index % 7}",
+                    'score': max(1, 50 // (index + level + 1)),
+                    'created_utc': post.created_utc + 60 * (index + 1) * (level + 1),
+                    'parent_id': parent,
+                    'subreddit': post.subreddit,
+                    'replies': replies
+                }
+            }
+        
+        top_level = min(limit, max(1, post.num_comments // 10), 10)
+        return [node(i, f"t3_{post.id}", 0) for i in range(top_level)]
+    
     def _generate_mock_posts(self, subreddit: str, limit: int) -> List[RedditPost]:
         """Gera posts simulados para teste quando a API não está disponível"""
         
@@ -290,41 +781,45 @@ class RedditCollector:
         return posts
     
     def posts_to_dataframe(self, posts: List[RedditPost]) -> pd.DataFrame:
-        """Converte lista de posts para DataFrame pandas"""
+        """Converte lista de posts para DataFrame pandas (construção colunar)"""
         
-        data = []
-        for post in posts:
-            data.append({
-                'id': post.id,
-                'title': post.title,
-                'selftext': post.selftext,
-                'full_text': post.full_text,
-                'author': post.author,
-                'subreddit': post.subreddit,
-                'score': post.score,
-                'num_comments': post.num_comments,
-                'created_utc': post.created_utc,
-                'created_datetime': post.created_datetime,
-                'url': post.url,
-                'permalink': post.permalink,
-                'upvote_ratio': post.upvote_ratio,
-                'flair_text': post.flair_text
-            })
+        if not posts:
+            return pd.DataFrame()
+        
+        # Extrai cada coluna com attrgetter (laço em C); conversões são vetorizadas
+        data = {name: list(map(attrgetter(name), posts)) for name in _DATAFRAME_FIELDS}
+        created_utc = np.asarray(data['created_utc'], dtype=float)
+        data['created_utc'] = created_utc
+        
+        # created_datetime entra logo após created_utc, como no esquema original
+        position = _DATAFRAME_FIELDS.index('created_utc') + 1
+        items = list(data.items())
+        items.insert(position, ('created_datetime', _to_local_datetime(created_utc)))
+        data = dict(items)
+        
+        # Colunas úteis calculadas antes da ordenação, sem passar por .str
+        data['text_length'] = np.fromiter(map(len, data['full_text']), dtype='int64', count=len(posts))
+        # Diferença de relógio local, como (datetime.now() - created_datetime)
+        now = np.datetime64(datetime.now(), 'us')
+        data['hours_ago'] = (now - data['created_datetime']) / np.timedelta64(1, 'h')
         
         df = pd.DataFrame(data)
         
-        if not df.empty:
-            # Ordena por score (popularidade) decrescente
-            df = df.sort_values('score', ascending=False)
-            
-            # Adiciona colunas úteis
-            df['text_length'] = df['full_text'].str.len()
-            df['hours_ago'] = (datetime.now() - df['created_datetime']).dt.total_seconds() / 3600
-            
-        return df
+        # Ordena por score (popularidade) decrescente
+        return df.sort_values('score', ascending=False)
     
     def save_posts_to_file(self, posts: List[RedditPost], filename: str):
-        """Salva posts em arquivo JSON"""
+        """Salva posts em arquivo JSON (ou JSONL em streaming se o nome contiver .jsonl)"""
+        
+        if '.jsonl' in Path(filename).suffixes:
+            # Import tardio: post_archive importa RedditPost deste módulo
+            try:
+                from .post_archive import write_posts_jsonl
+            except ImportError:
+                from post_archive import write_posts_jsonl
+            # Substitui o arquivo, como no JSON; acréscimos ficam com PostArchiveWriter
+            write_posts_jsonl(posts, filename, append=False)
+            return
         
         data = []
         for post in posts:
@@ -380,12 +875,49 @@ class RedditCollector:
         except Exception as e:
             logger.error(f"Erro ao carregar posts de {filename}: {e}")
             return []
+    
+    def iter_posts_from_file(self, filename: str, start_utc: Optional[float] = None,
+                             end_utc: Optional[float] = None,
+                             subreddits: Optional[List[str]] = None) -> Iterator[RedditPost]:
+        """
+        Lê posts sob demanda, filtrando por período e subreddit
+        
+        Arquivos JSONL (.jsonl, .jsonl.gz, ...) são lidos linha a linha com
+        memória constante; arquivos JSON antigos são carregados inteiros.
+        """
+        if '.jsonl' in Path(filename).suffixes:
+            try:
+                from .post_archive import iter_posts_jsonl
+            except ImportError:
+                from post_archive import iter_posts_jsonl
+            yield from iter_posts_jsonl(filename, start_utc, end_utc, subreddits)
+            return
+        
+        for post in self.load_posts_from_file(filename):
+            if start_utc is not None and post.created_utc < start_utc:
+                continue
+            if end_utc is not None and post.created_utc >= end_utc:
+                continue
+            if subreddits and post.subreddit not in subreddits:
+                continue
+            yield post
 
 class BitcoinSentimentCollector:
     """Coletor especializado para análise de sentimento Bitcoin"""
     
-    def __init__(self):
-        self.reddit_collector = RedditCollector()
+    def __init__(self, incremental: bool = False, store=None, client=None, seen_filter=None,
+                 paginated: bool = False, page_budgets: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            paginated: Coleta pela listagem 'new' paginada até o limite de
+                hours_back, em vez de um número fixo de posts quentes
+            page_budgets: Máximo de páginas por subreddit no modo paginado
+                (padrão: 10 nos prioritários, 5 nos secundários)
+        """
+        self.reddit_collector = RedditCollector(incremental=incremental, store=store, client=client,
+                                                seen_filter=seen_filter, page_budgets=page_budgets)
+        self.paginated = paginated
+        self.trending = TrendingTopicsEngine()
         
         # Configurações específicas para Bitcoin
         self.priority_subreddits = [
@@ -402,6 +934,87 @@ class BitcoinSentimentCollector:
             'stocks'
         ]
     
+    def _page_budget(self, subreddit: str, secondary: bool) -> int:
+        """Orçamento de páginas; secundários usam metade do padrão"""
+        collector = self.reddit_collector
+        default = max(1, collector.default_page_budget // 2) if secondary else collector.default_page_budget
+        return collector.page_budgets.get(subreddit, default)
+    
+    def _subreddit_requests(self, max_posts_per_subreddit: int) -> List[Tuple[str, int, bool]]:
+        """Triplas (subreddit, limite, secundário): prioritários com mais posts, secundários com menos"""
+        requests = [(subreddit, max_posts_per_subreddit, False) for subreddit in self.priority_subreddits]
+        requests += [(subreddit, max_posts_per_subreddit // 2, True) for subreddit in self.secondary_subreddits]
+        return requests
+    
+    def _filter_posts(self, posts: List[RedditPost], secondary: bool,
+                      cutoff_time: datetime, min_score: int) -> List[RedditPost]:
+        """Filtros de relevância (secundários), tempo, score e texto mínimo"""
+        filtered_posts = []
+        for post in posts:
+            if secondary:
+                # Filtra apenas posts relacionados a Bitcoin
+                text = f"{post.title} {post.selftext}".lower()
+                if not any(keyword in text for keyword in ['bitcoin', 'btc', 'crypto']):
+                    continue
+            if (post.created_datetime >= cutoff_time and 
+                post.score >= min_score and
+                len(post.full_text.strip()) > 10):  # Texto mínimo
+                filtered_posts.append(post)
+        return filtered_posts
+    
+    def _fetch_subreddit(self, subreddit: str, limit: int, secondary: bool, since_utc: float) -> List[RedditPost]:
+        """Busca um subreddit (executado nas threads de rede; sem tocar no estado da coleta)"""
+        collector = self.reddit_collector
+        if self.paginated:
+            return collector.get_posts_since(subreddit, since_utc, max_pages=self._page_budget(subreddit, secondary))
+        return collector.get_hot_posts(subreddit, limit)
+    
+    def _process_subreddit(self, subreddit: str, posts: List[RedditPost], since_utc: float) -> List[RedditPost]:
+        """Armazém, filtros incremental e de vistos e leitura da janela, como na coleta em lote"""
+        collector = self.reddit_collector
+        posts = collector._process_fetched([subreddit], [posts], save_state=False)[0]
+        
+        if collector.store is not None and not collector.incremental:
+            posts = collector.store.get_posts([subreddit], start_utc=since_utc)
+        return posts
+    
+    def iter_subreddit_posts(self, hours_back: int = 24, min_score: int = 5,
+                             max_posts_per_subreddit: int = 50) -> Iterator[Tuple[str, List[RedditPost]]]:
+        """
+        Entrega os posts filtrados de cada subreddit assim que ele é baixado
+        
+        Mesmos filtros de collect_recent_sentiment_data, exceto a deduplicação
+        entre subreddits, que fica a cargo de quem consome. Só a rede roda em
+        paralelo: filtros e estado incremental são aplicados na thread que
+        consome, e o estado é gravado uma vez ao fim. Fechar o iterador
+        cancela as buscas ainda não iniciadas.
+        """
+        requests = self._subreddit_requests(max_posts_per_subreddit)
+        cutoff_time = datetime.now() - timedelta(hours=hours_back)
+        since_utc = cutoff_time.timestamp()
+        
+        workers = max(1, min(self.reddit_collector.max_workers, len(requests)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reddit")
+        futures = {
+            executor.submit(self._fetch_subreddit, subreddit, limit, secondary, since_utc): (subreddit, secondary)
+            for subreddit, limit, secondary in requests
+        }
+        try:
+            for future in as_completed(futures):
+                subreddit, secondary = futures[future]
+                try:
+                    posts = self._process_subreddit(subreddit, future.result(), since_utc)
+                except Exception as e:
+                    logger.error(f"Erro ao coletar de r/{subreddit}: {e}")
+                    continue
+                yield subreddit, self._filter_posts(posts, secondary, cutoff_time, min_score)
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            if self.reddit_collector.state is not None:
+                self.reddit_collector.state.save()
+    
     def collect_recent_sentiment_data(self, 
                                     hours_back: int = 24,
                                     min_score: int = 5,
@@ -410,36 +1023,32 @@ class BitcoinSentimentCollector:
         
         logger.info(f"Coletando dados de sentimento das últimas {hours_back} horas")
         
-        # Coleta posts dos subreddits prioritários
-        all_posts = []
+        # Coleta posts dos subreddits prioritários (mais posts) e secundários (menos posts)
+        # em paralelo, no ritmo do token bucket compartilhado
+        requests = self._subreddit_requests(max_posts_per_subreddit)
+        cutoff_time = datetime.now() - timedelta(hours=hours_back)
+        if self.paginated:
+            # Páginas até o limite da janela; max_posts_per_subreddit não se aplica
+            since_utc = cutoff_time.timestamp()
+            fetched = self.reddit_collector.fetch_posts_since_concurrently(
+                [(subreddit, since_utc, self._page_budget(subreddit, secondary))
+                 for subreddit, _, secondary in requests]
+            )
+        else:
+            fetched = self.reddit_collector.fetch_hot_posts_concurrently(
+                [(subreddit, limit) for subreddit, limit, _ in requests]
+            )
         
-        # Subreddits prioritários - mais posts
-        for subreddit in self.priority_subreddits:
-            posts = self.reddit_collector.get_hot_posts(subreddit, max_posts_per_subreddit)
-            all_posts.extend(posts)
-            time.sleep(0.5)  # Rate limiting
-        
-        # Subreddits secundários - menos posts
-        for subreddit in self.secondary_subreddits:
-            posts = self.reddit_collector.get_hot_posts(subreddit, max_posts_per_subreddit // 2)
-            # Filtra apenas posts relacionados a Bitcoin
-            bitcoin_posts = []
-            for post in posts:
-                text = f"{post.title} {post.selftext}".lower()
-                if any(keyword in text for keyword in ['bitcoin', 'btc', 'crypto']):
-                    bitcoin_posts.append(post)
-            all_posts.extend(bitcoin_posts)
-            time.sleep(0.5)
+        # Com armazém, a janela vem do banco (inclui posts de coletas anteriores)
+        store = self.reddit_collector.store
+        if store is not None and not self.reddit_collector.incremental:
+            cutoff_utc = cutoff_time.timestamp()
+            fetched = [store.get_posts([subreddit], start_utc=cutoff_utc) for subreddit, _, _ in requests]
         
-        # Filtra por tempo e score
-        cutoff_time = datetime.now() - timedelta(hours=hours_back)
+        # Filtra por relevância, tempo e score
         filtered_posts = []
-        
-        for post in all_posts:
-            if (post.created_datetime >= cutoff_time and 
-                post.score >= min_score and
-                len(post.full_text.strip()) > 10):  # Texto mínimo
-                filtered_posts.append(post)
+        for (_, _, secondary), posts in zip(requests, fetched):
+            filtered_posts.extend(self._filter_posts(posts, secondary, cutoff_time, min_score))
         
         # Remove duplicatas
         unique_posts = {}
@@ -456,31 +1065,39 @@ class BitcoinSentimentCollector:
         
         return final_posts, df
     
+    def stream_comments(self, posts: List[RedditPost], top_posts: int = 10,
+                        max_depth: int = 3, max_comments_per_post: int = 200) -> Iterator[RedditComment]:
+        """Fluxo de comentários dos posts mais comentados (ex.: daily threads do r/BitcoinMarkets)"""
+        selected = sorted(posts, key=lambda post: post.num_comments, reverse=True)[:top_posts]
+        return self.reddit_collector.iter_comments(selected, max_depth, max_comments_per_post)
+    
     def get_trending_topics(self, posts: List[RedditPost], top_n: int = 10) -> List[Tuple[str, int]]:
-        """Identifica tópicos em alta baseado nos títulos dos posts"""
+        """
+        Identifica tópicos em alta baseado nos títulos dos posts
         
-        from collections import Counter
-        import re
-        
-        # Extrai palavras dos títulos
-        words = []
-        for post in posts:
-            # Remove pontuação e converte para minúsculas
-            title_words = re.findall(r'\b\w+\b', post.title.lower())
-            # Filtra palavras muito comuns ou muito curtas
-            filtered_words = [
-                word for word in title_words 
-                if len(word) > 3 and word not in ['bitcoin', 'btc', 'crypto', 'cryptocurrency']
-            ]
-            words.extend(filtered_words)
-        
-        # Conta frequência
-        word_counts = Counter(words)
-        trending = word_counts.most_common(top_n)
+        Devolve quantas vezes cada termo aparece nos títulos dos posts
+        informados. Os posts também alimentam o motor incremental (cada ID
+        conta uma vez), cuja visão decaída entre coletas fica em
+        self.trending.top() e get_accelerating_topics().
+        """
+        self.trending.add_posts(posts)
+        counts = Counter(term for post in posts for term in self.trending.tokenize(post.title))
+        trending = counts.most_common(top_n)
         
         logger.info(f"Tópicos em alta: {[word for word, count in trending[:5]]}")
         
         return trending
+    
+    def get_accelerating_topics(self, posts: Optional[List[RedditPost]] = None,
+                                top_n: int = 10) -> List[Tuple[str, float]]:
+        """Termos cujo volume recente cresce acima da linha de base (razão de taxas)"""
+        if posts:
+            self.trending.add_posts(posts)
+        accelerating = self.trending.accelerating(top_n)
+        
+        logger.info(f"Tópicos em aceleração: {[term for term, ratio in accelerating[:5]]}")
+        
+        return accelerating
 
 def main():
     """Função principal para teste do coletor"""
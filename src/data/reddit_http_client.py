@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Cliente HTTP para a API JSON pública do Reddit
+Mesma interface call_api do ApiClient do Manus, mais call_api_conditional
+com If-None-Match / If-Modified-Since para revalidar listagens
+"""
+
+import hashlib
+import logging
+from typing import Dict, Optional, Tuple
+
+import requests
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class RedditHttpClient:
+    """Acessa /r/{subreddit}/{hot,new,top}.json e /r/{subreddit}/comments/{id}.json"""
+
+    def __init__(self, base_url: str = "https://www.reddit.com",
+                 user_agent: str = "btc-trading/1.0", timeout: float = 10.0):
+        """
+        Args:
+            base_url: Servidor da API (ex.: http://127.0.0.1:8089 para o servidor simulado)
+            user_agent: User-Agent exigido pelo Reddit
+            timeout: Timeout por requisição (segundos)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._session.headers['User-Agent'] = user_agent
+
+    def _request(self, query: Dict, headers: Dict) -> requests.Response:
+        subreddit = query['subreddit']
+        params = {'limit': query.get('limit', 25), 'raw_json': 1}
+        if query.get('post_id'):
+            path = f"/r/{subreddit}/comments/{query['post_id']}.json"
+            if query.get('depth'):
+                params['depth'] = query['depth']
+        else:
+            path = f"/r/{subreddit}/{query.get('sort', 'hot')}.json"
+            for name in ('after', 't'):
+                if query.get(name):
+                    params[name] = query[name]
+
+        response = self._session.get(f"{self.base_url}{path}", params=params,
+                                     headers=headers, timeout=self.timeout)
+        if response.status_code >= 400:
+            # HTTPError leva status e Retry-After para rate_limit_from_exception
+            error = requests.HTTPError(f"{response.status_code} em {path}", response=response)
+            error.status_code = response.status_code
+            raise error
+        return response
+
+    def call_api(self, endpoint: str, query: Optional[Dict] = None):
+        """Equivalente a ApiClient.call_api('Reddit/AccessAPI', query=...)"""
+        return self.call_api_conditional(endpoint, query)[1]
+
+    def call_api_conditional(self, endpoint: str, query: Optional[Dict] = None,
+                             etag: Optional[str] = None,
+                             last_modified: Optional[str] = None) -> Tuple[int, Optional[Dict], Dict]:
+        """
+        Requisição condicional
+
+        Returns:
+            Tuple[status (200 ou 304), resposta (None em 304), metadados com
+            etag, last_modified e content_hash do corpo]
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        response = self._request(query or {}, headers)
+        meta = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        if response.status_code == 304:
+            return 304, None, meta
+
+        meta['content_hash'] = hashlib.sha1(response.content).hexdigest()
+        return response.status_code, response.json(), meta
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Cache de Respostas das Listagens do Reddit
+Guarda a última resposta por consulta com os validadores HTTP (ETag e
+Last-Modified) e o hash do conteúdo; dentro do TTL a chamada é evitada e,
+quando o conteúdo não mudou, os posts já convertidos são reaproveitados
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+def content_hash(payload: Any) -> str:
+    """Hash estável de uma resposta já decodificada"""
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+@dataclass
+class CachedListing:
+    """Última resposta de uma consulta e os posts convertidos a partir dela"""
+    content_hash: str
+    posts: List
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+class ResponseCache:
+    """Cache LRU de listagens com TTL e revalidação condicional"""
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 512):
+        """
+        Inicializa o cache
+
+        Args:
+            ttl: Segundos em que a listagem é servida sem nenhuma chamada
+            max_entries: Consultas mantidas (as menos usadas saem primeiro)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedListing]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.fresh_hits = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(endpoint: str, query: Dict) -> str:
+        return f"{endpoint}|{json.dumps(query, sort_keys=True)}"
+
+    def get(self, key: str) -> Optional[CachedListing]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: CachedListing) -> bool:
+        return time.time() - entry.fetched_at < self.ttl
+
+    def put(self, key: str, entry: CachedListing):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record(self, outcome: str):
+        """Conta o resultado de uma consulta: fresh, not_modified, unchanged ou miss"""
+        with self._lock:
+            if outcome == 'fresh':
+                self.fresh_hits += 1
+            elif outcome == 'not_modified':
+                self.not_modified += 1
+            elif outcome == 'unchanged':
+                self.unchanged += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Consultas evitadas pelo TTL, respostas 304, conteúdos iguais e conversões completas"""
+        with self._lock:
+            total = self.fresh_hits + self.not_modified + self.unchanged + self.misses
+            return {
+                'entries': len(self._entries),
+                'fresh_hits': self.fresh_hits,
+                'not_modified': self.not_modified,
+                'unchanged': self.unchanged,
+                'misses': self.misses,
+                'reuse_rate': (total - self.misses) / total if total else 0.0
+            }
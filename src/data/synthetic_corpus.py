@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Gerador de Corpus Sintético do Reddit para Benchmarks
+Produz milhões de RedditPost sob demanda, com distribuições realistas de
+tamanho de título e corpo, score de cauda longa, mistura de subreddits,
+duplicatas, crossposts e chegadas com ciclo diário; mesma semente, mesmo corpus
+"""
+
+import argparse
+import math
+import random
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass, field, fields, replace
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .reddit_collector import RedditPost
+    from .post_archive import write_posts_jsonl
+except ImportError:
+    from reddit_collector import RedditPost
+    from post_archive import write_posts_jsonl
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BITCOIN_TERMS = [
+    'Bitcoin', 'BTC', 'bitcoin', 'sats', 'halving', 'Lightning', 'miners', 'hashrate',
+    'ETF', 'exchange', 'wallet', 'cold storage', 'HODL', 'blockchain', 'crypto', 'Saylor'
+]
+POSITIVE_WORDS = [
+    'bullish', 'moon', 'breakout', 'rally', 'adoption', 'gains', 'pump', 'amazing',
+    'strong', 'buying', 'optimistic', 'record', 'surge', 'great', 'love', 'undervalued'
+]
+NEGATIVE_WORDS = [
+    'bearish', 'crash', 'dump', 'scam', 'selling', 'fear', 'collapse', 'terrible',
+    'rekt', 'bubble', 'panic', 'loss', 'ban', 'hack', 'worried', 'overvalued'
+]
+FILLER_WORDS = [
+    'the', 'price', 'today', 'market', 'is', 'and', 'what', 'do', 'you', 'think', 'about',
+    'this', 'week', 'chart', 'support', 'resistance', 'volume', 'analysis', 'news', 'long',
+    'term', 'short', 'my', 'strategy', 'just', 'again', 'why', 'how', 'should', 'I', 'now',
+    'level', 'trend', 'daily', 'discussion', 'question', 'update', 'fees', 'node', 'dca'
+]
+FLAIRS = ['Discussion', 'News', 'Analysis', 'Question', 'Meme', 'Education', None]
+
+DEFAULT_SUBREDDIT_WEIGHTS = {
+    'Bitcoin': 0.30,
+    'CryptoCurrency': 0.28,
+    'BitcoinMarkets': 0.10,
+    'btc': 0.08,
+    'CryptoMarkets': 0.07,
+    'BitcoinBeginners': 0.06,
+    'investing': 0.06,
+    'stocks': 0.05
+}
+
+_BASE36 = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+# Textos longos são montados de frases pré-sorteadas (um sorteio a cada 6 palavras)
+_PHRASE_WORDS = 6
+_PHRASE_POOL = 4096
+
+def _base36(value: int) -> str:
+    digits = []
+    while True:
+        value, remainder = divmod(value, 36)
+        digits.append(_BASE36[remainder])
+        if not value:
+            return ''.join(reversed(digits))
+
+@dataclass
+class CorpusConfig:
+    """Parâmetros do corpus sintético"""
+    posts: int = 100_000
+    seed: int = 42
+    # Fim da linha do tempo (None = agora; fixe para saída idêntica byte a byte)
+    end_utc: Optional[float] = None
+
+    # Chegadas de Poisson com ciclo diário (pico às 15h UTC)
+    posts_per_hour: float = 400.0
+    diurnal_amplitude: float = 0.5
+
+    subreddit_weights: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_SUBREDDIT_WEIGHTS))
+
+    # Tamanhos em palavras (log-normais: mediana = exp(mu))
+    title_words_mu: float = 2.2
+    title_words_sigma: float = 0.45
+    body_words_mu: float = 4.0
+    body_words_sigma: float = 1.0
+    # Fração de posts só com link (corpo vazio)
+    link_post_rate: float = 0.35
+
+    # Score de cauda longa (Pareto) e comentários proporcionais ao score
+    score_alpha: float = 1.3
+    score_scale: float = 3.0
+    score_max: int = 100_000
+    comments_per_score: float = 0.15
+
+    # Mesmo ID reaparecendo com score atualizado (listagens sobrepostas)
+    duplicate_rate: float = 0.02
+    # Mesmo conteúdo publicado em outro subreddit (novo ID)
+    crosspost_rate: float = 0.03
+    recent_window: int = 2000
+
+    authors: int = 50_000
+    deleted_author_rate: float = 0.02
+
+    # Mistura de rótulos de sentimento (positivo, negativo, neutro)
+    sentiment_weights: Tuple[float, float, float] = (0.4, 0.3, 0.3)
+    # Fração das palavras vinda do vocabulário do rótulo
+    sentiment_word_rate: float = 0.25
+
+@dataclass
+class CorpusStats:
+    """Contadores da geração"""
+    generated: int = 0
+    originals: int = 0
+    duplicates: int = 0
+    crossposts: int = 0
+    link_posts: int = 0
+    elapsed: float = 0.0
+
+class SyntheticRedditCorpus:
+    """Gera posts sintéticos em fluxo, reprodutíveis pela semente"""
+
+    LABELS = ('positive', 'negative', 'neutral')
+
+    def __init__(self, config: Optional[CorpusConfig] = None, **overrides):
+        """
+        Args:
+            config: Configuração completa do corpus
+            **overrides: Campos de CorpusConfig a substituir (ex.: posts=1_000_000, seed=7)
+        """
+        config = config or CorpusConfig()
+        known = {item.name for item in fields(config)}
+        for name in overrides:
+            if name not in known:
+                raise ValueError(f"Parâmetro de corpus desconhecido: {name}")
+        # Cópia: a configuração de quem chama não herda as substituições
+        self.config = replace(config, **overrides)
+        self.stats = CorpusStats()
+
+    def _vocabularies(self) -> Dict[str, Tuple[List[str], List[float]]]:
+        """Vocabulário e pesos acumulados por rótulo (um único sorteio por texto)"""
+        rate = self.config.sentiment_word_rate
+        vocabularies = {}
+        for label, extra in (('positive', POSITIVE_WORDS), ('negative', NEGATIVE_WORDS), ('neutral', [])):
+            words = FILLER_WORDS + extra
+            share = rate if extra else 0.0
+            weights = [(1 - share) / len(FILLER_WORDS)] * len(FILLER_WORDS)
+            weights += [share / len(extra)] * len(extra) if extra else []
+            cum_weights, total = [], 0.0
+            for weight in weights:
+                total += weight
+                cum_weights.append(total)
+            vocabularies[label] = (words, cum_weights)
+        return vocabularies
+    
+    @staticmethod
+    def _phrases(rng: random.Random, vocabulary: Tuple[List[str], List[float]]) -> List[str]:
+        return [' '.join(rng.choices(vocabulary[0], cum_weights=vocabulary[1], k=_PHRASE_WORDS))
+                for _ in range(_PHRASE_POOL)]
+    
+    @staticmethod
+    def _words(rng: random.Random, count: int, vocabulary: Tuple[List[str], List[float]],
+               phrases: List[str], sentiment_words: Optional[List[str]] = None) -> str:
+        """Texto com count palavras do vocabulário mais um termo de Bitcoin (e um de sentimento, se informado)"""
+        full, rest = divmod(count, _PHRASE_WORDS)
+        parts = rng.choices(phrases, k=full)
+        if rest:
+            parts.append(' '.join(rng.choices(vocabulary[0], cum_weights=vocabulary[1], k=rest)))
+        parts.insert(rng.randrange(len(parts) + 1), rng.choice(BITCOIN_TERMS))
+        if sentiment_words:
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(sentiment_words))
+        return ' '.join(parts)
+
+    def _arrival_gap(self, rng: random.Random, now: float, base_rate: float) -> float:
+        """Intervalo até o próximo post (taxa modulada pela hora do dia)"""
+        hour = (now / 3600.0) % 24
+        rate = base_rate * (1 + self.config.diurnal_amplitude * math.sin(2 * math.pi * (hour - 9) / 24))
+        return rng.expovariate(max(rate, base_rate * 0.05))
+
+    def iter_labeled(self, factory: Callable = RedditPost) -> Iterator[Tuple[object, str]]:
+        """
+        Gera (post, rótulo de sentimento) sob demanda
+
+        Args:
+            factory: Construtor com os campos do RedditPost (ex.: outra
+                classe de post em benchmarks comparativos)
+
+        Yields:
+            Pares na ordem de observação: created_utc cresce, exceto nas
+            duplicatas, que repetem o post original
+        """
+        config = self.config
+        rng = random.Random(config.seed)
+        stats = self.stats = CorpusStats()
+        started = time.time()
+
+        subreddits = list(config.subreddit_weights)
+        subreddit_cum = []
+        total = 0.0
+        for weight in config.subreddit_weights.values():
+            total += weight
+            subreddit_cum.append(total)
+        label_cum = [sum(config.sentiment_weights[:i + 1]) for i in range(3)]
+        vocabularies = self._vocabularies()
+        # Todo texto positivo/negativo leva ao menos uma palavra do seu rótulo (no título)
+        anchors = {'positive': POSITIVE_WORDS, 'negative': NEGATIVE_WORDS, 'neutral': None}
+        phrases = {label: self._phrases(rng, vocabulary) for label, vocabulary in vocabularies.items()}
+
+        base_rate = config.posts_per_hour / 3600.0
+        end_utc = config.end_utc if config.end_utc is not None else time.time()
+        now = end_utc - config.posts / base_rate
+        next_id = 10_000_000 + config.seed * 1_000_003
+        recent: deque = deque(maxlen=config.recent_window)
+
+        for _ in range(config.posts):
+            roll = rng.random()
+            if recent and roll < config.duplicate_rate:
+                # Reaparição do mesmo post com score/comentários atualizados
+                fields, label = recent[rng.randrange(len(recent))]
+                growth = 1.0 + rng.expovariate(4.0)
+                fields = dict(fields, score=min(config.score_max, int(fields['score'] * growth) + 1),
+                              num_comments=int(fields['num_comments'] * growth))
+                stats.duplicates += 1
+                stats.generated += 1
+                yield factory(**fields), label
+                continue
+
+            now += self._arrival_gap(rng, now, base_rate)
+            post_id = _base36(next_id)
+            next_id += 1
+
+            if recent and roll < config.duplicate_rate + config.crosspost_rate:
+                # Mesmo título/corpo em outro subreddit, apontando para o original
+                original, label = recent[rng.randrange(len(recent))]
+                subreddit = rng.choices(subreddits, cum_weights=subreddit_cum)[0]
+                if subreddit == original['subreddit']:
+                    subreddit = subreddits[(subreddits.index(subreddit) + 1) % len(subreddits)]
+                score = max(1, int(original['score'] * rng.uniform(0.05, 0.5)))
+                fields = dict(
+                    original, id=post_id, subreddit=subreddit, score=score,
+                    num_comments=int(score * config.comments_per_score * rng.random()),
+                    created_utc=now, url=f"https://www.reddit.com{original['permalink']}",
+                    permalink=f"/r/{subreddit}/comments/{post_id}/"
+                )
+                stats.crossposts += 1
+                stats.generated += 1
+                yield factory(**fields), label
+                continue
+
+            label = rng.choices(self.LABELS, cum_weights=label_cum)[0]
+            subreddit = rng.choices(subreddits, cum_weights=subreddit_cum)[0]
+
+            title_words = max(2, min(60, int(rng.lognormvariate(config.title_words_mu, config.title_words_sigma))))
+            title = self._words(rng, title_words, vocabularies[label], phrases[label], anchors[label])
+            if rng.random() < config.link_post_rate:
+                selftext = ''
+                stats.link_posts += 1
+            else:
+                body_words = max(3, min(2000, int(rng.lognormvariate(config.body_words_mu, config.body_words_sigma))))
+                selftext = self._words(rng, body_words, vocabularies[label], phrases[label])
+
+            score = min(config.score_max, int(config.score_scale * rng.paretovariate(config.score_alpha) - config.score_scale) + 1)
+            num_comments = int(score * config.comments_per_score * rng.lognormvariate(0.0, 0.8))
+            if rng.random() < config.deleted_author_rate:
+                author = '[deleted]'
+            else:
+                author = f"user_{int(rng.paretovariate(1.1)) % config.authors}"
+            ratio = rng.betavariate(9, 2) if label != 'negative' else rng.betavariate(5, 3)
+
+            fields = {
+                'id': post_id,
+                'title': title,
+                'selftext': selftext,
+                'author': author,
+                'subreddit': subreddit,
+                'score': score,
+                'num_comments': num_comments,
+                'created_utc': now,
+                'url': f"https://www.reddit.com/r/{subreddit}/comments/{post_id}/",
+                'permalink': f"/r/{subreddit}/comments/{post_id}/",
+                'upvote_ratio': round(ratio, 2),
+                'flair_text': rng.choice(FLAIRS)
+            }
+            recent.append((fields, label))
+            stats.originals += 1
+            stats.generated += 1
+            yield factory(**fields), label
+
+        stats.elapsed = time.time() - started
+
+    def iter_posts(self, factory: Callable = RedditPost) -> Iterator[RedditPost]:
+        """Gera apenas os posts (ver iter_labeled)"""
+        for post, _ in self.iter_labeled(factory):
+            yield post
+
+    def labeled_texts(self, size: int) -> List[Tuple[str, str]]:
+        """Primeiros size pares (texto, sentimento esperado), sem duplicatas"""
+        texts = []
+        seen = set()
+        for post, label in self.iter_labeled():
+            if post.id in seen:
+                continue
+            seen.add(post.id)
+            texts.append((post.full_text, label))
+            if len(texts) >= size:
+                break
+        return texts
+
+    def write_jsonl(self, filename) -> int:
+        """Grava o corpus em JSONL (.gz/.bz2/.xz comprimem) sem mantê-lo em memória"""
+        return write_posts_jsonl(self.iter_posts(), filename, append=False)
+
+def generate_posts(count: int, seed: int = 42, **overrides) -> Iterator[RedditPost]:
+    """Atalho: fluxo de count posts com a configuração padrão"""
+    return SyntheticRedditCorpus(posts=count, seed=seed, **overrides).iter_posts()
+
+def main():
+    """Gera um corpus sintético em arquivo JSONL"""
+    parser = argparse.ArgumentParser(description="Corpus sintético do Reddit para benchmarks")
+    parser.add_argument('output', help='Arquivo JSONL de saída (.gz/.bz2/.xz para comprimir)')
+    parser.add_argument('--posts', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--end-utc', type=float, default=None, help='Fim da linha do tempo (padrão: agora)')
+    parser.add_argument('--posts-per-hour', type=float, default=400.0)
+    parser.add_argument('--duplicate-rate', type=float, default=0.02)
+    parser.add_argument('--crosspost-rate', type=float, default=0.03)
+    args = parser.parse_args()
+
+    corpus = SyntheticRedditCorpus(
+        posts=args.posts, seed=args.seed, end_utc=args.end_utc, posts_per_hour=args.posts_per_hour,
+        duplicate_rate=args.duplicate_rate, crosspost_rate=args.crosspost_rate
+    )
+    written = corpus.write_jsonl(args.output)
+    stats = corpus.stats
+    print(f"{written:,} posts em {args.output} ({stats.elapsed:.1f}s, {written / max(stats.elapsed, 1e-9):,.0f} posts/s): "
+          f"{stats.duplicates:,} duplicatas, {stats.crossposts:,} crossposts, {stats.link_posts:,} só com link")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Motor Incremental de Tópicos em Alta
+Space-saving top-k com decaimento exponencial em duas escalas de tempo:
+a curta mede o volume recente e a longa serve de linha de base para detectar
+termos (palavras e bigramas) em aceleração
+"""
+
+import heapq
+import math
+import re
+import threading
+import time
+import logging
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r'\b\w+\b')
+
+DEFAULT_STOPWORDS = frozenset(['bitcoin', 'btc', 'crypto', 'cryptocurrency'])
+
+# Reescala os pesos acumulados antes que exp() perca precisão
+_MAX_EXPONENT = 50.0
+
+class _Counter:
+    """Contagem de um termo com decaimento progressivo (forward decay)"""
+
+    __slots__ = ('short', 'long', 'error')
+
+    def __init__(self, short: float = 0.0, long: float = 0.0, error: float = 0.0):
+        self.short = short
+        self.long = long
+        self.error = error
+
+class TrendingTopicsEngine:
+    """Contagens decaídas de termos com memória limitada (space-saving)"""
+
+    def __init__(self, capacity: int = 500, half_life_hours: float = 6.0,
+                 baseline_half_life_hours: float = 48.0, bigrams: bool = True,
+                 min_word_length: int = 4, stopwords: Optional[Iterable[str]] = None,
+                 seen_capacity: int = 10000):
+        """
+        Inicializa o motor
+
+        Args:
+            capacity: Termos monitorados (memória máxima)
+            half_life_hours: Meia-vida da contagem recente
+            baseline_half_life_hours: Meia-vida da linha de base usada na aceleração
+            bigrams: Também conta pares de palavras consecutivas
+            min_word_length: Tamanho mínimo das palavras
+            stopwords: Palavras ignoradas (padrão: bitcoin, btc, crypto, cryptocurrency)
+            seen_capacity: IDs de posts lembrados para não contar o mesmo post duas vezes
+        """
+        self.capacity = capacity
+        self.bigrams = bigrams
+        self.min_word_length = min_word_length
+        self.stopwords = frozenset(stopwords) if stopwords is not None else DEFAULT_STOPWORDS
+        self.half_life_hours = half_life_hours
+        self.baseline_half_life_hours = baseline_half_life_hours
+
+        # Taxas de decaimento por segundo
+        self._short_rate = math.log(2) / (half_life_hours * 3600)
+        self._long_rate = math.log(2) / (baseline_half_life_hours * 3600)
+        self._landmark: Optional[float] = None
+        # Instante mais antigo contado: define a janela efetiva de cada escala
+        self._first_timestamp: Optional[float] = None
+
+        self._counters: Dict[str, _Counter] = {}
+        # Min-heap (contagem recente, termo) com uma entrada por termo; as contagens só
+        # crescem, então entradas defasadas são atualizadas quando chegam ao topo
+        self._heap: List[Tuple[float, str]] = []
+        self._seen = set()
+        self._seen_order = deque(maxlen=seen_capacity)
+        self._lock = threading.Lock()
+
+        self.posts_added = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    def tokenize(self, text: str) -> List[str]:
+        """Palavras filtradas e, se ativado, bigramas de palavras consecutivas"""
+        words = [
+            word for word in _WORD_RE.findall(text.lower())
+            if len(word) >= self.min_word_length and word not in self.stopwords
+        ]
+        if self.bigrams:
+            return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+        return words
+
+    def _rescale(self, timestamp: float):
+        """Move o marco do decaimento para timestamp; chamar com o lock"""
+        if self._landmark is None:
+            self._landmark = timestamp
+            return
+
+        short_factor = math.exp(-self._short_rate * (timestamp - self._landmark))
+        long_factor = math.exp(-self._long_rate * (timestamp - self._landmark))
+        for counter in self._counters.values():
+            counter.short *= short_factor
+            counter.long *= long_factor
+            counter.error *= short_factor
+        self._landmark = timestamp
+        self._heap = [(counter.short, term) for term, counter in self._counters.items()]
+        heapq.heapify(self._heap)
+
+    def _pop_min(self) -> str:
+        """Remove e devolve o termo de menor contagem recente; chamar com o lock"""
+        while True:
+            short, term = self._heap[0]
+            current = self._counters[term].short
+            if short >= current:
+                heapq.heappop(self._heap)
+                return term
+            heapq.heapreplace(self._heap, (current, term))
+
+    def _add_term(self, term: str, short_weight: float, long_weight: float):
+        """Atualização space-saving; chamar com o lock"""
+        counter = self._counters.get(term)
+        if counter is not None:
+            counter.short += short_weight
+            counter.long += long_weight
+            return
+
+        if len(self._counters) < self.capacity:
+            self._counters[term] = _Counter(short_weight, long_weight)
+            heapq.heappush(self._heap, (short_weight, term))
+            return
+
+        # Substitui o termo de menor contagem recente, herdando-a como erro
+        evicted = self._counters.pop(self._pop_min())
+        counter = _Counter(
+            evicted.short + short_weight,
+            evicted.long + long_weight,
+            evicted.short
+        )
+        self._counters[term] = counter
+        heapq.heappush(self._heap, (counter.short, term))
+        self.evictions += 1
+
+    def add_text(self, text: str, timestamp: Optional[float] = None):
+        """Conta os termos de um texto no instante timestamp (padrão: agora)"""
+        terms = self.tokenize(text)
+        if not terms:
+            return
+
+        timestamp = timestamp if timestamp is not None else time.time()
+        with self._lock:
+            if self._first_timestamp is None or timestamp < self._first_timestamp:
+                self._first_timestamp = timestamp
+            if self._landmark is None or self._short_rate * (timestamp - self._landmark) > _MAX_EXPONENT:
+                self._rescale(timestamp)
+            short_weight = math.exp(self._short_rate * (timestamp - self._landmark))
+            long_weight = math.exp(self._long_rate * (timestamp - self._landmark))
+            for term in terms:
+                self._add_term(term, short_weight, long_weight)
+
+    def add_posts(self, posts: Iterable) -> int:
+        """
+        Conta os títulos de posts ainda não vistos (pelo ID), no horário de criação
+
+        Returns:
+            Quantidade de posts novos contados
+        """
+        added = 0
+        for post in posts:
+            with self._lock:
+                if post.id in self._seen:
+                    continue
+                if len(self._seen_order) == self._seen_order.maxlen:
+                    self._seen.discard(self._seen_order[0])
+                self._seen_order.append(post.id)
+                self._seen.add(post.id)
+            self.add_text(post.title, post.created_utc)
+            added += 1
+
+        self.posts_added += added
+        return added
+
+    # ------------------------------------------------------------------
+    def _decayed(self, now: Optional[float]) -> List[Tuple[str, float, float, float]]:
+        """(termo, contagem recente, linha de base, erro) decaídos até now"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            if self._landmark is None:
+                return []
+            short_factor = math.exp(-self._short_rate * (now - self._landmark))
+            long_factor = math.exp(-self._long_rate * (now - self._landmark))
+            return [
+                (term, counter.short * short_factor, counter.long * long_factor, counter.error * short_factor)
+                for term, counter in self._counters.items()
+            ]
+
+    def top(self, n: int = 10, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Termos mais frequentes pela contagem recente decaída"""
+        ranked = sorted(self._decayed(now), key=lambda item: item[1], reverse=True)
+        return [(term, short) for term, short, _, _ in ranked[:n]]
+
+    def accelerating(self, n: int = 10, min_count: float = 2.0,
+                     now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        Termos cuja taxa recente supera a linha de base
+
+        A aceleração é a razão entre as taxas das duas escalas; 1.0 indica
+        volume estável. Cada contagem é dividida pela janela efetiva da sua
+        escala desde o primeiro post contado, (1 - exp(-λ·T)) / λ, então um
+        motor recém-iniciado não vê aceleração em volume constante. Termos
+        com contagem recente garantida (contagem - erro) abaixo de min_count
+        são ignorados.
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            first = self._first_timestamp
+        if first is None:
+            return []
+        elapsed = max(now - first, 0.0)
+        if elapsed > 0:
+            short_window = -math.expm1(-self._short_rate * elapsed) / self._short_rate
+            long_window = -math.expm1(-self._long_rate * elapsed) / self._long_rate
+        else:
+            short_window = long_window = 1.0
+
+        results = []
+        for term, short, long, error in self._decayed(now):
+            if short - error < min_count:
+                continue
+            recent_rate = short / short_window
+            baseline_rate = long / long_window
+            results.append((term, recent_rate / baseline_rate if baseline_rate > 0 else float('inf')))
+
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results[:n]
+
+    def get_stats(self) -> Dict:
+        """Ocupação e substituições do top-k"""
+        with self._lock:
+            return {
+                'tracked_terms': len(self._counters),
+                'capacity': self.capacity,
+                'posts_added': self.posts_added,
+                'evictions': self.evictions
+            }
@@ -3,3 +3,9 @@
 from .sentiment_analyzer import create_sentiment_analyzer, SentimentAnalyzer, SentimentResult
 from .enhanced_sentiment_analyzer import EnhancedSentimentAnalyzer, EnhancedSentimentResult
 from .ollama_sentiment_analyzer import OllamaSentimentAnalyzer
+from .routing_sentiment_analyzer import RoutingSentimentAnalyzer, ModelRoute, RoutingThresholds
+from .embedding_sentiment_analyzer import EmbeddingSentimentAnalyzer
+from .semantic_cache import SemanticCache
+from .adaptive_concurrency import AdaptiveConcurrencyLimiter, UnboundedLimiter, get_limiter, get_limiter_stats
+from .hedged_requests import HedgedRequester
+from .labeled_texts import REFERENCE_TEXTS, reference_labeled_texts
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Controle Adaptativo de Concorrência para Chamadas Ollama
+Limite AIMD: aumenta o número de chamadas simultâneas enquanto a latência
+fica estável e reduz quando a latência sobe ou ocorrem erros
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    from ..utils.metrics_collector import metrics_collector
+    METRICS_AVAILABLE = True
+except Exception:
+    metrics_collector = None
+    METRICS_AVAILABLE = False
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class _Call:
+    """Chamada em andamento dentro de um slot do limitador"""
+
+    def __init__(self, saturated: bool):
+        self.saturated = saturated
+        self.success = True
+
+    def failed(self):
+        """Marca a chamada como falha por sobrecarga (5xx, 429, timeout)"""
+        self.success = False
+
+class AdaptiveConcurrencyLimiter:
+    """Limite de chamadas simultâneas com aumento aditivo e redução multiplicativa"""
+
+    def __init__(self, name: str, initial_limit: int = 2, min_limit: int = 1, max_limit: int = 16,
+                 latency_tolerance: float = 1.5, backoff_ratio: float = 0.7,
+                 baseline_window: int = 100, smoothing: float = 0.2):
+        """
+        Inicializa o limitador
+
+        Args:
+            name: Identificação (servidor/modelo) usada na métrica
+            initial_limit: Limite inicial de chamadas simultâneas
+            min_limit: Limite mínimo
+            max_limit: Limite máximo
+            latency_tolerance: Razão latência suavizada / latência base que indica fila
+            backoff_ratio: Fator aplicado ao limite em caso de fila ou erro
+            baseline_window: Amostras usadas para a latência base (mínimo recente)
+            smoothing: Peso da amostra nova na média móvel exponencial
+        """
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.smoothing = smoothing
+
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+        self._samples = deque(maxlen=baseline_window)
+        self._smoothed: Optional[float] = None
+        # Chamadas iniciadas antes da última redução; ignoradas como sinal
+        self._recovery = 0
+
+        self.completed = 0
+        self.failures = 0
+        self.increases = 0
+        self.decreases = 0
+        self.peak_in_flight = 0
+
+    @property
+    def limit(self) -> int:
+        """Limite efetivo (inteiro) de chamadas simultâneas"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    # ------------------------------------------------------------------
+    def acquire(self, timeout: Optional[float] = None) -> Optional[_Call]:
+        """Aguarda um slot livre; retorna None se o timeout expirar"""
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._condition:
+            while self._in_flight >= self.limit:
+                remaining = deadline - time.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+            return _Call(saturated=self._in_flight >= self.limit)
+
+    def release(self, call: _Call, latency: float):
+        """Libera o slot e ajusta o limite com a latência observada"""
+        with self._condition:
+            self._in_flight -= 1
+            self.completed += 1
+            previous = self.limit
+
+            if call.success:
+                self._samples.append(latency)
+                self._smoothed = latency if self._smoothed is None else (
+                    self.smoothing * latency + (1 - self.smoothing) * self._smoothed
+                )
+            else:
+                self.failures += 1
+
+            congested = not call.success or (
+                self._smoothed is not None
+                and self._smoothed > min(self._samples) * self.latency_tolerance
+            )
+
+            if self._recovery > 0:
+                self._recovery -= 1
+            elif congested:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+                self._recovery = self._in_flight
+                self._smoothed = None
+                self.decreases += 1
+            elif call.saturated:
+                # Aumento aditivo: +1 a cada "rodada" completa de chamadas no limite
+                self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+                if self.limit > previous:
+                    self.increases += 1
+
+            current = self.limit
+            self._condition.notify_all()
+
+        if current != previous:
+            logger.info(f"Concorrência Ollama {self.name}: {previous} -> {current}")
+            if METRICS_AVAILABLE and metrics_collector is not None:
+                metrics_collector.set_gauge(f"ollama_concurrency_limit:{self.name}", current)
+
+    @contextmanager
+    def slot(self) -> Iterator[_Call]:
+        """
+        Executa uma chamada dentro do limite
+
+        Exceções dentro do bloco contam como falha; a latência medida
+        exclui o tempo de espera pelo slot.
+        """
+        call = self.acquire()
+        start = time.time()
+        try:
+            yield call
+        except Exception:
+            call.failed()
+            raise
+        finally:
+            self.release(call, time.time() - start)
+
+    def get_stats(self) -> Dict:
+        """Limite atual, ocupação e latências que guiam o ajuste"""
+        with self._condition:
+            return {
+                'name': self.name,
+                'limit': self.limit,
+                'in_flight': self._in_flight,
+                'peak_in_flight': self.peak_in_flight,
+                'baseline_latency': min(self._samples) if self._samples else 0.0,
+                'smoothed_latency': self._smoothed or 0.0,
+                'completed': self.completed,
+                'failures': self.failures,
+                'increases': self.increases,
+                'decreases': self.decreases
+            }
+
+class UnboundedLimiter:
+    """Mesma interface do AdaptiveConcurrencyLimiter sem limitar nem ajustar (padrão dos analisadores)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failures = 0
+
+    @contextmanager
+    def slot(self) -> Iterator[_Call]:
+        call = _Call(saturated=False)
+        with self._lock:
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        try:
+            yield call
+        except Exception:
+            call.failed()
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self.completed += 1
+                if not call.success:
+                    self.failures += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'name': self.name,
+                'limit': None,
+                'in_flight': self._in_flight,
+                'peak_in_flight': self.peak_in_flight,
+                'completed': self.completed,
+                'failures': self.failures
+            }
+
+# Limitadores compartilhados: todos os analisadores que usam o mesmo
+# servidor/modelo disputam os mesmos slots (OLLAMA_NUM_PARALLEL é do servidor)
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_registry_lock = threading.Lock()
+
+def get_limiter(base_url: str, model: str, **kwargs) -> AdaptiveConcurrencyLimiter:
+    """Retorna o limitador compartilhado de um servidor/modelo (criado na primeira chamada)"""
+    key = f"{base_url.rstrip('/')}|{model}"
+    with _registry_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = AdaptiveConcurrencyLimiter(key, **kwargs)
+            _limiters[key] = limiter
+        return limiter
+
+def get_limiter_stats() -> Dict[str, Dict]:
+    """Estatísticas de todos os limitadores ativos"""
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.get_stats() for limiter in limiters}
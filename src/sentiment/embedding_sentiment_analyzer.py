@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Classificador de Sentimento sobre Embeddings do Ollama
+Usa embeddings (milissegundos) e um modelo scikit-learn treinado offline
+com rótulos do LLM/ensemble no lugar de chamadas generativas (segundos)
+"""
+
+import pickle
+import time
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .sentiment_analyzer import SentimentAnalyzer, SentimentResult
+    from .ollama_embeddings import OllamaEmbeddingClient
+    from .labeled_texts import reference_labeled_texts
+except ImportError:
+    from sentiment_analyzer import SentimentAnalyzer, SentimentResult
+    from ollama_embeddings import OllamaEmbeddingClient
+    from labeled_texts import reference_labeled_texts
+
+try:
+    from sklearn.linear_model import LogisticRegression
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = Path.home() / '.btc-trading' / 'embedding_classifier.pkl'
+
+LABELS = ['negative', 'neutral', 'positive']
+
+class EmbeddingSentimentAnalyzer(SentimentAnalyzer):
+    """Analisador de sentimento: embedding Ollama + classificador linear"""
+
+    def __init__(self, embedding_client: Optional[OllamaEmbeddingClient] = None, classifier=None):
+        """
+        Inicializa o analisador
+
+        Args:
+            embedding_client: Cliente de embeddings (padrão nomic-embed-text local)
+            classifier: Classificador scikit-learn já treinado (opcional)
+        """
+        self.embedding_client = embedding_client or OllamaEmbeddingClient()
+        super().__init__(f"Embedding-{self.embedding_client.model}")
+        self.model = classifier
+
+    # ------------------------------------------------------------------
+    def train(self, texts: List[str], labels: List[str], C: float = 1.0) -> "EmbeddingSentimentAnalyzer":
+        """
+        Treina o classificador com textos rotulados
+
+        Args:
+            texts: Textos de treino
+            labels: Rótulos (positive/negative/neutral)
+            C: Regularização da regressão logística
+        """
+        if not SKLEARN_AVAILABLE:
+            raise RuntimeError("scikit-learn não está instalado. Execute: pip install scikit-learn")
+        if not texts:
+            raise ValueError("Conjunto de treino vazio")
+
+        features = self._embed_matrix(texts)
+        self.model = LogisticRegression(C=C, max_iter=1000, class_weight='balanced')
+        self.model.fit(features, labels)
+
+        logger.info(f"Classificador de embeddings treinado com {len(texts)} exemplos")
+        return self
+
+    def save(self, path: Path = DEFAULT_MODEL_PATH):
+        """Salva o classificador treinado"""
+        if self.model is None:
+            raise RuntimeError("Classificador não treinado")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump({'embedding_model': self.embedding_client.model, 'classifier': self.model}, f)
+        logger.info(f"Classificador salvo em {path}")
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_MODEL_PATH, base_url: str = "http://localhost:11434") -> "EmbeddingSentimentAnalyzer":
+        """Carrega classificador treinado (o modelo de embeddings deve ser o mesmo do treino)"""
+        path = Path(path)
+        if not path.exists():
+            raise RuntimeError(f"Classificador de embeddings não encontrado em {path}. Treine com train_embedding_classifier()")
+
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+
+        client = OllamaEmbeddingClient(model=data['embedding_model'], base_url=base_url)
+        return cls(embedding_client=client, classifier=data['classifier'])
+
+    # ------------------------------------------------------------------
+    def _embed_matrix(self, texts: List[str]) -> np.ndarray:
+        processed = [self.preprocess_text(text) for text in texts]
+        return np.asarray(self.embedding_client.embed_batch(processed), dtype=np.float32)
+
+    def _to_result(self, text: str, probabilities: np.ndarray) -> SentimentResult:
+        classes = list(self.model.classes_)
+        probs = dict(zip(classes, probabilities))
+
+        sentiment = str(classes[int(np.argmax(probabilities))])
+        score = float(probs.get('positive', 0.0) - probs.get('negative', 0.0))
+
+        return SentimentResult(
+            text=text,
+            sentiment=sentiment,
+            score=score,
+            confidence=float(np.max(probabilities)),
+            model_used=self.name,
+            timestamp=datetime.now()
+        )
+
+    def analyze(self, text: str) -> SentimentResult:
+        """Analisa sentimento usando embedding + classificador"""
+        if self.model is None:
+            raise RuntimeError("Classificador de embeddings não treinado")
+
+        features = self._embed_matrix([text])
+        return self._to_result(text, self.model.predict_proba(features)[0])
+
+    def batch_analyze(self, texts: List[str]) -> List[SentimentResult]:
+        """Análise em lote: uma única predição vetorizada"""
+        if self.model is None:
+            raise RuntimeError("Classificador de embeddings não treinado")
+        if not texts:
+            return []
+
+        probabilities = self.model.predict_proba(self._embed_matrix(texts))
+        return [self._to_result(text, probs) for text, probs in zip(texts, probabilities)]
+
+def harvest_labels(results: Iterable, min_confidence: float = 0.6) -> List[Tuple[str, str]]:
+    """
+    Extrai pares (texto, rótulo) de resultados já produzidos pelo LLM/ensemble
+
+    Aceita EnhancedSentimentResult (text_analyzed/final_sentiment),
+    SentimentResult do ensemble (text/sentiment) e BenchmarkResult
+    (text/expected_sentiment). Resultados com confiança baixa são ignorados.
+    """
+    labeled = []
+    for result in results:
+        if hasattr(result, 'expected_sentiment'):
+            labeled.append((result.text, result.expected_sentiment))
+        elif hasattr(result, 'final_sentiment'):
+            if result.final_confidence >= min_confidence and result.text_analyzed:
+                labeled.append((result.text_analyzed, result.final_sentiment))
+        elif hasattr(result, 'sentiment') and getattr(result, 'text', None):
+            if result.confidence >= min_confidence:
+                labeled.append((result.text, result.sentiment))
+    return labeled
+
+def build_training_set(harvested: Optional[Iterable] = None,
+                       min_confidence: float = 0.6) -> Tuple[List[str], List[str]]:
+    """Textos de referência + resultados colhidos, sem textos duplicados"""
+    pairs = reference_labeled_texts()
+    if harvested is not None:
+        pairs.extend(harvest_labels(harvested, min_confidence))
+
+    unique = {}
+    for text, label in pairs:
+        if label in LABELS:
+            unique.setdefault(text, label)
+
+    return list(unique.keys()), list(unique.values())
+
+def train_embedding_classifier(harvested: Optional[Iterable] = None,
+                               embedding_model: str = "nomic-embed-text",
+                               base_url: str = "http://localhost:11434",
+                               path: Path = DEFAULT_MODEL_PATH) -> EmbeddingSentimentAnalyzer:
+    """Treina offline e salva o classificador padrão usado por create_sentiment_analyzer('embedding')"""
+    texts, labels = build_training_set(harvested)
+
+    analyzer = EmbeddingSentimentAnalyzer(OllamaEmbeddingClient(model=embedding_model, base_url=base_url))
+    analyzer.train(texts, labels)
+    analyzer.save(path)
+    return analyzer
+
+if __name__ == "__main__":
+    print("=== Treino do Classificador de Embeddings ===")
+    start = time.time()
+    analyzer = train_embedding_classifier()
+    print(f"Treinado em {time.time() - start:.2f}s")
+
+    for text in ["Bitcoin to the moon!", "BTC is crashing hard", "Bitcoin price unchanged today"]:
+        result = analyzer.analyze(text)
+        print(f"{text} -> {result.sentiment} (score: {result.score:.2f}, conf: {result.confidence:.2f})")
@@ -6,24 +6,61 @@ Integração do sistema existente com modelos LLM locais
 
 import requests
 import json
+import threading
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
 # Importar analisadores existentes
 try:
-    from .sentiment_analyzer import SentimentAnalyzer
+    from .sentiment_analyzer import VADERSentimentAnalyzer, TextBlobSentimentAnalyzer
     EXISTING_ANALYZER_AVAILABLE = True
 except ImportError:
     print("Aviso: Analisador existente não encontrado")
     EXISTING_ANALYZER_AVAILABLE = False
 
+try:
+    from .ollama_telemetry import OllamaTelemetry
+    from .adaptive_concurrency import UnboundedLimiter, get_limiter
+    from .fast_mode import FAST_NUM_PREDICT, build_fast_prompt, parse_fast_label
+except ImportError:
+    from ollama_telemetry import OllamaTelemetry
+    from adaptive_concurrency import UnboundedLimiter, get_limiter
+    from fast_mode import FAST_NUM_PREDICT, build_fast_prompt, parse_fast_label
+
+try:
+    from ..utils.metrics_collector import metrics_collector
+    METRICS_AVAILABLE = True
+except Exception:
+    metrics_collector = None
+    METRICS_AVAILABLE = False
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Instruções fixas no início do prompt: o prefixo é idêntico entre chamadas
+# (reaproveitável pelo cache do Ollama) e o texto analisado vai sempre por último
+OLLAMA_INSTRUCTIONS = """You analyze the sentiment of Bitcoin/cryptocurrency texts.
+
+Consider:
+- Financial context and market implications
+- Emotional tone and intensity
+- Investment sentiment (bullish/bearish)
+
+Return your analysis in this exact format:
+Sentiment: [positive/negative/neutral]
+Confidence: [0.0-1.0]
+Score: [-1.0 to 1.0]
+Reasoning: [brief explanation]
+"""
+
+# Fechamento da chamada de preparação do contexto
+PRIMING_SUFFIX = "Texts will follow, one per message. Reply OK."
+
 @dataclass
 class EnhancedSentimentResult:
     """Resultado aprimorado da análise de sentimento"""
@@ -48,29 +85,73 @@ class EnhancedSentimentResult:
     text_analyzed: str = ""
     timestamp: str = ""
     models_used: List[str] = None
+    
+    # Telemetria de tokens/tempo da chamada Ollama
+    ollama_telemetry: Optional[OllamaTelemetry] = None
 
 class EnhancedSentimentAnalyzer:
     """Analisador de sentimento aprimorado combinando Ollama + métodos tradicionais"""
     
-    def __init__(self, ollama_model: str = "llama3.2:1b", ollama_url: str = "http://localhost:11434"):
+    def __init__(self, ollama_model: str = "llama3.2:1b", ollama_url: str = "http://localhost:11434",
+                 semantic_cache=None, primed_context: bool = False, reload_threshold: float = 0.5,
+                 concurrency_limiter=None, hedger=None, mode: str = "full",
+                 adaptive_concurrency: bool = False):
         """
         Inicializa o analisador aprimorado
         
         Args:
             ollama_model: Nome do modelo Ollama
             ollama_url: URL do servidor Ollama
+            semantic_cache: SemanticCache opcional para reutilizar veredictos de paráfrases
+            primed_context: Avalia as instruções uma vez e reutiliza o context retornado
+            reload_threshold: load_duration (s) a partir do qual o modelo é considerado recarregado
+            concurrency_limiter: AdaptiveConcurrencyLimiter (padrão: compartilhado por servidor/modelo)
+            hedger: HedgedRequester opcional; envia cópia das chamadas lentas a outro servidor
+            mode: "full" (sentimento, confiança, score e justificativa) ou "fast" (uma palavra)
+            adaptive_concurrency: Usa o limitador AIMD compartilhado quando concurrency_limiter
+                não é informado (padrão: sem limite, como antes)
         """
+        if mode not in ("full", "fast"):
+            raise ValueError(f"Modo inválido: {mode}")
+        
         self.ollama_model = ollama_model
         self.ollama_url = ollama_url
-        self.traditional_analyzer = None
+        self.semantic_cache = semantic_cache
+        self.mode = mode
+        if adaptive_concurrency:
+            self.concurrency_limiter = concurrency_limiter or get_limiter(ollama_url, ollama_model)
+            # Chamadas rápidas têm outra escala de latência: limitador próprio para não distorcer o base
+            self.fast_concurrency_limiter = get_limiter(ollama_url, f"{ollama_model} (fast)")
+        else:
+            self.concurrency_limiter = concurrency_limiter or UnboundedLimiter(f"{ollama_url}|{ollama_model}")
+            self.fast_concurrency_limiter = UnboundedLimiter(f"{ollama_url}|{ollama_model} (fast)")
+        self.hedger = hedger
+        self.primed_context = primed_context
+        self.reload_threshold = reload_threshold
+        self.vader_analyzer = None
+        self.textblob_analyzer = None
+        
+        # Contexto preparado (ids de token das instruções) e número de preparações
+        self._context: Optional[List[int]] = None
+        self._context_lock = threading.Lock()
+        self.prime_count = 0
         
-        # Inicializar analisador tradicional se disponível
+        # Inicializar analisadores tradicionais disponíveis (cada um é opcional)
         if EXISTING_ANALYZER_AVAILABLE:
             try:
-                self.traditional_analyzer = SentimentAnalyzer()
-                logger.info("Analisador tradicional inicializado")
+                self.vader_analyzer = VADERSentimentAnalyzer()
+            except Exception as e:
+                logger.warning(f"VADER indisponível: {e}")
+            try:
+                self.textblob_analyzer = TextBlobSentimentAnalyzer()
             except Exception as e:
-                logger.warning(f"Erro ao inicializar analisador tradicional: {e}")
+                logger.warning(f"TextBlob indisponível: {e}")
+        
+        # VADER/TextBlob rodam enquanto a chamada ao Ollama está em andamento
+        self._traditional_executor = None
+        if self.vader_analyzer or self.textblob_analyzer:
+            self._traditional_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="traditional")
+            logger.info("Analisadores tradicionais inicializados")
         
         # Testar conexão com Ollama
         self._test_ollama_connection()
@@ -95,67 +176,212 @@ class EnhancedSentimentAnalyzer:
             logger.error(f"Erro de conexão com Ollama: {e}")
             return False
     
-    def _analyze_with_ollama(self, text: str) -> Tuple[str, float, float]:
+    def _prime_context(self) -> Optional[List[int]]:
+        """
+        Avalia as instruções uma única vez e guarda o context retornado
+        
+        Chamadas seguintes enviam só o texto junto com esse context, então o
+        prompt_eval por chamada cobre apenas o texto do usuário.
+        """
+        with self._context_lock:
+            if self._context is not None:
+                return self._context
+            
+            payload = {
+                "model": self.ollama_model,
+                "prompt": f"{OLLAMA_INSTRUCTIONS}\n{PRIMING_SUFFIX}",
+                "stream": False,
+                "options": {
+                    "temperature": 0.1,
+                    "num_predict": 2
+                }
+            }
+            
+            start_time = time.time()
+            try:
+                response = requests.post(f"{self.ollama_url}/api/generate", json=payload, timeout=30)
+            except Exception as e:
+                logger.warning(f"Erro ao preparar contexto Ollama: {e}")
+                return None
+            
+            if response.status_code != 200:
+                logger.warning(f"Erro ao preparar contexto Ollama: {response.status_code}")
+                return None
+            
+            result = response.json()
+            self._context = result.get('context') or None
+            self.prime_count += 1
+            
+            telemetry = OllamaTelemetry.from_response(result, self.ollama_model, time.time() - start_time)
+            logger.info(f"Contexto de instruções preparado ({telemetry.prompt_eval_count} tokens)")
+            return self._context
+    
+    def _invalidate_context(self, reason: str):
+        """Descarta o contexto preparado; a próxima chamada prepara novamente"""
+        with self._context_lock:
+            if self._context is not None:
+                logger.info(f"Contexto de instruções descartado: {reason}")
+            self._context = None
+    
+    def _post_generate(self, payload: Dict, limiter=None) -> Tuple[int, Dict]:
+        """Chama /api/generate (com hedging, se configurado) dentro do limite de concorrência"""
+        with (limiter or self.concurrency_limiter).slot() as call:
+            if self.hedger is not None:
+                status_code, result = self.hedger.post("/api/generate", payload, timeout=30)
+            else:
+                response = requests.post(
+                    f"{self.ollama_url}/api/generate",
+                    json=payload,
+                    timeout=30
+                )
+                status_code = response.status_code
+                result = response.json() if status_code == 200 else {}
+            
+            if status_code == 429 or status_code >= 500:
+                call.failed()
+        
+        return status_code, result
+    
+    def _analyze_fast(self, text: str) -> Tuple[str, float, float, float, Optional[OllamaTelemetry]]:
+        """
+        Classificação de uma palavra com orçamento mínimo de tokens
+        
+        Returns:
+            Tuple[sentiment, confidence, score, processing_time, telemetry]
+        """
+        start_time = time.time()
+        payload = {
+            "model": self.ollama_model,
+            "prompt": build_fast_prompt(text),
+            "stream": False,
+            "options": {
+                "temperature": 0.0,
+                "num_predict": FAST_NUM_PREDICT
+            }
+        }
+        
+        try:
+            status_code, result = self._post_generate(payload, self.fast_concurrency_limiter)
+            processing_time = time.time() - start_time
+            
+            if status_code != 200:
+                logger.error(f"Erro Ollama: {status_code}")
+                return "neutral", 0.0, 0.0, processing_time, None
+            
+            telemetry = self._record_telemetry(result, processing_time)
+            sentiment, confidence, score = parse_fast_label(result.get('response', ''))
+            
+            logger.info(f"Ollama análise rápida: {sentiment} ({processing_time:.2f}s)")
+            return sentiment, confidence, score, processing_time, telemetry
+        
+        except Exception as e:
+            processing_time = time.time() - start_time
+            logger.error(f"Erro na análise Ollama: {e}")
+            return "neutral", 0.0, 0.0, processing_time, None
+    
+    def _analyze_with_ollama(self, text: str, mode: Optional[str] = None) -> Tuple[str, float, float, float, Optional[OllamaTelemetry]]:
         """
         Analisa sentimento usando Ollama
         
+        Args:
+            text: Texto para análise
+            mode: "full" ou "fast" (padrão: modo do analisador)
+        
         Returns:
-            Tuple[sentiment, confidence, score, processing_time]
+            Tuple[sentiment, confidence, score, processing_time, telemetry]
         """
+        if (mode or self.mode) == "fast":
+            return self._analyze_fast(text)
+        
         start_time = time.time()
         
-        # Prompt otimizado para análise de sentimento financeiro
-        prompt = f"""
-Analyze the sentiment of this Bitcoin/cryptocurrency text: "{text}"
-
-Consider:
-- Financial context and market implications
-- Emotional tone and intensity
-- Investment sentiment (bullish/bearish)
-
-Return your analysis in this exact format:
-Sentiment: [positive/negative/neutral]
-Confidence: [0.0-1.0]
-Score: [-1.0 to 1.0]
-Reasoning: [brief explanation]
-"""
+        context = self._prime_context() if self.primed_context else None
         
         payload = {
             "model": self.ollama_model,
-            "prompt": prompt,
+            "prompt": f'Text: "{text}"' if context else f'{OLLAMA_INSTRUCTIONS}\nText: "{text}"',
             "stream": False,
             "options": {
                 "temperature": 0.1,
                 "num_predict": 100
             }
         }
+        if context:
+            payload["context"] = context
         
         try:
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json=payload,
-                timeout=30
-            )
-            
+            status_code, result = self._post_generate(payload)
             processing_time = time.time() - start_time
             
-            if response.status_code == 200:
-                result = response.json()
+            if status_code == 200:
                 response_text = result.get('response', '').strip()
+                telemetry = self._record_telemetry(result, processing_time)
+                
+                # Modelo recarregado (keep_alive expirou ou troca de modelo): preparar de novo
+                if context and telemetry.load_duration > self.reload_threshold:
+                    self._invalidate_context(f"modelo recarregado (load {telemetry.load_duration:.2f}s)")
                 
                 # Parse da resposta
                 sentiment, confidence, score = self._parse_ollama_response(response_text)
                 
                 logger.info(f"Ollama análise: {sentiment} (conf: {confidence:.2f}, score: {score:.2f})")
-                return sentiment, confidence, score, processing_time
+                return sentiment, confidence, score, processing_time, telemetry
             else:
-                logger.error(f"Erro Ollama: {response.status_code}")
-                return "neutral", 0.0, 0.0, processing_time
+                logger.error(f"Erro Ollama: {status_code}")
+                if context and status_code == 400:
+                    self._invalidate_context("context rejeitado pelo servidor")
+                return "neutral", 0.0, 0.0, processing_time, None
                 
         except Exception as e:
             processing_time = time.time() - start_time
             logger.error(f"Erro na análise Ollama: {e}")
-            return "neutral", 0.0, 0.0, processing_time
+            return "neutral", 0.0, 0.0, processing_time, None
+    
+    def _analyze_with_ollama_cached(self, text: str, mode: Optional[str] = None) -> Tuple[Tuple[str, float, float, float, Optional[OllamaTelemetry]], bool]:
+        """
+        Consulta o cache semântico antes de chamar o Ollama
+        
+        Veredictos com falha e do modo rápido não são guardados.
+        
+        Returns:
+            Tuple[resultado de _analyze_with_ollama, veio_do_cache]
+        """
+        mode = mode or self.mode
+        if self.semantic_cache is None:
+            return self._analyze_with_ollama(text, mode), False
+        
+        try:
+            verdict, cached, similarity = self.semantic_cache.get_or_compute(
+                text, lambda t: self._analyze_with_ollama(t, mode),
+                cacheable=lambda v: v[1] > 0.0 and mode == "full"
+            )
+        except Exception as e:
+            logger.warning(f"Cache semântico indisponível: {e}")
+            return self._analyze_with_ollama(text, mode), False
+        
+        if cached:
+            sentiment, confidence, score, _, _ = verdict
+            logger.info(f"Veredicto reutilizado do cache semântico (similaridade {similarity:.3f})")
+            return (sentiment, confidence, score, 0.0, None), True
+        
+        return verdict, False
+    
+    def _record_telemetry(self, response_data: Dict, wall_time: float) -> OllamaTelemetry:
+        """Extrai contagens de tokens e durações da resposta e agrega por modelo"""
+        telemetry = OllamaTelemetry.from_response(response_data, self.ollama_model, wall_time)
+        
+        if METRICS_AVAILABLE and metrics_collector is not None:
+            try:
+                metrics_collector.record_ollama_call(telemetry)
+            except Exception as e:
+                logger.debug(f"Erro ao registrar telemetria: {e}")
+        
+        logger.debug(
+            f"Ollama tokens: prompt={telemetry.prompt_eval_count} ({telemetry.prompt_eval_duration:.2f}s), "
+            f"geração={telemetry.eval_count} ({telemetry.eval_duration:.2f}s, "
+            f"{telemetry.eval_tokens_per_second:.1f} tok/s), carga={telemetry.load_duration:.2f}s"
+        )
+        return telemetry
     
     def _parse_ollama_response(self, response_text: str) -> Tuple[str, float, float]:
         """Parse da resposta do Ollama"""
@@ -206,24 +432,21 @@ Reasoning: [brief explanation]
         return sentiment, confidence, score
     
     def _analyze_traditional(self, text: str) -> Tuple[str, float, str, float]:
-        """Analisa usando métodos tradicionais"""
-        if not self.traditional_analyzer:
-            return "neutral", 0.0, "neutral", 0.0
+        """Analisa usando métodos tradicionais (VADER e TextBlob)"""
+        vader_sentiment, vader_score = "neutral", 0.0
+        textblob_sentiment, textblob_score = "neutral", 0.0
         
         try:
-            # Usar analisador existente
-            vader_result = self.traditional_analyzer.analyze_vader(text)
-            textblob_result = self.traditional_analyzer.analyze_textblob(text)
-            
-            # Converter scores para sentimentos
-            vader_sentiment = "positive" if vader_result > 0.1 else "negative" if vader_result < -0.1 else "neutral"
-            textblob_sentiment = "positive" if textblob_result > 0.1 else "negative" if textblob_result < -0.1 else "neutral"
-            
-            return vader_sentiment, vader_result, textblob_sentiment, textblob_result
-            
+            if self.vader_analyzer:
+                vader_result = self.vader_analyzer.analyze(text)
+                vader_sentiment, vader_score = vader_result.sentiment, vader_result.score
+            if self.textblob_analyzer:
+                textblob_result = self.textblob_analyzer.analyze(text)
+                textblob_sentiment, textblob_score = textblob_result.sentiment, textblob_result.score
         except Exception as e:
             logger.warning(f"Erro na análise tradicional: {e}")
-            return "neutral", 0.0, "neutral", 0.0
+        
+        return vader_sentiment, vader_score, textblob_sentiment, textblob_score
     
     def _combine_results(self, ollama_sentiment: str, ollama_score: float, ollama_confidence: float,
                         vader_sentiment: str, vader_score: float,
@@ -242,13 +465,15 @@ Reasoning: [brief explanation]
         vader_numeric = sentiment_to_score(vader_sentiment)
         textblob_numeric = sentiment_to_score(textblob_sentiment)
         
-        # Ponderação baseada na confiança do Ollama
+        # Ponderação baseada na confiança do Ollama (analisadores ausentes não pesam)
         ollama_weight = 0.6 * ollama_confidence
-        vader_weight = 0.25
-        textblob_weight = 0.15
+        vader_weight = 0.25 if self.vader_analyzer else 0.0
+        textblob_weight = 0.15 if self.textblob_analyzer else 0.0
         
         # Normalizar pesos
         total_weight = ollama_weight + vader_weight + textblob_weight
+        if total_weight == 0:
+            return "neutral", 0.0, 0.0
         ollama_weight /= total_weight
         vader_weight /= total_weight
         textblob_weight /= total_weight
@@ -268,41 +493,59 @@ Reasoning: [brief explanation]
         else:
             final_sentiment = "neutral"
         
-        # Confiança baseada na concordância entre modelos
-        agreements = 0
-        if ollama_sentiment == vader_sentiment:
-            agreements += 1
-        if ollama_sentiment == textblob_sentiment:
-            agreements += 1
-        if vader_sentiment == textblob_sentiment:
-            agreements += 1
+        # Confiança baseada na concordância entre os modelos disponíveis
+        available = [ollama_sentiment]
+        if self.vader_analyzer:
+            available.append(vader_sentiment)
+        if self.textblob_analyzer:
+            available.append(textblob_sentiment)
+        
+        pairs = [(a, b) for i, a in enumerate(available) for b in available[i + 1:]]
+        agreement = sum(1 for a, b in pairs if a == b) / len(pairs) if pairs else 0.0
         
         # Confiança: base do Ollama + bônus por concordância
-        final_confidence = min(1.0, ollama_confidence * 0.7 + (agreements / 3) * 0.3)
+        final_confidence = min(1.0, ollama_confidence * 0.7 + agreement * 0.3)
         
         return final_sentiment, combined_score, final_confidence
     
-    def analyze_sentiment(self, text: str) -> EnhancedSentimentResult:
+    def analyze_sentiment(self, text: str, mode: Optional[str] = None) -> EnhancedSentimentResult:
         """
         Análise completa de sentimento
         
         Args:
             text: Texto para análise
+            mode: "full" ou "fast" para esta chamada (padrão: modo do analisador)
             
         Returns:
             EnhancedSentimentResult com análise completa
         """
         timestamp = datetime.now().isoformat()
         models_used = []
+        mode = mode or self.mode
+        
+        # Análise tradicional em paralelo com a chamada ao Ollama
+        traditional_future = None
+        if self._traditional_executor is not None:
+            traditional_future = self._traditional_executor.submit(self._analyze_traditional, text)
         
         # Análise com Ollama
-        ollama_sentiment, ollama_confidence, ollama_score, ollama_time = self._analyze_with_ollama(text)
+        ollama_verdict, from_cache = self._analyze_with_ollama_cached(text, mode)
+        ollama_sentiment, ollama_confidence, ollama_score, ollama_time, telemetry = ollama_verdict
         models_used.append(f"ollama:{self.ollama_model}")
+        if mode == "fast":
+            models_used.append("fast_mode")
+        if from_cache:
+            models_used.append("semantic_cache")
         
-        # Análise tradicional
-        vader_sentiment, vader_score, textblob_sentiment, textblob_score = self._analyze_traditional(text)
-        if self.traditional_analyzer:
-            models_used.extend(["vader", "textblob"])
+        # Resultado tradicional (normalmente já pronto quando o Ollama responde)
+        if traditional_future is not None:
+            vader_sentiment, vader_score, textblob_sentiment, textblob_score = traditional_future.result()
+        else:
+            vader_sentiment, vader_score, textblob_sentiment, textblob_score = "neutral", 0.0, "neutral", 0.0
+        if self.vader_analyzer:
+            models_used.append("vader")
+        if self.textblob_analyzer:
+            models_used.append("textblob")
         
         # Combinar resultados
         final_sentiment, final_score, final_confidence = self._combine_results(
@@ -332,15 +575,16 @@ Reasoning: [brief explanation]
             # Metadados
             text_analyzed=text,
             timestamp=timestamp,
-            models_used=models_used
+            models_used=models_used,
+            ollama_telemetry=telemetry
         )
     
-    def analyze_batch(self, texts: List[str]) -> List[EnhancedSentimentResult]:
+    def analyze_batch(self, texts: List[str], mode: Optional[str] = None) -> List[EnhancedSentimentResult]:
         """Análise em lote"""
         results = []
         for i, text in enumerate(texts):
             logger.info(f"Analisando texto {i+1}/{len(texts)}")
-            result = self.analyze_sentiment(text)
+            result = self.analyze_sentiment(text, mode)
             results.append(result)
             
             # Pausa para não sobrecarregar
@@ -377,6 +621,10 @@ def test_enhanced_analyzer():
         print(f"FINAL: {result.final_sentiment} (conf: {result.final_confidence:.2f}, score: {result.final_score:.2f})")
         print(f"Modelos: {', '.join(result.models_used)}")
         print(f"Tempo Ollama: {result.ollama_time:.2f}s")
+        if result.ollama_telemetry:
+            t = result.ollama_telemetry
+            print(f"Tokens: prompt={t.prompt_eval_count} ({t.prompt_eval_duration:.2f}s) | "
+                  f"geração={t.eval_count} ({t.eval_tokens_per_second:.1f} tok/s)")
 
 if __name__ == "__main__":
     test_enhanced_analyzer()
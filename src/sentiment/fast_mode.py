@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Modo Rápido de Classificação com Ollama
+Prompt mínimo pedindo uma única palavra e orçamento de poucos tokens;
+score e confiança são derivados do rótulo
+"""
+
+import re
+from typing import Tuple
+
+# Orçamento de geração: a palavra do rótulo cabe em 1-2 tokens
+FAST_NUM_PREDICT = 3
+
+FAST_INSTRUCTIONS = "Classify the sentiment of this Bitcoin text. Answer with one word: positive, negative or neutral."
+
+# Score atribuído a cada rótulo e confiança quando o rótulo é reconhecido ou não
+FAST_LABEL_SCORES = {
+    'positive': 0.6,
+    'negative': -0.6,
+    'neutral': 0.0
+}
+FAST_CONFIDENCE = 0.7
+FAST_UNPARSED_CONFIDENCE = 0.3
+
+_LABEL_RE = re.compile(r"positive|negative|neutral|bullish|bearish")
+
+def build_fast_prompt(text: str) -> str:
+    """Prompt completo para /api/generate (instrução fixa primeiro, texto por último)"""
+    return f'{FAST_INSTRUCTIONS}\nText: "{text}"\nAnswer:'
+
+def parse_fast_label(response_text: str) -> Tuple[str, float, float]:
+    """
+    Converte a resposta de uma palavra em veredicto
+
+    Returns:
+        Tuple[sentiment, confidence, score]
+    """
+    match = _LABEL_RE.search(response_text.lower())
+    if not match:
+        return "neutral", FAST_UNPARSED_CONFIDENCE, 0.0
+
+    label = {'bullish': 'positive', 'bearish': 'negative'}.get(match.group(0), match.group(0))
+    return label, FAST_CONFIDENCE, FAST_LABEL_SCORES[label]
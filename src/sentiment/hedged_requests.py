@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Requisições Duplicadas (Hedging) para Cortar a Cauda de Latência do Ollama
+Se a chamada não responder até um percentil da latência recente, envia uma
+cópia (de preferência para outro servidor), usa a primeira resposta e cancela
+a outra
+"""
+
+import json
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class _Attempt:
+    """Uma tentativa em andamento; pode ser cancelada por outra thread"""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.cancelled = threading.Event()
+        self.response = None
+
+    def cancel(self):
+        """Interrompe a leitura do stream; o Ollama aborta a geração ao perder a conexão"""
+        self.cancelled.set()
+        response = self.response
+        if response is not None:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+class HedgedRequester:
+    """Cliente de /api/generate e /api/chat com envio de cópia para stragglers"""
+
+    def __init__(self, endpoints: List[str], hedge_percentile: float = 95.0,
+                 max_extra_load: float = 0.1, min_samples: int = 20,
+                 min_delay: float = 0.05, window: int = 200, max_workers: int = 16):
+        """
+        Inicializa o cliente
+
+        Args:
+            endpoints: URLs de servidores Ollama; o primeiro é o principal e a
+                cópia vai para o seguinte (ou para o mesmo, se houver só um)
+            hedge_percentile: Percentil da latência recente após o qual a cópia é enviada
+            max_extra_load: Fração máxima de requisições extras (0.1 = até 10% a mais)
+            min_samples: Latências necessárias antes de começar a enviar cópias
+            min_delay: Espera mínima antes de uma cópia (segundos)
+            window: Quantidade de latências recentes consideradas
+            max_workers: Threads para tentativas simultâneas
+        """
+        if not endpoints:
+            raise ValueError("Pelo menos um endpoint é necessário")
+
+        self.endpoints = [endpoint.rstrip('/') for endpoint in endpoints]
+        self.hedge_percentile = hedge_percentile
+        self.max_extra_load = max_extra_load
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._session = requests.Session()
+        self._next = 0
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.skipped_by_budget = 0
+
+    @property
+    def primary(self) -> str:
+        return self.endpoints[0]
+
+    # ------------------------------------------------------------------
+    def hedge_delay(self) -> Optional[float]:
+        """Espera antes da cópia (percentil da latência recente); None sem amostras suficientes"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            return max(self.min_delay, float(np.percentile(list(self._latencies), self.hedge_percentile)))
+
+    def _alternate(self) -> str:
+        """Servidor da cópia: alterna entre os demais endpoints"""
+        if len(self.endpoints) == 1:
+            return self.primary
+        with self._lock:
+            self._next = self._next % (len(self.endpoints) - 1) + 1
+            return self.endpoints[self._next]
+
+    def _take_hedge_budget(self) -> bool:
+        """Permite a cópia só enquanto as extras ficarem dentro de max_extra_load"""
+        with self._lock:
+            if self.hedges + 1 > self.max_extra_load * self.requests:
+                self.skipped_by_budget += 1
+                return False
+            self.hedges += 1
+            return True
+
+    def _run_attempt(self, attempt: _Attempt, path: str, payload: Dict,
+                     timeout: float) -> Tuple[int, Dict]:
+        """
+        Executa uma tentativa em modo stream e remonta a resposta completa
+
+        Returns:
+            Tuple[status HTTP, dados no formato da resposta sem stream]
+        """
+        body = dict(payload, stream=True)
+        response = self._session.post(f"{attempt.endpoint}{path}", json=body, stream=True, timeout=timeout)
+        attempt.response = response
+
+        with response:
+            if response.status_code != 200:
+                return response.status_code, {}
+
+            pieces = []
+            final = {}
+            for line in response.iter_lines():
+                if attempt.cancelled.is_set():
+                    return 499, {}
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if path == '/api/chat':
+                    pieces.append((chunk.get('message') or {}).get('content', ''))
+                else:
+                    pieces.append(chunk.get('response', ''))
+                if chunk.get('done'):
+                    final = chunk
+                    break
+
+        if path == '/api/chat':
+            final['message'] = {'role': 'assistant', 'content': ''.join(pieces)}
+        else:
+            final['response'] = ''.join(pieces)
+        return 200, final
+
+    # ------------------------------------------------------------------
+    def post(self, path: str, payload: Dict, timeout: float = 30.0) -> Tuple[int, Dict]:
+        """
+        Envia a requisição com cópia opcional para stragglers
+
+        Args:
+            path: '/api/generate' ou '/api/chat'
+            payload: Corpo da requisição (stream é forçado internamente)
+            timeout: Timeout por tentativa (segundos)
+
+        Returns:
+            Tuple[status HTTP, dados da resposta vencedora]
+        """
+        start = time.time()
+        with self._lock:
+            self.requests += 1
+
+        delay = self.hedge_delay()
+        primary = _Attempt(self.primary)
+        attempts = {self._executor.submit(self._run_attempt, primary, path, payload, timeout): primary}
+
+        done, _ = wait(attempts, timeout=delay) if delay is not None else (set(), set())
+        if delay is not None and not done and self._take_hedge_budget():
+            hedge = _Attempt(self._alternate())
+            attempts[self._executor.submit(self._run_attempt, hedge, path, payload, timeout)] = hedge
+            logger.debug(f"Cópia enviada para {hedge.endpoint} após {delay:.2f}s")
+
+        status, data, winner = 0, {}, None
+        pending = set(attempts)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    status, data = future.result()
+                except Exception as e:
+                    status, data = 0, {}
+                    logger.debug(f"Tentativa em {attempts[future].endpoint} falhou: {e}")
+                if status == 200:
+                    winner = attempts[future]
+                    break
+            if winner is not None:
+                break
+
+        # Cancela as tentativas que perderam
+        for attempt in attempts.values():
+            if attempt is not winner:
+                attempt.cancel()
+
+        latency = time.time() - start
+        if winner is not None:
+            with self._lock:
+                self._latencies.append(latency)
+                if winner is not primary:
+                    self.hedge_wins += 1
+            return status, data
+
+        if status == 0:
+            raise requests.ConnectionError(f"Todas as tentativas para {path} falharam")
+        return status, data
+
+    def get_stats(self) -> Dict:
+        """Volume de cópias, vitórias da cópia e carga extra efetiva"""
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                'endpoints': list(self.endpoints),
+                'requests': self.requests,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'skipped_by_budget': self.skipped_by_budget,
+                'extra_load': self.hedges / self.requests if self.requests else 0.0,
+                'hedge_delay': delay
+            }
+
+    def shutdown(self):
+        """Encerra o executor de tentativas"""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Textos Rotulados de Referência
+Frases curtas com sentimento conhecido, usadas pelo benchmark e no treino do
+classificador de embeddings; sem dependências para não puxar o stack de gráficos
+"""
+
+from typing import List, Tuple
+
+REFERENCE_TEXTS: List[Tuple[str, str]] = [
+    # Sentimentos POSITIVOS
+    ("Bitcoin is going to the moon! Best investment ever!", "positive"),
+    ("HODL! Diamond hands! Bitcoin will reach $100k soon!", "positive"),
+    ("Bitcoin just broke all-time high! Incredible gains!", "positive"),
+    ("This Bitcoin rally is amazing! Buying more!", "positive"),
+    ("Bitcoin adoption is growing fast! Bullish!", "positive"),
+    ("Just made huge profits on Bitcoin! To the moon!", "positive"),
+    ("Bitcoin is the future of money! Revolutionary!", "positive"),
+    ("Institutional investors are buying Bitcoin! Bullish signal!", "positive"),
+    ("Bitcoin network is stronger than ever! Optimistic!", "positive"),
+    ("Bitcoin price surge is just the beginning!", "positive"),
+
+    # Sentimentos NEGATIVOS
+    ("Bitcoin is crashing! Worst investment ever! I lost everything!", "negative"),
+    ("This Bitcoin dump is terrible, selling everything now.", "negative"),
+    ("Bitcoin is a scam! Don't invest in this bubble!", "negative"),
+    ("Bitcoin crash wiped out my savings! Disaster!", "negative"),
+    ("Bitcoin is dead! No future for this coin!", "negative"),
+    ("Massive Bitcoin selloff! Market is collapsing!", "negative"),
+    ("Bitcoin regulation will kill the market! Bearish!", "negative"),
+    ("Bitcoin energy consumption is destroying the planet!", "negative"),
+    ("Bitcoin volatility is too risky! Stay away!", "negative"),
+    ("Bitcoin whale manipulation is ruining the market!", "negative"),
+
+    # Sentimentos NEUTROS
+    ("Bitcoin price is stable today, no major movements.", "neutral"),
+    ("Bitcoin trading volume is normal for this time.", "neutral"),
+    ("Bitcoin price analysis shows mixed signals.", "neutral"),
+    ("Bitcoin market cap remains unchanged today.", "neutral"),
+    ("Bitcoin technical indicators are inconclusive.", "neutral"),
+    ("Bitcoin price consolidating in current range.", "neutral"),
+    ("Bitcoin market showing sideways movement.", "neutral"),
+    ("Bitcoin price action is range-bound today.", "neutral"),
+    ("Bitcoin volatility decreased compared to yesterday.", "neutral"),
+    ("Bitcoin market waiting for next catalyst.", "neutral"),
+]
+
+def reference_labeled_texts() -> List[Tuple[str, str]]:
+    """Cópia da lista de (texto, sentimento_esperado) de referência"""
+    return list(REFERENCE_TEXTS)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Cliente de Embeddings do Ollama com Cache
+Obtém vetores de /api/embeddings e mantém cache LRU em memória
+"""
+
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, List
+
+import requests
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class OllamaEmbeddingClient:
+    """Cliente para /api/embeddings com cache LRU limitado"""
+
+    def __init__(self, model: str = "nomic-embed-text", base_url: str = "http://localhost:11434",
+                 cache_size: int = 10000, timeout: float = 30.0):
+        """
+        Inicializa o cliente
+
+        Args:
+            model: Modelo de embeddings do Ollama
+            base_url: URL do servidor Ollama
+            cache_size: Número máximo de textos mantidos em cache
+            timeout: Timeout por requisição (segundos)
+        """
+        self.model = model
+        self.base_url = base_url
+        self.cache_size = cache_size
+        self.timeout = timeout
+
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+
+        self.hits = 0
+        self.misses = 0
+        self.total_request_time = 0.0
+
+    def embed(self, text: str) -> List[float]:
+        """
+        Retorna o embedding do texto (do cache quando possível)
+
+        Raises:
+            RuntimeError: se o Ollama retornar erro
+        """
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        start = time.time()
+        response = self._session.post(
+            f"{self.base_url}/api/embeddings",
+            json={"model": self.model, "prompt": text},
+            timeout=self.timeout
+        )
+        elapsed = time.time() - start
+
+        if response.status_code != 200:
+            raise RuntimeError(f"Erro de embeddings Ollama: {response.status_code}")
+
+        embedding = response.json().get('embedding') or []
+
+        with self._lock:
+            self.total_request_time += elapsed
+            self._cache[text] = embedding
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return embedding
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings de vários textos"""
+        return [self.embed(text) for text in texts]
+
+    def get_stats(self) -> Dict:
+        """Estatísticas de cache e custo"""
+        with self._lock:
+            requests_made = self.misses
+            return {
+                'model': self.model,
+                'cache_entries': len(self._cache),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / (self.hits + self.misses) if (self.hits + self.misses) else 0.0,
+                'avg_request_time': self.total_request_time / requests_made if requests_made else 0.0
+            }
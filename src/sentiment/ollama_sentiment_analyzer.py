@@ -6,14 +6,17 @@ Integração com modelos locais para análise de sentimento financeiro
 
 import json
 import logging
+import threading
 import time
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
+import requests
+
 try:
     from langchain_community.chat_models import ChatOllama
-    from langchain_core.prompts import PromptTemplate
+    from langchain_core.prompts import ChatPromptTemplate
     from langchain_core.output_parsers import JsonOutputParser
     from langchain_core.pydantic_v1 import BaseModel, Field
     from tenacity import retry, stop_after_attempt, wait_exponential, RetryError
@@ -22,6 +25,22 @@ except ImportError as e:
     print(f"Aviso: Langchain não disponível: {e}")
     LANGCHAIN_AVAILABLE = False
 
+try:
+    from .ollama_telemetry import OllamaTelemetry
+    from .adaptive_concurrency import UnboundedLimiter, get_limiter
+    from .fast_mode import FAST_INSTRUCTIONS, FAST_NUM_PREDICT, parse_fast_label
+except ImportError:
+    from ollama_telemetry import OllamaTelemetry
+    from adaptive_concurrency import UnboundedLimiter, get_limiter
+    from fast_mode import FAST_INSTRUCTIONS, FAST_NUM_PREDICT, parse_fast_label
+
+try:
+    from ..utils.metrics_collector import metrics_collector
+    METRICS_AVAILABLE = True
+except Exception:
+    metrics_collector = None
+    METRICS_AVAILABLE = False
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -35,6 +54,7 @@ class SentimentResult:
     reasoning: str
     model_used: str
     processing_time: float
+    telemetry: Optional[OllamaTelemetry] = None
 
 class FinancialSentimentSchema(BaseModel):
     """Schema para análise de sentimento financeiro"""
@@ -48,20 +68,52 @@ class FinancialSentimentSchema(BaseModel):
 class OllamaSentimentAnalyzer:
     """Analisador de sentimento usando modelos Ollama locais"""
     
-    def __init__(self, model_name: str = "llama3.2:1b", base_url: str = "http://localhost:11434"):
+    def __init__(self, model_name: str = "llama3.2:1b", base_url: str = "http://localhost:11434",
+                 primed_context: bool = False, reload_threshold: float = 0.5,
+                 concurrency_limiter=None, mode: str = "full", adaptive_concurrency: bool = False):
         """
         Inicializa o analisador
         
         Args:
             model_name: Nome do modelo Ollama
             base_url: URL base do servidor Ollama
+            primed_context: Avalia as instruções (mensagem de sistema) uma vez antes das análises
+            reload_threshold: load_duration (s) a partir do qual o modelo é considerado recarregado
+            concurrency_limiter: AdaptiveConcurrencyLimiter (padrão: compartilhado por servidor/modelo)
+            mode: "full" (JSON completo) ou "fast" (uma palavra, score derivado do rótulo)
+            adaptive_concurrency: Usa o limitador AIMD compartilhado quando concurrency_limiter
+                não é informado (padrão: sem limite, como antes)
         """
+        if mode not in ("full", "fast"):
+            raise ValueError(f"Modo inválido: {mode}")
+        
         self.model_name = model_name
         self.base_url = base_url
+        self.mode = mode
+        if adaptive_concurrency:
+            self.concurrency_limiter = concurrency_limiter or get_limiter(base_url, model_name)
+            self.fast_concurrency_limiter = get_limiter(base_url, f"{model_name} (fast)")
+        else:
+            self.concurrency_limiter = concurrency_limiter or UnboundedLimiter(f"{base_url}|{model_name}")
+            self.fast_concurrency_limiter = UnboundedLimiter(f"{base_url}|{model_name} (fast)")
+        self.primed_context = primed_context
+        self.reload_threshold = reload_threshold
         self.llm = None
+        self.fast_llm = None
         self.parser = JsonOutputParser(pydantic_object=FinancialSentimentSchema)
+        self.prompt_template = None
+        self.fast_prompt_template = None
+        
+        self._primed = False
+        self._prime_lock = threading.Lock()
+        self.prime_count = 0
         
         if LANGCHAIN_AVAILABLE:
+            self.prompt_template = self._create_prompt_template()
+            self.fast_prompt_template = ChatPromptTemplate.from_messages([
+                ("system", FAST_INSTRUCTIONS),
+                ("human", "Text: {text}")
+            ])
             self._initialize_llm()
         else:
             logger.warning("Langchain não disponível. Usando fallback simples.")
@@ -76,17 +128,27 @@ class OllamaSentimentAnalyzer:
                 num_predict=512,  # Limite de tokens
                 format="json"  # Força saída JSON
             )
+            # Modo rápido: sem JSON e com orçamento de poucos tokens
+            self.fast_llm = ChatOllama(
+                model=self.model_name,
+                base_url=self.base_url,
+                temperature=0.0,
+                num_predict=FAST_NUM_PREDICT
+            )
             logger.info(f"Modelo {self.model_name} inicializado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao inicializar modelo {self.model_name}: {e}")
             self.llm = None
     
-    def _create_prompt_template(self) -> PromptTemplate:
-        """Cria template de prompt otimizado para análise de sentimento financeiro"""
-        template = """
-Você é um especialista em análise de sentimento financeiro. Analise o texto sobre Bitcoin/criptomoedas abaixo e retorne APENAS um JSON válido.
-
-TEXTO: {text}
+    def _create_prompt_template(self) -> ChatPromptTemplate:
+        """
+        Cria template de prompt otimizado para análise de sentimento financeiro
+        
+        As instruções ficam inteiras na mensagem de sistema (prefixo idêntico em
+        todas as chamadas, reaproveitado pelo cache do Ollama) e o texto vai por
+        último na mensagem do usuário.
+        """
+        system = """Você é um especialista em análise de sentimento financeiro. Analise o texto sobre Bitcoin/criptomoedas enviado pelo usuário e retorne APENAS um JSON válido.
 
 Analise considerando:
 1. Sentimento geral (positive/negative/neutral)
@@ -97,29 +159,116 @@ Analise considerando:
 
 {format_instructions}
 
-Retorne APENAS o JSON, sem texto adicional:
-"""
+Retorne APENAS o JSON, sem texto adicional."""
         
-        return PromptTemplate(
-            template=template,
-            input_variables=["text"],
-            partial_variables={"format_instructions": self.parser.get_format_instructions()}
-        )
+        return ChatPromptTemplate.from_messages([
+            ("system", system),
+            ("human", "TEXTO: {text}")
+        ]).partial(format_instructions=self.parser.get_format_instructions())
+    
+    def _prime_prefix(self):
+        """
+        Avalia a mensagem de sistema uma vez para deixá-la no cache de prefixo
+        
+        O endpoint de chat não aceita context; o reaproveitamento vem do prefixo
+        idêntico, então basta uma chamada curta só com as instruções.
+        """
+        with self._prime_lock:
+            if self._primed:
+                return
+            
+            system = self.prompt_template.format_messages(text="")[0].content
+            payload = {
+                "model": self.model_name,
+                "messages": [{"role": "system", "content": system}],
+                "stream": False,
+                "options": {"temperature": 0.1, "num_predict": 1}
+            }
+            
+            try:
+                response = requests.post(f"{self.base_url}/api/chat", json=payload, timeout=30)
+            except Exception as e:
+                logger.warning(f"Erro ao preparar instruções no Ollama: {e}")
+                return
+            
+            if response.status_code == 200:
+                self._primed = True
+                self.prime_count += 1
+                prompt_tokens = response.json().get('prompt_eval_count', 0)
+                logger.info(f"Instruções preparadas no cache de prefixo ({prompt_tokens} tokens)")
+            else:
+                logger.warning(f"Erro ao preparar instruções no Ollama: {response.status_code}")
     
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10)
     )
-    def _analyze_with_llm(self, text: str) -> Dict:
+    def _analyze_with_llm(self, text: str) -> Tuple[Dict, OllamaTelemetry]:
         """Analisa texto usando LLM com retry"""
         if not self.llm:
             raise Exception("Modelo LLM não inicializado")
         
-        prompt_template = self._create_prompt_template()
-        chain = prompt_template | self.llm | self.parser
+        if self.primed_context and not self._primed:
+            self._prime_prefix()
+        
+        chain = self.prompt_template | self.llm
+        
+        with self.concurrency_limiter.slot():
+            start_time = time.time()
+            message = chain.invoke({"text": text})
+            wall_time = time.time() - start_time
+        
+        telemetry = self._record_telemetry(message, wall_time)
+        
+        # Modelo recarregado: o prefixo saiu do cache, preparar de novo na próxima chamada
+        if self.primed_context and telemetry.load_duration > self.reload_threshold:
+            logger.info(f"Modelo recarregado (load {telemetry.load_duration:.2f}s); instruções serão preparadas novamente")
+            self._primed = False
+        
+        result = self.parser.parse(message.content)
+        return result, telemetry
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10)
+    )
+    def _analyze_fast_with_llm(self, text: str) -> Tuple[Dict, OllamaTelemetry]:
+        """Classificação de uma palavra; score e confiança derivados do rótulo"""
+        if not self.fast_llm:
+            raise Exception("Modelo LLM não inicializado")
+        
+        chain = self.fast_prompt_template | self.fast_llm
         
-        result = chain.invoke({"text": text})
-        return result
+        with self.fast_concurrency_limiter.slot():
+            start_time = time.time()
+            message = chain.invoke({"text": text})
+            wall_time = time.time() - start_time
+        
+        telemetry = self._record_telemetry(message, wall_time)
+        sentiment, confidence, score = parse_fast_label(message.content)
+        impact = {'positive': 'bullish', 'negative': 'bearish'}.get(sentiment, 'neutral')
+        
+        result = {
+            "sentiment": sentiment,
+            "confidence": confidence,
+            "score": score,
+            "reasoning": "Classificação rápida (uma palavra)",
+            "financial_impact": impact,
+            "key_entities": []
+        }
+        return result, telemetry
+    
+    def _record_telemetry(self, message, wall_time: float) -> OllamaTelemetry:
+        """Contagens de tokens e durações chegam em response_metadata"""
+        telemetry = OllamaTelemetry.from_response(
+            getattr(message, 'response_metadata', None), self.model_name, wall_time
+        )
+        if METRICS_AVAILABLE and metrics_collector is not None:
+            try:
+                metrics_collector.record_ollama_call(telemetry)
+            except Exception as e:
+                logger.debug(f"Erro ao registrar telemetria: {e}")
+        return telemetry
     
     def _fallback_analysis(self, text: str) -> Dict:
         """Análise de fallback simples quando LLM não está disponível"""
@@ -164,22 +313,28 @@ Retorne APENAS o JSON, sem texto adicional:
             "key_entities": ["Bitcoin", "BTC"] if any(term in text_lower for term in ['bitcoin', 'btc']) else []
         }
     
-    def analyze_sentiment(self, text: str) -> SentimentResult:
+    def analyze_sentiment(self, text: str, mode: Optional[str] = None) -> SentimentResult:
         """
         Analisa sentimento de um texto
         
         Args:
             text: Texto para análise
+            mode: "full" ou "fast" para esta chamada (padrão: modo do analisador)
             
         Returns:
             SentimentResult com resultado da análise
         """
         start_time = time.time()
+        telemetry = None
+        mode = mode or self.mode
         
         try:
             if self.llm and LANGCHAIN_AVAILABLE:
                 # Tenta análise com LLM
-                result = self._analyze_with_llm(text)
+                if mode == "fast":
+                    result, telemetry = self._analyze_fast_with_llm(text)
+                else:
+                    result, telemetry = self._analyze_with_llm(text)
                 logger.info(f"Análise LLM bem-sucedida com {self.model_name}")
             else:
                 # Usa fallback
@@ -194,7 +349,8 @@ Retorne APENAS o JSON, sem texto adicional:
                 score=result.get("score", 0.0),
                 reasoning=result.get("reasoning", "Análise automática"),
                 model_used=self.model_name if self.llm else "fallback",
-                processing_time=processing_time
+                processing_time=processing_time,
+                telemetry=telemetry
             )
             
         except RetryError as e:
@@ -225,12 +381,13 @@ Retorne APENAS o JSON, sem texto adicional:
                 processing_time=processing_time
             )
     
-    def analyze_batch(self, texts: List[str]) -> List[SentimentResult]:
+    def analyze_batch(self, texts: List[str], mode: Optional[str] = None) -> List[SentimentResult]:
         """
         Analisa múltiplos textos
         
         Args:
             texts: Lista de textos para análise
+            mode: "full" ou "fast" (padrão: modo do analisador)
             
         Returns:
             Lista de SentimentResult
@@ -238,7 +395,7 @@ Retorne APENAS o JSON, sem texto adicional:
         results = []
         for i, text in enumerate(texts):
             logger.info(f"Analisando texto {i+1}/{len(texts)}")
-            result = self.analyze_sentiment(text)
+            result = self.analyze_sentiment(text, mode)
             results.append(result)
             
             # Pequena pausa para não sobrecarregar o modelo
@@ -251,9 +408,11 @@ Retorne APENAS o JSON, sem texto adicional:
         """Retorna informações sobre o modelo"""
         return {
             "model_name": self.model_name,
+            "mode": self.mode,
             "base_url": self.base_url,
             "langchain_available": LANGCHAIN_AVAILABLE,
             "llm_initialized": self.llm is not None,
+            "concurrency": self.concurrency_limiter.get_stats(),
             "timestamp": datetime.now().isoformat()
         }
 
@@ -287,6 +446,9 @@ def test_ollama_analyzer():
         print(f"Score: {result.score:.2f}")
         print(f"Modelo: {result.model_used}")
         print(f"Tempo: {result.processing_time:.2f}s")
+        if result.telemetry:
+            print(f"Tokens: prompt={result.telemetry.prompt_eval_count} | "
+                  f"geração={result.telemetry.eval_count} ({result.telemetry.eval_tokens_per_second:.1f} tok/s)")
         print(f"Justificativa: {result.reasoning}")
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Telemetria de Tokens e Tempo das Chamadas Ollama
+Converte os campos de /api/generate e /api/chat em métricas por chamada
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+NANOSECONDS = 1_000_000_000
+
+@dataclass
+class OllamaTelemetry:
+    """Contagem de tokens e durações (segundos) reportadas pelo Ollama em uma chamada"""
+    model: str = ""
+    prompt_eval_count: int = 0
+    eval_count: int = 0
+    prompt_eval_duration: float = 0.0
+    eval_duration: float = 0.0
+    load_duration: float = 0.0
+    total_duration: float = 0.0
+    wall_time: float = 0.0  # Tempo medido no cliente (inclui rede e fila)
+
+    @classmethod
+    def from_response(cls, data: Optional[Dict], model: str = "", wall_time: float = 0.0) -> "OllamaTelemetry":
+        """
+        Cria telemetria a partir da resposta JSON do Ollama
+
+        Args:
+            data: Resposta (ou último chunk do stream) com os campos *_count e *_duration
+            model: Modelo usado, caso a resposta não informe
+            wall_time: Tempo total medido no cliente
+        """
+        data = data or {}
+        return cls(
+            model=data.get('model') or model,
+            prompt_eval_count=int(data.get('prompt_eval_count') or 0),
+            eval_count=int(data.get('eval_count') or 0),
+            prompt_eval_duration=(data.get('prompt_eval_duration') or 0) / NANOSECONDS,
+            eval_duration=(data.get('eval_duration') or 0) / NANOSECONDS,
+            load_duration=(data.get('load_duration') or 0) / NANOSECONDS,
+            total_duration=(data.get('total_duration') or 0) / NANOSECONDS,
+            wall_time=wall_time
+        )
+
+    @property
+    def prompt_tokens_per_second(self) -> float:
+        """Velocidade de avaliação do prompt"""
+        return self.prompt_eval_count / self.prompt_eval_duration if self.prompt_eval_duration > 0 else 0.0
+
+    @property
+    def eval_tokens_per_second(self) -> float:
+        """Velocidade de geração (decode)"""
+        return self.eval_count / self.eval_duration if self.eval_duration > 0 else 0.0
+
+    @property
+    def overhead(self) -> float:
+        """Tempo fora do modelo: rede, fila e serialização"""
+        return max(0.0, self.wall_time - self.total_duration)
+
+def summarize_telemetry(items: Iterable[OllamaTelemetry]) -> Dict:
+    """
+    Resume várias chamadas: médias de tokens, tokens/s e divisão do tempo
+    entre carga do modelo, avaliação do prompt, geração e overhead
+    """
+    calls = 0
+    totals = {
+        'prompt_eval_count': 0, 'eval_count': 0,
+        'prompt_eval_duration': 0.0, 'eval_duration': 0.0,
+        'load_duration': 0.0, 'total_duration': 0.0, 'wall_time': 0.0
+    }
+
+    for item in items:
+        if item is None:
+            continue
+        calls += 1
+        for key in totals:
+            totals[key] += getattr(item, key)
+
+    return summary_from_totals(calls, totals)
+
+def summary_from_totals(calls: int, totals: Dict) -> Dict:
+    """Calcula o resumo a partir de somas acumuladas (usado também pelo MetricsCollector)"""
+    if not calls:
+        return {'calls': 0}
+
+    wall = totals['wall_time'] or totals['total_duration']
+    model_time = totals['prompt_eval_duration'] + totals['eval_duration']
+
+    def share(value: float) -> float:
+        return value / wall if wall > 0 else 0.0
+
+    return {
+        'calls': calls,
+        'avg_prompt_tokens': totals['prompt_eval_count'] / calls,
+        'avg_eval_tokens': totals['eval_count'] / calls,
+        'avg_wall_time': wall / calls,
+        'prompt_tokens_per_second': (totals['prompt_eval_count'] / totals['prompt_eval_duration']
+                                     if totals['prompt_eval_duration'] > 0 else 0.0),
+        'eval_tokens_per_second': (totals['eval_count'] / totals['eval_duration']
+                                   if totals['eval_duration'] > 0 else 0.0),
+        'prompt_share': share(totals['prompt_eval_duration']),
+        'eval_share': share(totals['eval_duration']),
+        'load_share': share(totals['load_duration']),
+        'overhead_share': share(max(0.0, wall - model_time - totals['load_duration']))
+    }
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Roteamento de Modelos Ollama por Características do Texto
+Envia textos curtos e claros para um modelo pequeno e textos longos, ambíguos
+ou em que o modelo pequeno discorda do léxico para um modelo maior
+"""
+
+import json
+import re
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .enhanced_sentiment_analyzer import EnhancedSentimentAnalyzer, EnhancedSentimentResult
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+POSITIVE_KEYWORDS = {
+    'moon', 'bullish', 'buy', 'pump', 'rally', 'surge', 'gain', 'profit', 'hodl',
+    'breakout', 'ath', 'adoption', 'optimistic', 'amazing', 'best'
+}
+
+NEGATIVE_KEYWORDS = {
+    'crash', 'dump', 'bearish', 'sell', 'loss', 'drop', 'fall', 'decline', 'bubble',
+    'scam', 'dead', 'worthless', 'panic', 'correction', 'worst', 'terrible'
+}
+
+# Marcadores de negação, ressalva e ironia que tornam o texto difícil para o modelo pequeno
+# (contrações como won't/isn't são contadas à parte, pelo sufixo n't)
+AMBIGUITY_MARKERS = {
+    'not', 'no', 'never', 'but', 'however', 'although', 'though', 'yet',
+    'unless', 'lol', '/s', 'sure', 'supposedly', 'if', 'maybe'
+}
+
+# Negações que invertem a palavra-chave seguinte (além de contrações como won't, isn't)
+NEGATIONS = {'not', 'no', 'never'}
+
+_WORD_RE = re.compile(r"[a-z']+|/s|\?")
+
+def _is_negation(word: str) -> bool:
+    return word in NEGATIONS or word.endswith("n't")
+
+@dataclass
+class ModelRoute:
+    """Rota para um modelo Ollama com limite de concorrência próprio"""
+    name: str
+    model: str
+    max_concurrency: int = 2
+
+@dataclass
+class RoutingThresholds:
+    """Limiares de roteamento (ajustáveis a partir dos dados de benchmark)"""
+    max_small_length: int = 280        # Textos maiores vão direto para o modelo grande
+    max_small_ambiguity: int = 1       # Pontos de ambiguidade tolerados pelo modelo pequeno
+    min_small_confidence: float = 0.6  # Abaixo disso o modelo pequeno é reavaliado pelo grande
+    escalate_on_disagreement: bool = True  # Reavalia quando o modelo pequeno discorda do léxico
+
+@dataclass
+class RoutingDecision:
+    """Registro de uma decisão de roteamento"""
+    text_length: int
+    ambiguity: int
+    lexicon_sentiment: str
+    route: str
+    reason: str
+    escalated: bool
+    latency: float
+    route_latencies: Dict[str, float]
+    sentiment: str
+    confidence: float
+    expected_sentiment: Optional[str] = None
+    correct: Optional[bool] = None
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+class _RouteWorker:
+    """Executor dedicado a uma rota: limita concorrência e mantém fila própria"""
+
+    def __init__(self, route: ModelRoute, ollama_url: str):
+        self.route = route
+        self.analyzer = EnhancedSentimentAnalyzer(ollama_model=route.model, ollama_url=ollama_url)
+        self.executor = ThreadPoolExecutor(
+            max_workers=route.max_concurrency,
+            thread_name_prefix=f"route-{route.name}"
+        )
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.peak_pending = 0
+
+    def analyze(self, text: str) -> Tuple[EnhancedSentimentResult, float]:
+        """Enfileira o texto na rota e aguarda o resultado"""
+        with self._lock:
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+
+        start = time.time()
+        try:
+            result = self.executor.submit(self.analyzer.analyze_sentiment, text).result()
+        finally:
+            with self._lock:
+                self.pending -= 1
+        return result, time.time() - start
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+class RoutingSentimentAnalyzer:
+    """Analisador que escolhe entre modelos Ollama pequeno e grande por texto"""
+
+    def __init__(self,
+                 small_route: Optional[ModelRoute] = None,
+                 large_route: Optional[ModelRoute] = None,
+                 thresholds: Optional[RoutingThresholds] = None,
+                 ollama_url: str = "http://localhost:11434",
+                 max_decisions: int = 10000):
+        """
+        Inicializa o roteador
+
+        Args:
+            small_route: Rota rápida (padrão llama3.2:1b)
+            large_route: Rota precisa (padrão gemma2:9b)
+            thresholds: Limiares de roteamento
+            ollama_url: URL do servidor Ollama
+            max_decisions: Quantidade de decisões mantidas em memória
+        """
+        self.small_route = small_route or ModelRoute("small", "llama3.2:1b", max_concurrency=4)
+        self.large_route = large_route or ModelRoute("large", "gemma2:9b", max_concurrency=1)
+        self.thresholds = thresholds or RoutingThresholds()
+
+        self.workers = {
+            self.small_route.name: _RouteWorker(self.small_route, ollama_url),
+            self.large_route.name: _RouteWorker(self.large_route, ollama_url)
+        }
+
+        self.decisions = deque(maxlen=max_decisions)
+        self._lock = threading.Lock()
+
+        logger.info(
+            f"Roteador inicializado: {self.small_route.model} (x{self.small_route.max_concurrency}) / "
+            f"{self.large_route.model} (x{self.large_route.max_concurrency})"
+        )
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def extract_features(text: str) -> Tuple[int, int, str]:
+        """
+        Características baratas do texto
+
+        Returns:
+            Tuple[comprimento, pontos de ambiguidade, sentimento pelo léxico]
+        """
+        words = _WORD_RE.findall(text.lower().replace('\u2019', "'"))
+        word_set = set(words)
+
+        # Palavra-chave logo após uma negação: positiva vira negativa ("won't pump"),
+        # negativa é neutralizada ("not a scam" não indica alta)
+        positive_hits, negative_hits = set(), set()
+        for previous, word in zip([''] + words, words):
+            negated = _is_negation(previous)
+            if word in POSITIVE_KEYWORDS:
+                (negative_hits if negated else positive_hits).add(word)
+            elif word in NEGATIVE_KEYWORDS and not negated:
+                negative_hits.add(word)
+        positive = len(positive_hits)
+        negative = len(negative_hits)
+
+        ambiguity = len(word_set & AMBIGUITY_MARKERS)
+        if any(word.endswith("n't") for word in word_set):
+            ambiguity += 1  # Contrações negativas
+        if positive and negative:
+            ambiguity += 1  # Sinais contraditórios
+        if '?' in words:
+            ambiguity += 1  # Perguntas raramente têm polaridade clara
+
+        if positive > negative:
+            lexicon = "positive"
+        elif negative > positive:
+            lexicon = "negative"
+        else:
+            lexicon = "neutral"
+
+        return len(text), ambiguity, lexicon
+
+    def _initial_route(self, length: int, ambiguity: int) -> Tuple[str, str]:
+        """Escolhe a rota inicial a partir das características"""
+        if length > self.thresholds.max_small_length:
+            return self.large_route.name, "length"
+        if ambiguity > self.thresholds.max_small_ambiguity:
+            return self.large_route.name, "ambiguity"
+        return self.small_route.name, "default"
+
+    def _should_escalate(self, result: EnhancedSentimentResult, lexicon: str) -> Optional[str]:
+        """Verifica se o resultado do modelo pequeno deve ser reavaliado pelo grande"""
+        if result.ollama_confidence < self.thresholds.min_small_confidence:
+            return "low_confidence"
+        if (self.thresholds.escalate_on_disagreement and lexicon != "neutral"
+                and result.ollama_sentiment != lexicon):
+            return "disagreement"
+        return None
+
+    # ------------------------------------------------------------------
+    def analyze_sentiment(self, text: str, expected_sentiment: Optional[str] = None) -> EnhancedSentimentResult:
+        """
+        Analisa o texto roteando para o modelo adequado
+
+        Args:
+            text: Texto para análise
+            expected_sentiment: Rótulo conhecido (benchmark) para medir acurácia por rota
+
+        Returns:
+            EnhancedSentimentResult do modelo que deu a palavra final
+        """
+        start = time.time()
+        length, ambiguity, lexicon = self.extract_features(text)
+        route, reason = self._initial_route(length, ambiguity)
+
+        route_latencies = {}
+        result, latency = self.workers[route].analyze(text)
+        route_latencies[route] = latency
+        escalated = False
+
+        if route == self.small_route.name:
+            escalation = self._should_escalate(result, lexicon)
+            if escalation:
+                route, reason, escalated = self.large_route.name, escalation, True
+                result, latency = self.workers[route].analyze(text)
+                route_latencies[route] = latency
+
+        decision = RoutingDecision(
+            text_length=length,
+            ambiguity=ambiguity,
+            lexicon_sentiment=lexicon,
+            route=route,
+            reason=reason,
+            escalated=escalated,
+            latency=time.time() - start,
+            route_latencies=route_latencies,
+            sentiment=result.final_sentiment,
+            confidence=result.final_confidence,
+            expected_sentiment=expected_sentiment,
+            correct=(result.final_sentiment == expected_sentiment) if expected_sentiment else None
+        )
+        with self._lock:
+            self.decisions.append(decision)
+
+        logger.info(f"Rota {route} ({reason}) para texto de {length} caracteres")
+        return result
+
+    def analyze_batch(self, texts: List[str]) -> List[EnhancedSentimentResult]:
+        """Análise em lote: cada rota processa em paralelo até seu limite"""
+        total_workers = self.small_route.max_concurrency + self.large_route.max_concurrency
+        with ThreadPoolExecutor(max_workers=max(1, total_workers)) as executor:
+            return list(executor.map(self.analyze_sentiment, texts))
+
+    # ------------------------------------------------------------------
+    def get_route_stats(self) -> Dict[str, Dict]:
+        """Latência, acurácia e volume por rota para ajuste dos limiares"""
+        with self._lock:
+            decisions = list(self.decisions)
+
+        stats = {}
+        for name, worker in self.workers.items():
+            routed = [d for d in decisions if d.route == name]
+            latencies = [d.route_latencies[name] for d in decisions if name in d.route_latencies]
+            labeled = [d for d in routed if d.correct is not None]
+
+            reasons = {}
+            for d in routed:
+                reasons[d.reason] = reasons.get(d.reason, 0) + 1
+
+            stats[name] = {
+                'model': worker.route.model,
+                'max_concurrency': worker.route.max_concurrency,
+                'final_decisions': len(routed),
+                'calls': len(latencies),
+                'reasons': reasons,
+                'avg_latency': float(np.mean(latencies)) if latencies else 0.0,
+                'p95_latency': float(np.percentile(latencies, 95)) if latencies else 0.0,
+                'accuracy': (sum(d.correct for d in labeled) / len(labeled)) if labeled else None,
+                'peak_queue': worker.peak_pending
+            }
+
+        escalated = sum(1 for d in decisions if d.escalated)
+        stats['overall'] = {
+            'decisions': len(decisions),
+            'escalation_rate': escalated / len(decisions) if decisions else 0.0,
+            'avg_latency': float(np.mean([d.latency for d in decisions])) if decisions else 0.0
+        }
+        return stats
+
+    def export_decisions(self, filename: str):
+        """Salva as decisões de roteamento em JSON para ajuste offline dos limiares"""
+        with self._lock:
+            data = [asdict(d) for d in self.decisions]
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        logger.info(f"{len(data)} decisões de roteamento salvas em {filename}")
+
+    def shutdown(self):
+        """Encerra os executores das rotas"""
+        for worker in self.workers.values():
+            worker.shutdown()
+
+def test_routing_analyzer():
+    """Teste do roteador com o dataset do benchmark"""
+    print("=== Teste do Roteador de Modelos ===")
+
+    from ..core.sentiment_benchmark import SentimentBenchmark
+
+    router = RoutingSentimentAnalyzer()
+    stats = SentimentBenchmark().run_routing_benchmark(router)
+
+    for name, data in stats.items():
+        print(f"{name}: {data}")
+
+    router.export_decisions("routing_decisions.json")
+    router.shutdown()
+
+if __name__ == "__main__":
+    test_routing_analyzer()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Cache Semântico de Veredictos do LLM
+Reutiliza o veredicto de um texto já analisado quando um novo texto é uma
+paráfrase (similaridade de cosseno dos embeddings acima do limiar)
+"""
+
+import threading
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """Índice vetorial em memória com capacidade fixa e despejo LRU"""
+
+    def __init__(self, embed_fn: Callable[[str], Sequence[float]],
+                 capacity: int = 5000, threshold: float = 0.92):
+        """
+        Inicializa o cache
+
+        Args:
+            embed_fn: Função que retorna o embedding de um texto (ex.: OllamaEmbeddingClient.embed)
+            capacity: Número máximo de veredictos mantidos (memória = capacity x dim x 4 bytes)
+            threshold: Similaridade de cosseno mínima para reutilizar um veredicto
+        """
+        self.embed_fn = embed_fn
+        self.capacity = capacity
+        self.threshold = threshold
+
+        self._vectors: Optional[np.ndarray] = None  # Alocado no primeiro insert (dimensão conhecida)
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._texts: List[Optional[str]] = [None] * capacity
+        self._values: List[Any] = [None] * capacity
+        self._size = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    def _normalize(self, vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
+
+    def _search(self, query: np.ndarray) -> Tuple[int, float]:
+        """Vizinho mais próximo (índice, similaridade); chamar com o lock"""
+        if self._size == 0 or self._vectors is None:
+            return -1, 0.0
+        similarities = self._vectors[:self._size] @ query
+        index = int(np.argmax(similarities))
+        return index, float(similarities[index])
+
+    def _insert(self, text: str, vector: np.ndarray, value: Any):
+        """Insere (ou substitui o menos usado); chamar com o lock"""
+        if self._vectors is None:
+            self._vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+
+        if self._size < self.capacity:
+            slot = self._size
+            self._size += 1
+        else:
+            slot = int(np.argmin(self._last_used))
+            self.evictions += 1
+
+        self._clock += 1
+        self._vectors[slot] = vector
+        self._texts[slot] = text
+        self._values[slot] = value
+        self._last_used[slot] = self._clock
+
+    # ------------------------------------------------------------------
+    def lookup(self, text: str, vector: Optional[np.ndarray] = None) -> Optional[Tuple[Any, float, str]]:
+        """
+        Procura um veredicto reutilizável
+
+        Returns:
+            Tuple[veredicto, similaridade, texto vizinho] ou None
+        """
+        query = vector if vector is not None else self._normalize(self.embed_fn(text))
+
+        with self._lock:
+            self.lookups += 1
+            index, similarity = self._search(query)
+            if index < 0 or similarity < self.threshold:
+                return None
+
+            self.hits += 1
+            self._clock += 1
+            self._last_used[index] = self._clock
+            return self._values[index], similarity, self._texts[index]
+
+    def add(self, text: str, value: Any, vector: Optional[np.ndarray] = None):
+        """Adiciona o veredicto de um texto ao índice"""
+        vector = vector if vector is not None else self._normalize(self.embed_fn(text))
+        with self._lock:
+            self._insert(text, vector, value)
+
+    def get_or_compute(self, text: str, compute_fn: Callable[[str], Any],
+                       cacheable: Optional[Callable[[Any], bool]] = None) -> Tuple[Any, bool, float]:
+        """
+        Retorna o veredicto de um vizinho ou calcula e guarda um novo
+
+        O embedding é calculado uma única vez e reutilizado no insert.
+        Veredictos rejeitados por cacheable (ex.: falhas) não são guardados.
+
+        Returns:
+            Tuple[veredicto, veio_do_cache, similaridade]
+        """
+        vector = self._normalize(self.embed_fn(text))
+        found = self.lookup(text, vector)
+        if found is not None:
+            value, similarity, neighbour = found
+            logger.debug(f"Cache semântico: '{text[:40]}' ~ '{neighbour[:40]}' ({similarity:.3f})")
+            return value, True, similarity
+
+        value = compute_fn(text)
+        if cacheable is None or cacheable(value):
+            self.add(text, value, vector)
+        return value, False, 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get_stats(self) -> Dict:
+        """Taxa de acerto e ocupação do índice"""
+        with self._lock:
+            dim = self._vectors.shape[1] if self._vectors is not None else 0
+            return {
+                'entries': self._size,
+                'capacity': self.capacity,
+                'threshold': self.threshold,
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'hit_rate': self.hits / self.lookups if self.lookups else 0.0,
+                'evictions': self.evictions,
+                'index_bytes': self.capacity * dim * 4
+            }
+
+def evaluate_semantic_cache(embed_fn: Callable[[str], Sequence[float]],
+                            labeled_texts: List[Tuple[str, str]],
+                            thresholds: Sequence[float] = (0.80, 0.85, 0.90, 0.95),
+                            capacity: int = 5000) -> List[Dict]:
+    """
+    Mede offline taxa de acerto e taxa de reutilização incorreta por limiar
+
+    Os textos passam pelo cache na ordem dada; o "veredicto" guardado é o
+    rótulo verdadeiro, então um acerto é falso quando o rótulo reutilizado
+    difere do rótulo do texto consultado.
+
+    Args:
+        embed_fn: Função de embedding
+        labeled_texts: Pares (texto, rótulo) na ordem de chegada
+        thresholds: Limiares de similaridade avaliados
+        capacity: Capacidade do cache simulado
+
+    Returns:
+        Lista de dicionários (threshold, hit_rate, false_reuse_rate, ...)
+    """
+    # Embeddings calculados uma vez para todos os limiares
+    vectors = []
+    for text, _ in labeled_texts:
+        array = np.asarray(embed_fn(text), dtype=np.float32)
+        norm = np.linalg.norm(array)
+        vectors.append(array / norm if norm > 0 else array)
+
+    report = []
+    for threshold in thresholds:
+        cache = SemanticCache(embed_fn, capacity=capacity, threshold=threshold)
+        hits = 0
+        false_reuse = 0
+
+        for (text, label), vector in zip(labeled_texts, vectors):
+            found = cache.lookup(text, vector)
+            if found is not None:
+                hits += 1
+                if found[0] != label:
+                    false_reuse += 1
+            else:
+                cache.add(text, label, vector)
+
+        total = len(labeled_texts)
+        report.append({
+            'threshold': threshold,
+            'lookups': total,
+            'hits': hits,
+            'hit_rate': hits / total if total else 0.0,
+            'false_reuse': false_reuse,
+            'false_reuse_rate': false_reuse / hits if hits else 0.0
+        })
+
+    return report
@@ -416,6 +416,11 @@ def create_sentiment_analyzer(analyzer_type: str = "ensemble") -> Union[Sentimen
     elif analyzer_type.lower() == "finbert":
         return TransformerSentimentAnalyzer("ProsusAI/finbert")
     
+    elif analyzer_type.lower() == "embedding":
+        # Classificador treinado offline sobre embeddings do Ollama
+        from .embedding_sentiment_analyzer import EmbeddingSentimentAnalyzer
+        return EmbeddingSentimentAnalyzer.load()
+    
     elif analyzer_type.lower() == "ensemble":
         analyzers = []
         weights = []
@@ -2,3 +2,4 @@
 
 from .bitcoin_trading_algorithm import BitcoinTradingAlgorithm
 from .bitcoin_trading_system_with_ollama import BitcoinTradingSystemWithOllama
+from .sentiment_pipeline import SentimentPipeline
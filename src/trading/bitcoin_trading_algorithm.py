@@ -8,8 +8,9 @@ import sys
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Dict, Iterator, List, Tuple, Optional, Union
 from dataclasses import dataclass
+from pathlib import Path
 from enum import Enum
 import logging
 import json
@@ -17,11 +18,18 @@ import json
 # Importa módulos locais
 from ..sentiment.sentiment_analyzer import create_sentiment_analyzer, SentimentAggregator, SentimentResult
 from ..data.reddit_collector import BitcoinSentimentCollector
+from ..data.post_store import PostStore
+from ..data.bloom_filter import RotatingBloomFilter
+from ..data.collection_state import DEFAULT_STATE_FILE, write_json_atomic
+from .sentiment_pipeline import SentimentPipeline
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Resultados por post guardados ao lado das marcas da coleta incremental
+DEFAULT_SENTIMENT_FILE = DEFAULT_STATE_FILE.with_name('post_sentiment.json')
+
 class SignalType(Enum):
     """Tipos de sinais de trading"""
     STRONG_BUY = "STRONG_BUY"
@@ -197,7 +205,14 @@ class BitcoinTradingAlgorithm:
     def __init__(self, 
                  sentiment_weight: float = 0.4,
                  technical_weight: float = 0.6,
-                 min_confidence: float = 0.6):
+                 min_confidence: float = 0.6,
+                 incremental_sentiment: bool = False,
+                 post_store: Optional[PostStore] = None,
+                 reddit_client=None,
+                 seen_filter: Optional[RotatingBloomFilter] = None,
+                 paginated_sentiment: bool = False,
+                 streaming_sentiment: bool = False,
+                 sentiment_file: Optional[Path] = None):
         
         self.sentiment_weight = sentiment_weight
         self.technical_weight = technical_weight
@@ -205,7 +220,27 @@ class BitcoinTradingAlgorithm:
         
         # Inicializa componentes
         self.sentiment_analyzer = create_sentiment_analyzer("ensemble")
-        self.reddit_collector = BitcoinSentimentCollector()
+        self.reddit_collector = BitcoinSentimentCollector(
+            incremental=incremental_sentiment, store=post_store, client=reddit_client,
+            seen_filter=seen_filter, paginated=paginated_sentiment
+        )
+        # IDs já pontuados (persistidos entre reinícios); posts vistos não são reanalisados,
+        # mas o resultado anterior continua contando na agregação da janela
+        self.seen_filter = seen_filter
+        # Sentimento de cada post gravado junto aos posts (consultável pela busca textual)
+        self.post_store = post_store
+        # Coleta incremental ou filtro de vistos: resultados por post reaproveitados entre ciclos
+        self.incremental_sentiment = incremental_sentiment
+        self.reuse_sentiment = incremental_sentiment or seen_filter is not None
+        self._post_sentiment: Dict[str, Tuple[float, SentimentResult]] = {}
+        # Persistidos a cada ciclo e recarregados no início, como o estado da coleta
+        self.sentiment_file = Path(sentiment_file) if sentiment_file else DEFAULT_SENTIMENT_FILE
+        if self.reuse_sentiment:
+            self._load_post_sentiment()
+        # Pipeline em estágios: pontuação sobreposta à coleta dos demais subreddits
+        self.sentiment_pipeline = SentimentPipeline(
+            self.reddit_collector, self.sentiment_analyzer, seen_filter=seen_filter
+        ) if streaming_sentiment else None
         self.technical_analyzer = TechnicalAnalyzer()
         self.price_simulator = BitcoinPriceSimulator()
         
@@ -217,26 +252,48 @@ class BitcoinTradingAlgorithm:
         
         logger.info(f"Analisando sentimento das últimas {hours_back} horas")
         
-        # Coleta posts recentes
-        posts, _ = self.reddit_collector.collect_recent_sentiment_data(
-            hours_back=hours_back,
-            min_score=5,
-            max_posts_per_subreddit=20
-        )
-        
-        if not posts:
-            logger.warning("Nenhum post coletado para análise de sentimento")
-            return 0.0, []
+        if self.sentiment_pipeline is not None:
+            # Posts pontuados à medida que cada subreddit termina de baixar
+            scored = self.sentiment_pipeline.run(hours_back=hours_back, min_score=5, max_posts_per_subreddit=20)
+        else:
+            # Coleta posts recentes
+            posts, _ = self.reddit_collector.collect_recent_sentiment_data(
+                hours_back=hours_back,
+                min_score=5,
+                max_posts_per_subreddit=20
+            )
+            
+            if not posts and not self._post_sentiment:
+                logger.warning("Nenhum post coletado para análise de sentimento")
+                return 0.0, []
+            
+            scored = self._score_posts(posts)
         
-        # Analisa sentimento de cada post
+        # Analisa sentimento de cada post (no modo incremental, só os novos ou alterados)
         sentiment_results = []
-        for post in posts:
-            try:
-                result = self.sentiment_analyzer.analyze(post.full_text)
-                sentiment_results.append(result)
-            except Exception as e:
-                logger.warning(f"Erro na análise de sentimento: {e}")
-                continue
+        stored_results = []
+        for post, result in scored:
+            sentiment_results.append(result)
+            if self.reuse_sentiment:
+                self._post_sentiment[post.id] = (post.created_utc, result)
+            if self.post_store is not None:
+                stored_results.append((post.id, result))
+        
+        if self.seen_filter is not None:
+            self.seen_filter.save()
+        if stored_results:
+            self.post_store.save_sentiment(stored_results)
+        
+        if self.reuse_sentiment:
+            # Agrega sobre a janela inteira, reaproveitando os posts já pontuados
+            cutoff = (datetime.now() - timedelta(hours=hours_back)).timestamp()
+            self._post_sentiment = {
+                post_id: entry for post_id, entry in self._post_sentiment.items() if entry[0] >= cutoff
+            }
+            logger.info(f"Sentimento incremental: {len(sentiment_results)} posts analisados, "
+                        f"{len(self._post_sentiment)} na janela")
+            self._save_post_sentiment()
+            sentiment_results = [result for _, result in self._post_sentiment.values()]
         
         if not sentiment_results:
             return 0.0, []
@@ -253,6 +310,64 @@ class BitcoinTradingAlgorithm:
         
         return normalized_score, sentiment_results
     
+    def _load_post_sentiment(self):
+        """Recarrega os resultados por post gravados no último ciclo"""
+        if not self.sentiment_file.exists():
+            return
+        try:
+            data = json.loads(self.sentiment_file.read_text())
+            self._post_sentiment = {
+                post_id: (entry['created_utc'], SentimentResult(
+                    text=entry['text'],
+                    sentiment=entry['sentiment'],
+                    score=entry['score'],
+                    confidence=entry['confidence'],
+                    model_used=entry['model_used'],
+                    timestamp=datetime.fromisoformat(entry['timestamp'])
+                ))
+                for post_id, entry in data.get('posts', {}).items()
+            }
+            logger.info(f"{len(self._post_sentiment)} resultados de sentimento recarregados de {self.sentiment_file}")
+        except Exception as e:
+            logger.warning(f"Resultados de sentimento ilegíveis em {self.sentiment_file}, iniciando vazio: {e}")
+            self._post_sentiment = {}
+
+    def _save_post_sentiment(self):
+        """Grava os resultados por post da janela atual"""
+        data = {
+            'posts': {
+                post_id: {
+                    'created_utc': created_utc,
+                    'text': result.text,
+                    'sentiment': result.sentiment,
+                    'score': float(result.score),
+                    'confidence': float(result.confidence),
+                    'model_used': result.model_used,
+                    'timestamp': result.timestamp.isoformat()
+                }
+                for post_id, (created_utc, result) in self._post_sentiment.items()
+            }
+        }
+        try:
+            write_json_atomic(self.sentiment_file, data)
+        except Exception as e:
+            logger.error(f"Erro ao salvar resultados de sentimento: {e}")
+
+    def _score_posts(self, posts: List) -> Iterator[Tuple[object, SentimentResult]]:
+        """Pontua os posts em sequência, pulando os já vistos e os que falharem"""
+        for post in posts:
+            if self.seen_filter is not None and post.id in self.seen_filter:
+                continue
+            try:
+                result = self.sentiment_analyzer.analyze(post.full_text)
+            except Exception as e:
+                logger.warning(f"Erro na análise de sentimento: {e}")
+                continue
+            # Marca como visto só depois de pontuar: falhas são tentadas de novo no próximo ciclo
+            if self.seen_filter is not None:
+                self.seen_filter.add(post.id)
+            yield post, result
+    
     def analyze_technical_indicators(self, price_data: pd.DataFrame) -> Tuple[float, TechnicalIndicators]:
         """Analisa indicadores técnicos"""
         
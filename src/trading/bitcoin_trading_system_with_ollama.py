@@ -70,14 +70,18 @@ class BacktestResult:
 class BitcoinTradingSystemWithOllama:
     """Sistema de trading Bitcoin integrado com Ollama LLM"""
     
-    def __init__(self, initial_capital: float = 10000.0):
+    def __init__(self, initial_capital: float = 10000.0, sentiment_time_budget: Optional[float] = None):
         """
         Inicializa o sistema de trading
         
         Args:
             initial_capital: Capital inicial para trading
+            sentiment_time_budget: Tempo máximo (s) da análise de sentimento por ciclo;
+                quando a estimativa do modo completo excede, usa o modo rápido
         """
         self.initial_capital = initial_capital
+        self.sentiment_time_budget = sentiment_time_budget
+        self._full_text_latency: Optional[float] = None  # Média móvel por texto no modo completo
         self.current_capital = initial_capital
         self.position = 0.0  # Quantidade de Bitcoin
         self.trades = []
@@ -231,6 +235,19 @@ class BitcoinTradingSystemWithOllama:
         
         return max(-1.0, min(1.0, score))
     
+    def _select_sentiment_mode(self, text_count: int) -> str:
+        """Escolhe o modo do Ollama pela estimativa de tempo do modo completo"""
+        if self.sentiment_time_budget is None or self._full_text_latency is None:
+            return "full"
+        
+        estimate = self._full_text_latency * text_count
+        if estimate > self.sentiment_time_budget:
+            logger.info(f"⚡ Modo rápido: estimativa {estimate:.1f}s > orçamento {self.sentiment_time_budget:.1f}s")
+            # Decai a estimativa para voltar a medir o modo completo quando o servidor aliviar
+            self._full_text_latency *= 0.9
+            return "fast"
+        return "full"
+    
     def analyze_market_sentiment(self, news_texts: List[str]) -> Tuple[float, float, str]:
         """
         Analisa sentimento do mercado usando Ollama LLM
@@ -245,8 +262,15 @@ class BitcoinTradingSystemWithOllama:
             return 0.0, 0.0, "none"
         
         try:
-            # Analisar todos os textos
-            results = self.sentiment_analyzer.analyze_batch(news_texts)
+            # Analisar todos os textos (modo rápido se o completo não cabe no orçamento)
+            mode = self._select_sentiment_mode(len(news_texts))
+            start_time = time.time()
+            results = self.sentiment_analyzer.analyze_batch(news_texts, mode=mode)
+            if mode == "full" and results:
+                per_text = (time.time() - start_time) / len(results)
+                self._full_text_latency = per_text if self._full_text_latency is None else (
+                    0.3 * per_text + 0.7 * self._full_text_latency
+                )
             
             if not results:
                 return 0.0, 0.0, "none"
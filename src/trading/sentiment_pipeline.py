@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Pipeline de Sentimento em Estágios
+Coleta, filtragem, pontuação e agregação ligadas por filas limitadas: a
+pontuação começa com os posts do primeiro subreddit baixado enquanto os
+demais ainda estão em rede, e filas cheias seguram os estágios anteriores
+"""
+
+import queue
+import threading
+import time
+import logging
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from ..sentiment.sentiment_analyzer import SentimentResult
+from ..data.reddit_collector import BitcoinSentimentCollector, RedditPost
+from ..data.bloom_filter import RotatingBloomFilter
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Marca de fim de fluxo entre estágios
+_DONE = object()
+
+@dataclass
+class PipelineStats:
+    """Contadores de uma execução do pipeline"""
+    subreddits: int = 0
+    collected: int = 0
+    duplicates: int = 0
+    already_seen: int = 0
+    scored: int = 0
+    errors: int = 0
+    first_result_after: Optional[float] = None
+    elapsed: float = 0.0
+
+class SentimentPipeline:
+    """Coleta → filtragem → pontuação → agregação em threads com filas limitadas"""
+
+    def __init__(self, collector: BitcoinSentimentCollector, analyzer,
+                 queue_size: int = 64, scoring_workers: int = 1,
+                 seen_filter: Optional[RotatingBloomFilter] = None):
+        """
+        Args:
+            collector: Coletor de sentimento (fornece iter_subreddit_posts)
+            analyzer: Analisador com analyze(texto) -> SentimentResult
+            queue_size: Capacidade de cada fila entre estágios (backpressure)
+            scoring_workers: Threads de pontuação (1 para analisadores não thread-safe)
+            seen_filter: IDs já pontuados; posts presentes são descartados na filtragem e
+                cada post é registrado na agregação, depois de processado pelo consumidor
+        """
+        self.collector = collector
+        self.analyzer = analyzer
+        self.queue_size = queue_size
+        self.scoring_workers = max(1, scoring_workers)
+        self.seen_filter = seen_filter
+        self.last_stats = PipelineStats()
+
+    @staticmethod
+    def _put(target: queue.Queue, item, stop: threading.Event) -> bool:
+        """Coloca na fila esperando espaço; desiste se o pipeline for interrompido"""
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _collect(self, batches: queue.Queue, stop: threading.Event, stats: PipelineStats,
+                 hours_back: int, min_score: int, max_posts_per_subreddit: int):
+        """Estágio 1: lotes de posts por subreddit, na ordem em que terminam de baixar"""
+        iterator = self.collector.iter_subreddit_posts(hours_back, min_score, max_posts_per_subreddit)
+        try:
+            for subreddit, posts in iterator:
+                stats.subreddits += 1
+                stats.collected += len(posts)
+                if not self._put(batches, posts, stop):
+                    break
+        except Exception as e:
+            logger.error(f"Erro na coleta do pipeline: {e}")
+        finally:
+            iterator.close()
+            self._put(batches, _DONE, stop)
+
+    def _filter(self, batches: queue.Queue, posts_out: queue.Queue, stop: threading.Event,
+                stats: PipelineStats):
+        """Estágio 2: deduplica entre subreddits e descarta IDs já pontuados"""
+        seen_ids = set()
+        try:
+            while not stop.is_set():
+                try:
+                    batch = batches.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if batch is _DONE:
+                    break
+                for post in batch:
+                    if post.id in seen_ids:
+                        stats.duplicates += 1
+                        continue
+                    seen_ids.add(post.id)
+                    if self.seen_filter is not None and post.id in self.seen_filter:
+                        stats.already_seen += 1
+                        continue
+                    if not self._put(posts_out, post, stop):
+                        return
+        finally:
+            # Uma marca de fim para cada thread de pontuação
+            for _ in range(self.scoring_workers):
+                self._put(posts_out, _DONE, stop)
+
+    def _score(self, posts_in: queue.Queue, results: queue.Queue, stop: threading.Event,
+               stats: PipelineStats, lock: threading.Lock):
+        """Estágio 3: analisa o sentimento de cada post"""
+        try:
+            while not stop.is_set():
+                try:
+                    post = posts_in.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if post is _DONE:
+                    break
+                try:
+                    result = self.analyzer.analyze(post.full_text)
+                except Exception as e:
+                    logger.warning(f"Erro na análise de sentimento: {e}")
+                    with lock:
+                        stats.errors += 1
+                    continue
+                if not self._put(results, (post, result), stop):
+                    break
+        finally:
+            self._put(results, _DONE, stop)
+
+    def run(self, hours_back: int = 24, min_score: int = 5,
+            max_posts_per_subreddit: int = 50) -> Iterator[Tuple[RedditPost, SentimentResult]]:
+        """
+        Executa o pipeline; o consumidor do iterador é o estágio de agregação
+
+        Fechar o iterador (ou uma exceção no consumidor) interrompe todos os
+        estágios e aguarda o término das threads.
+
+        Yields:
+            Pares (post, resultado) na ordem em que são pontuados
+        """
+        stats = PipelineStats()
+        self.last_stats = stats
+        started = time.time()
+        stop = threading.Event()
+        lock = threading.Lock()
+        batches: queue.Queue = queue.Queue(maxsize=max(1, self.queue_size // 16))
+        posts: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        results: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        threads = [
+            threading.Thread(target=self._collect, name="pipeline-collect", daemon=True,
+                             args=(batches, stop, stats, hours_back, min_score, max_posts_per_subreddit)),
+            threading.Thread(target=self._filter, name="pipeline-filter", daemon=True,
+                             args=(batches, posts, stop, stats))
+        ]
+        threads += [
+            threading.Thread(target=self._score, name=f"pipeline-score-{index}", daemon=True,
+                             args=(posts, results, stop, stats, lock))
+            for index in range(self.scoring_workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        finished_workers = 0
+        try:
+            while finished_workers < self.scoring_workers:
+                item = results.get()
+                if item is _DONE:
+                    finished_workers += 1
+                    continue
+                stats.scored += 1
+                if stats.first_result_after is None:
+                    stats.first_result_after = time.time() - started
+                yield item
+                # Só quando o consumidor pede o próximo: posts que falharam ou não foram agregados voltam no próximo ciclo
+                if self.seen_filter is not None:
+                    self.seen_filter.add(item[0].id)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            if self.seen_filter is not None:
+                self.seen_filter.save()
+            stats.elapsed = time.time() - started
+            logger.info(f"Pipeline: {stats.scored} posts pontuados de {stats.collected} coletados "
+                        f"em {stats.subreddits} subreddits ({stats.elapsed:.2f}s, primeiro resultado "
+                        f"em {stats.first_result_after or 0:.2f}s)")
+
+    def collect_and_score(self, hours_back: int = 24, min_score: int = 5,
+                          max_posts_per_subreddit: int = 50) -> List[Tuple[RedditPost, SentimentResult]]:
+        """Executa o pipeline até o fim e devolve todos os pares (post, resultado)"""
+        return list(self.run(hours_back, min_score, max_posts_per_subreddit))
@@ -1,4 +1,7 @@
+import atexit
 import json
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -17,15 +20,27 @@ class AlertRule:
 class MetricsCollector:
     """Simple in-memory metrics collector with optional persistence."""
 
-    def __init__(self, storage_file: Optional[Path] = None):
+    def __init__(self, storage_file: Optional[Path] = None, flush_interval: float = 30.0):
         self.storage_file = storage_file or (
             Path.home() / '.btc-trading' / 'metrics.json'
         )
         self.metrics: List[Dict] = []
         self.alerts: List[Dict] = []
         self.rules: List[AlertRule] = []
+        # Somas acumuladas de telemetria Ollama por modelo
+        self.model_telemetry: Dict[str, Dict] = {}
+        # Valores instantâneos (ex.: limite de concorrência atual)
+        self.gauges: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        # Telemetria por chamada fica em memória e vai ao disco a cada
+        # flush_interval segundos (e na saída), fora do caminho quente
+        self.flush_interval = flush_interval
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._save_lock = threading.Lock()
         self.storage_file.parent.mkdir(parents=True, exist_ok=True)
         self._load()
+        atexit.register(self.flush)
 
     # ------------------------------------------------------------------
     def _load(self) -> None:
@@ -34,18 +49,53 @@ class MetricsCollector:
                 data = json.loads(self.storage_file.read_text())
                 self.metrics = data.get('metrics', [])
                 self.alerts = data.get('alerts', [])
+                self.model_telemetry = data.get('model_telemetry', {})
+                self.gauges = data.get('gauges', {})
             except Exception:
                 # Se falhar ao carregar, iniciar vazio
                 self.metrics = []
                 self.alerts = []
+                self.model_telemetry = {}
+                self.gauges = {}
 
     def _save(self) -> None:
         try:
-            data = {'metrics': self.metrics, 'alerts': self.alerts}
+            data = {
+                'metrics': self.metrics,
+                'alerts': self.alerts,
+                'model_telemetry': self.model_telemetry,
+                'gauges': self.gauges
+            }
             self.storage_file.write_text(json.dumps(data, indent=2))
         except Exception:
             pass  # Não interromper fluxo se salvar falhar
 
+    def flush(self) -> None:
+        """Persist pending telemetry/gauges (no-op if nothing changed)."""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                self._last_flush = time.monotonic()
+                try:
+                    payload = json.dumps({
+                        'metrics': self.metrics,
+                        'alerts': self.alerts,
+                        'model_telemetry': self.model_telemetry,
+                        'gauges': self.gauges
+                    }, indent=2)
+                except Exception:
+                    return
+            try:
+                self.storage_file.write_text(payload)
+            except Exception:
+                pass  # Não interromper fluxo se salvar falhar
+
+    def _maybe_flush(self) -> None:
+        if self._dirty and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
     # ------------------------------------------------------------------
     def add_alert_rule(
         self,
@@ -73,6 +123,50 @@ class MetricsCollector:
         self._check_alerts(name, value)
         self._save()
 
+    def record_ollama_call(self, telemetry) -> None:
+        """Aggregate token/timing telemetry of one Ollama call per model."""
+        with self._lock:
+            totals = self.model_telemetry.setdefault(telemetry.model or 'unknown', {
+                'calls': 0,
+                'prompt_eval_count': 0,
+                'eval_count': 0,
+                'prompt_eval_duration': 0.0,
+                'eval_duration': 0.0,
+                'load_duration': 0.0,
+                'total_duration': 0.0,
+                'wall_time': 0.0
+            })
+            totals['calls'] += 1
+            for key in totals:
+                if key != 'calls':
+                    totals[key] += getattr(telemetry, key)
+            self._dirty = True
+        self._maybe_flush()
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Update a point-in-time value (persisted with the next save)."""
+        with self._lock:
+            self.gauges[name] = {
+                'timestamp': datetime.utcnow().isoformat(),
+                'value': value
+            }
+            self._dirty = True
+        self._maybe_flush()
+
+    def get_gauges(self) -> Dict[str, Dict]:
+        with self._lock:
+            return dict(self.gauges)
+
+    def get_model_telemetry(self) -> Dict[str, Dict]:
+        """Per-model summary: tokens/sec and prompt vs. generation split."""
+        from ..sentiment.ollama_telemetry import summary_from_totals
+
+        with self._lock:
+            return {
+                model: summary_from_totals(totals['calls'], totals)
+                for model, totals in self.model_telemetry.items()
+            }
+
     # ------------------------------------------------------------------
     def _check_alerts(self, name: str, value: float) -> None:
         for rule in self.rules: